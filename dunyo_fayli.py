@@ -0,0 +1,178 @@
+import os
+import sys
+import mmap
+import time
+import struct
+from collections import OrderedDict
+
+from tez_yo_l import YolTopuvchi
+
+# Fayl: sarlavha, keyin bo'laklar qator bo'yicha; har bo'lak BO_LAK x BO_LAK bayt (uint8 katak turi)
+SARLAVHA = struct.Struct("<4sIII")  # magic, kenglik, balandlik, bo'lak hajmi
+MAGIC = b"DNY1"
+BO_LAK_HAJMI = 64
+MAKS_BO_LAKLAR = 256  # xotirada saqlanadigan bo'laklar (har biri 4 KiB)
+
+
+def dunyo_yaratish(yo_l, kenglik, balandlik, generator=None, bo_lak=BO_LAK_HAJMI):
+    """Bo'lakli dunyo faylini yozadi.
+
+    generator(x0, y0, w, h) -> qatorlar ro'yxati (yoki uint8 massiv) har bir bo'lak uchun
+    chaqiriladi, shuning uchun butun dunyo hech qachon xotirada turmaydi. Berilmasa,
+    dunyo TUPROQ bilan to'ldiriladi.
+    """
+    bx_soni = -(-kenglik // bo_lak)
+    by_soni = -(-balandlik // bo_lak)
+    with open(yo_l, "wb") as f:
+        f.write(SARLAVHA.pack(MAGIC, kenglik, balandlik, bo_lak))
+        for by in range(by_soni):
+            for bx in range(bx_soni):
+                sahifa = bytearray(bo_lak * bo_lak)
+                if generator:
+                    x0, y0 = bx * bo_lak, by * bo_lak
+                    w = min(bo_lak, kenglik - x0)
+                    h = min(bo_lak, balandlik - y0)
+                    for y, qator in enumerate(generator(x0, y0, w, h)):
+                        sahifa[y * bo_lak:y * bo_lak + w] = bytes(qator)
+                f.write(sahifa)
+
+
+class Dunyo:
+    """mmap orqali o'qiladigan bo'lakli xarita.
+
+    Bo'laklar kerak bo'lganda (avatar/kamera atrofida) fayldan bytearray ga ko'chiriladi
+    va LRU tartibida saqlanadi; o'zgartirilgan bo'laklar chiqarib yuborilayotganda faylga
+    qaytariladi. XaritaChizuvchi (blok) va YolTopuvchi (o_tish_oynasi) shu tuzilmadan o'qiydi.
+    """
+
+    def __init__(self, yo_l, maks_bo_laklar=MAKS_BO_LAKLAR):
+        self.fayl = open(yo_l, "r+b")
+        self.mm = mmap.mmap(self.fayl.fileno(), 0)
+        magic, self.kenglik, self.balandlik, self.bo_lak = SARLAVHA.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{yo_l}: dunyo fayli emas")
+        self.bx_soni = -(-self.kenglik // self.bo_lak)
+        self.maks_bo_laklar = maks_bo_laklar
+        self.bo_laklar = OrderedDict()
+        self.o_zgargan = set()
+
+    def _siljish(self, bx, by):
+        return SARLAVHA.size + (by * self.bx_soni + bx) * self.bo_lak * self.bo_lak
+
+    def bo_lak_ol(self, bx, by):
+        """Bo'lak ma'lumotlari (bytearray, qator uzunligi = bo'lak hajmi)"""
+        kalit = (bx, by)
+        sahifa = self.bo_laklar.get(kalit)
+        if sahifa is not None:
+            self.bo_laklar.move_to_end(kalit)
+            return sahifa
+
+        boshi = self._siljish(bx, by)
+        sahifa = self.bo_laklar[kalit] = bytearray(self.mm[boshi:boshi + self.bo_lak * self.bo_lak])
+        if len(self.bo_laklar) > self.maks_bo_laklar:
+            eski, eski_sahifa = self.bo_laklar.popitem(last=False)
+            if eski in self.o_zgargan:
+                self._yozish(eski, eski_sahifa)
+        return sahifa
+
+    def _yozish(self, kalit, sahifa):
+        boshi = self._siljish(*kalit)
+        self.mm[boshi:boshi + len(sahifa)] = sahifa
+        self.o_zgargan.discard(kalit)
+
+    def katak(self, x, y):
+        bx, ox = divmod(x, self.bo_lak)
+        by, oy = divmod(y, self.bo_lak)
+        return self.bo_lak_ol(bx, by)[oy * self.bo_lak + ox]
+
+    def o_rnatish(self, x, y, katak_turi):
+        bx, ox = divmod(x, self.bo_lak)
+        by, oy = divmod(y, self.bo_lak)
+        self.bo_lak_ol(bx, by)[oy * self.bo_lak + ox] = katak_turi
+        self.o_zgargan.add((bx, by))
+
+    def blok(self, x0, y0, kenglik, balandlik):
+        """[y0, y0+balandlik) x [x0, x0+kenglik) qismi - qatorlar (bytes) ro'yxati"""
+        qatorlar = []
+        b = self.bo_lak
+        for y in range(y0, y0 + balandlik):
+            by, oy = divmod(y, b)
+            qator = bytearray()
+            x = x0
+            while x < x0 + kenglik:
+                bx, ox = divmod(x, b)
+                n = min(b - ox, x0 + kenglik - x)
+                boshi = oy * b + ox
+                qator += self.bo_lak_ol(bx, by)[boshi:boshi + n]
+                x += n
+            qatorlar.append(bytes(qator))
+        return qatorlar
+
+    def o_tish_oynasi(self, x0, y0, kenglik, balandlik):
+        """Oyna uchun YolTopuvchi ga mos xarita (qatorlar ro'yxati)"""
+        x0 = max(0, x0)
+        y0 = max(0, y0)
+        kenglik = min(kenglik, self.kenglik - x0)
+        balandlik = min(balandlik, self.balandlik - y0)
+        return x0, y0, self.blok(x0, y0, kenglik, balandlik)
+
+    def yuklash(self, x, y, radius):
+        """(x, y) atrofidagi bo'laklarni oldindan yuklaydi (avatar/kamera uchun)"""
+        b = self.bo_lak
+        for by in range(max(0, (y - radius) // b), min(-(-self.balandlik // b), (y + radius) // b + 1)):
+            for bx in range(max(0, (x - radius) // b), min(self.bx_soni, (x + radius) // b + 1)):
+                self.bo_lak_ol(bx, by)
+
+    def saqlash(self):
+        for kalit in list(self.o_zgargan):
+            self._yozish(kalit, self.bo_laklar[kalit])
+        self.mm.flush()
+
+    def yopish(self):
+        self.saqlash()
+        self.bo_laklar.clear()
+        self.mm.close()
+        self.fayl.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.yopish()
+
+
+def oynada_yo_l_top(dunyo, boshlang_i, manzil, chet=64):
+    """A va B ni o'z ichiga olgan oynada (atrofida chet katak bilan) yo'l topadi.
+
+    Butun dunyo emas, faqat shu oyna bo'laklari o'qiladi. Yo'l oynadan tashqariga
+    chiqishi kerak bo'lsa, topilmasligi mumkin - unda chet kattalashtiriladi.
+    """
+    x0 = min(boshlang_i[0], manzil[0]) - chet
+    y0 = min(boshlang_i[1], manzil[1]) - chet
+    x1 = max(boshlang_i[0], manzil[0]) + chet + 1
+    y1 = max(boshlang_i[1], manzil[1]) + chet + 1
+    x0, y0, oyna = dunyo.o_tish_oynasi(x0, y0, x1 - x0, y1 - y0)
+
+    topuvchi = YolTopuvchi(oyna)
+    yo_l = topuvchi.top((boshlang_i[0] - x0, boshlang_i[1] - y0), (manzil[0] - x0, manzil[1] - y0))
+    return [(x + x0, y + y0) for x, y in yo_l]
+
+
+if __name__ == "__main__":
+    from xarita_generator import xarita_yaratish_np
+
+    razmer = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    yo_l = sys.argv[2] if len(sys.argv) > 2 else "dunyo.bin"  # .gitignore da
+    xarita = xarita_yaratish_np(razmer, razmer, urug=0, B=(300, 300))
+
+    start = time.perf_counter()
+    dunyo_yaratish(yo_l, razmer, razmer, lambda x0, y0, w, h: xarita[y0:y0 + h, x0:x0 + w])
+    print(f"{razmer}x{razmer} dunyo yozildi: {time.perf_counter() - start:.2f} s, "
+          f"{os.path.getsize(yo_l) / 2 ** 20:.1f} MiB")
+    del xarita
+
+    with Dunyo(yo_l) as dunyo:
+        start = time.perf_counter()
+        yo_l_natija = oynada_yo_l_top(dunyo, (2, 2), (300, 300))
+        print(f"(2,2)->(300,300): {len(yo_l_natija)} katak, {time.perf_counter() - start:.3f} s, "
+              f"xotirada {len(dunyo.bo_laklar)} bo'lak")
@@ -1,6 +1,17 @@
 import pygame
 import heapq
 import os
+import sys
+import random
+
+from katak_turlari import TUPROQ, KOL, TOSH, DARAXT, MAYSA, BOSA_OLADI
+from tez_yo_l import YolTopuvchi
+from yetib_borish import BogliqlikIndeksi
+from masofa_xaritasi import MasofaKeshi
+from hamkor_yo_l import HamkorRejalashtiruvchi, tasodifiy_agentlar
+from xarita_chizuvchi import XaritaChizuvchi, Kamera, xarita_o_lchami
+from dunyo_fayli import Dunyo, oynada_yo_l_top
+from rasm_atlasi import atlas_yuklash
 
 # Pygame ishga tushirish
 pygame.init()
@@ -9,6 +20,9 @@ pygame.init()
 EKRAN_KENGLIK = 1200
 EKRAN_BALANDLIK = 700
 KATAK_HAJMI = 50  # Har bir katak 50x50 piksel
+FPS = 60  # chizish va tugmalarni o'qish tezligi
+QADAM_VAQTI = 1.0  # avatar bir katakni necha sekundda o'tadi
+DUNYO_OYNASI = 256  # dunyo faylida A dan B gacha masofa (katak)
 
 # Ranglar
 OQQUV = (255, 255, 255)
@@ -18,43 +32,30 @@ YASHILKO = (0, 255, 0)
 SARIQ = (255, 255, 0)
 QIZILKO = (255, 100, 100)
 
-# Xarita turlari
-TUPROQ = 0
-KOL = 1
-TOSH = 2
-DARAXT = 3
-MAYSA = 4
+
+# Rasm nomi -> rasmlar/ katalogidagi fayl
+RASM_FAYLLARI = {
+    'tuproq': 'tuproq.png',
+    'kol': 'kol.png',
+    'tosh': 'tosh.png',
+    'daraxt': 'daraxt.png',
+    'maysa': 'maysa.png',
+    'avatar': 'avatar.png'
+}
 
 
 # Rasmlarni yuklash
 def rasmlarni_yuklash():
-    """Rasmlarni yuklaydi"""
-    rasmlar = {}
+    """Rasmlarni yuklaydi (atlas keshi orqali, ekran formatida)"""
     rasm_dir = 'rasmlar'
 
     if not os.path.exists(rasm_dir):
         print(f"❌ {rasm_dir} katalogi topilmadi!")
-        return rasmlar
-
-    rasm_nomlari = {
-        'tuproq': 'tuproq.png',
-        'kol': 'kol.png',
-        'tosh': 'tosh.png',
-        'daraxt': 'daraxt.png',
-        'maysa': 'maysa.png',
-        'avatar': 'avatar.png'
-    }
-
-    for adi, fayl in rasm_nomlari.items():
-        path = os.path.join(rasm_dir, fayl)
-        try:
-            rasm = pygame.image.load(path)
-            rasm = pygame.transform.scale(rasm, (KATAK_HAJMI, KATAK_HAJMI))
-            rasmlar[adi] = rasm
-            print(f"✅ {adi}: {fayl} yuklandi")
-        except Exception as e:
-            print(f"❌ {adi}: {fayl} yuklash xatosi - {e}")
+        return {}
 
+    rasmlar = atlas_yuklash(rasm_dir, RASM_FAYLLARI, KATAK_HAJMI)
+    for adi in rasmlar:
+        print(f"✅ {adi}: {RASM_FAYLLARI[adi]} yuklandi")
     return rasmlar
 
 
@@ -108,8 +109,8 @@ def yo_l_top(xarita, boshlang_i, manzil):
         if x < 0 or x >= kenglik or y < 0 or y >= balandlik:
             return False
         katak = xarita[y][x]
-        # Faqat tuproq va maysa bosa olamiz
-        return katak in [TUPROQ, MAYSA]
+        # Narxi bor kataklar (tuproq, maysa, sayoz ko'l) bosiladi
+        return katak in BOSA_OLADI
 
     # Bosh qiymatlar
     open_set = [(0, boshlang_i)]
@@ -163,6 +164,7 @@ class Avatar:
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.oldingi = (x, y)  # oxirgi qadamdan oldingi katak (silliq chizish uchun)
         self.yo_l = []
         self.yo_l_indeksi = 0
         self.harakatlanmoqda = False
@@ -175,25 +177,33 @@ class Avatar:
 
     def yangilash(self):
         """Avatar harakatini yangilash"""
+        self.oldingi = (self.x, self.y)
         if self.harakatlanmoqda and self.yo_l_indeksi < len(self.yo_l):
             self.x, self.y = self.yo_l[self.yo_l_indeksi]
             self.yo_l_indeksi += 1
         elif self.yo_l_indeksi >= len(self.yo_l):
             self.harakatlanmoqda = False
 
-    def chizish(self, ekran, avatar_rasm):
+    def piksel(self, alfa=1.0):
+        """Oldingi va joriy katak orasidagi nuqta (alfa: 0 - oldingi, 1 - joriy), piksellarda"""
+        x = self.oldingi[0] + (self.x - self.oldingi[0]) * alfa
+        y = self.oldingi[1] + (self.y - self.oldingi[1]) * alfa
+        return round(x * KATAK_HAJMI), round(y * KATAK_HAJMI)
+
+    def chizish(self, ekran, avatar_rasm, kamera_x=0, kamera_y=0, alfa=1.0):
         """Avatarni ekranga chizish"""
+        px, py = self.piksel(alfa)
         if avatar_rasm:
-            ekran.blit(avatar_rasm, (self.x * KATAK_HAJMI, self.y * KATAK_HAJMI))
+            ekran.blit(avatar_rasm, (px - kamera_x, py - kamera_y))
         else:
             # Rasm bo'lmasa, sade aylana chiz
-            x_piksel = self.x * KATAK_HAJMI + KATAK_HAJMI // 2
-            y_piksel = self.y * KATAK_HAJMI + KATAK_HAJMI // 2
+            x_piksel = px + KATAK_HAJMI // 2 - kamera_x
+            y_piksel = py + KATAK_HAJMI // 2 - kamera_y
             pygame.draw.circle(ekran, SARIQ, (x_piksel, y_piksel), 15)
 
 
 # Asosiy o'yin
-def o_yin():
+def o_yin(xarita=None, avatarlar_soni=0):
     ekran = pygame.display.set_mode((EKRAN_KENGLIK, EKRAN_BALANDLIK))
     pygame.display.set_caption("Avatar Pathfinding - A* Algoritmi")
     soat = pygame.time.Clock()
@@ -201,19 +211,55 @@ def o_yin():
     # Rasmlarni yuklash
     rasmlar = rasmlarni_yuklash()
 
-    # Xarita yaratish
-    xarita = xarita_yaratish()
+    # Xarita yaratish (berilmasa - ekran o'lchamida)
+    if xarita is None:
+        xarita = xarita_yaratish()
+    kenglik, balandlik = xarita_o_lchami(xarita)
+
+    # Xarita bir marta bo'laklarga chiziladi, kamera faqat ko'rinadiganlarini ko'rsatadi
+    chizuvchi = XaritaChizuvchi(xarita, rasmlar, KATAK_HAJMI)
+    kamera = Kamera(EKRAN_KENGLIK, EKRAN_BALANDLIK, *chizuvchi.piksel_o_lchami)
 
     # A nuqta va B nuqta
     A = (2, 2)
-    B = (EKRAN_KENGLIK // KATAK_HAJMI - 3, EKRAN_BALANDLIK // KATAK_HAJMI - 3)
+    if isinstance(xarita, Dunyo):
+        # Fayldagi dunyoda yo'l A atrofidagi oynada qidiriladi
+        B = (min(kenglik, DUNYO_OYNASI) - 3, min(balandlik, DUNYO_OYNASI) - 3)
+    else:
+        B = (kenglik - 3, balandlik - 3)
 
     # Avatar
     avatar = Avatar(A[0], A[1])
 
     print("🔍 Yo'l topilmoqda...")
-    # Yo'l topish
-    yo_l = yo_l_top(xarita, A, B)
+    # Yo'l topish (tekis massivli A*, buferlar qayta ishlatiladi)
+    if isinstance(xarita, Dunyo):
+        def yo_l_topish(boshi=A):
+            return oynada_yo_l_top(xarita, boshi, B)
+    else:
+        topuvchi = YolTopuvchi(xarita)
+        # Bog'liq komponentlar: yetib bo'lmaydigan B darhol aniqlanadi
+        indeks = BogliqlikIndeksi(topuvchi)
+        # Relyef narxlari bilan: B uchun Dijkstra xaritasi bir marta hisoblanadi
+        kesh = MasofaKeshi(xarita)
+
+        def yo_l_topish(boshi=A):
+            yo_l = kesh.yo_l(boshi, B)
+            if yo_l:
+                return yo_l
+            yo_l, manzil = indeks.top(boshi, B)
+            if manzil is not None and manzil != B:
+                print(f"⚠️ B ga yetib bo'lmaydi, eng yaqin katak: {manzil}")
+            return yo_l
+
+    yo_l = yo_l_topish()
+
+    # Ko'p avatarli rejim: avatarlar bir-biriga to'qnashmasdan harakatlanadi
+    hamkorlar = None
+    if avatarlar_soni and not isinstance(xarita, Dunyo):
+        hamkorlar = HamkorRejalashtiruvchi(xarita)
+        tasodifiy_agentlar(hamkorlar, avatarlar_soni, random.Random())
+        hamkorlar_oldingi = hamkorlar.pozitsiyalar()
 
     if yo_l:
         print(f"✅ Yo'l topildi! Uzunlik: {len(yo_l)} katak")
@@ -225,60 +271,89 @@ def o_yin():
     shrift_katta = pygame.font.Font(None, 36)
     shrift_kichik = pygame.font.Font(None, 24)
 
+    # Simulyatsiya QADAM_VAQTI da bir qadam yuradi, chizish esa FPS tezlikda;
+    # qadamlar orasida avatar kataklar orasida silliq siljiydi
+    jamg_arma = 0.0
     ish_davom = True
     while ish_davom:
+        jamg_arma += soat.tick(FPS) / 1000
         for tadbir in pygame.event.get():
             if tadbir.type == pygame.QUIT:
                 ish_davom = False
             elif tadbir.type == pygame.KEYDOWN:
                 if tadbir.key == pygame.K_r:  # R tugmasi - qayta yo'l topish
-                    yo_l = yo_l_top(xarita, A, B)
+                    yo_l = yo_l_topish()
                     if yo_l:
                         avatar.yo_lni_belgilash(yo_l)
                         print("🔄 Yo'l qayta topildi!")
+            elif tadbir.type == pygame.MOUSEBUTTONDOWN and tadbir.button == 1 and not isinstance(xarita, Dunyo):
+                # Sichqoncha - katakni tosh/tuproqqa almashtirish
+                x = (tadbir.pos[0] + kamera.x) // KATAK_HAJMI
+                y = (tadbir.pos[1] + kamera.y) // KATAK_HAJMI
+                if x < kenglik and y < balandlik:
+                    yangi_tur = TUPROQ if xarita[y][x] == TOSH else TOSH
+                    xarita[y][x] = yangi_tur
+                    indeks.yangilash(x, y, yangi_tur)
+                    kesh.yangilash(x, y, yangi_tur)
+                    if hamkorlar:
+                        hamkorlar.yangilash(x, y, yangi_tur)
+                    chizuvchi.yangilash(x, y)
+                    if (x, y) in avatar.yo_l[avatar.yo_l_indeksi:]:
+                        # Tosh avatarning qolgan yo'liga qo'yildi - joriy katakdan qayta topiladi
+                        yo_l = yo_l_topish((avatar.x, avatar.y))
+                        avatar.yo_lni_belgilash(yo_l)
+                        if not yo_l:
+                            print("❌ Yo'l topilmadi!")
 
         # Ekranlarni rejalash
         ekran.fill(OQQUV)
 
+        # Avatarni yangilash (o'z taymeri bo'yicha), kamera avatarni kuzatadi
+        while jamg_arma >= QADAM_VAQTI:
+            jamg_arma -= QADAM_VAQTI
+            avatar.yangilash()
+            if hamkorlar:
+                hamkorlar_oldingi = hamkorlar.pozitsiyalar()
+                hamkorlar.qadam()
+            if isinstance(xarita, Dunyo):
+                xarita.yuklash(avatar.x, avatar.y, EKRAN_KENGLIK // KATAK_HAJMI)
+        alfa = jamg_arma / QADAM_VAQTI
+
+        px, py = avatar.piksel(alfa)
+        kamera.kuzatish(px + KATAK_HAJMI // 2, py + KATAK_HAJMI // 2)
+        kx, ky = kamera.x, kamera.y
+
         # Xaritani chizish
-        for y in range(len(xarita)):
-            for x in range(len(xarita[0])):
-                katak_turi = xarita[y][x]
-
-                if katak_turi == TUPROQ and 'tuproq' in rasmlar:
-                    ekran.blit(rasmlar['tuproq'], (x * KATAK_HAJMI, y * KATAK_HAJMI))
-                elif katak_turi == KOL and 'kol' in rasmlar:
-                    ekran.blit(rasmlar['kol'], (x * KATAK_HAJMI, y * KATAK_HAJMI))
-                elif katak_turi == TOSH and 'tosh' in rasmlar:
-                    ekran.blit(rasmlar['tosh'], (x * KATAK_HAJMI, y * KATAK_HAJMI))
-                elif katak_turi == DARAXT and 'daraxt' in rasmlar:
-                    ekran.blit(rasmlar['daraxt'], (x * KATAK_HAJMI, y * KATAK_HAJMI))
-                elif katak_turi == MAYSA and 'maysa' in rasmlar:
-                    ekran.blit(rasmlar['maysa'], (x * KATAK_HAJMI, y * KATAK_HAJMI))
+        chizuvchi.chizish(ekran, kamera)
 
         # Yo'lni chizish (sariq chiziqlar)
         if avatar.yo_l and len(avatar.yo_l) > 1:
             for i in range(len(avatar.yo_l) - 1):
-                x1 = avatar.yo_l[i][0] * KATAK_HAJMI + KATAK_HAJMI // 2
-                y1 = avatar.yo_l[i][1] * KATAK_HAJMI + KATAK_HAJMI // 2
-                x2 = avatar.yo_l[i + 1][0] * KATAK_HAJMI + KATAK_HAJMI // 2
-                y2 = avatar.yo_l[i + 1][1] * KATAK_HAJMI + KATAK_HAJMI // 2
+                x1 = avatar.yo_l[i][0] * KATAK_HAJMI + KATAK_HAJMI // 2 - kx
+                y1 = avatar.yo_l[i][1] * KATAK_HAJMI + KATAK_HAJMI // 2 - ky
+                x2 = avatar.yo_l[i + 1][0] * KATAK_HAJMI + KATAK_HAJMI // 2 - kx
+                y2 = avatar.yo_l[i + 1][1] * KATAK_HAJMI + KATAK_HAJMI // 2 - ky
                 pygame.draw.line(ekran, SARIQ, (x1, y1), (x2, y2), 3)
 
         # A va B nuqtalarni chizish
-        A_x = A[0] * KATAK_HAJMI + KATAK_HAJMI // 2
-        A_y = A[1] * KATAK_HAJMI + KATAK_HAJMI // 2
+        A_x = A[0] * KATAK_HAJMI + KATAK_HAJMI // 2 - kx
+        A_y = A[1] * KATAK_HAJMI + KATAK_HAJMI // 2 - ky
         pygame.draw.circle(ekran, QIZIL, (A_x, A_y), 15)
         pygame.draw.circle(ekran, QORA, (A_x, A_y), 15, 3)
 
-        B_x = B[0] * KATAK_HAJMI + KATAK_HAJMI // 2
-        B_y = B[1] * KATAK_HAJMI + KATAK_HAJMI // 2
+        B_x = B[0] * KATAK_HAJMI + KATAK_HAJMI // 2 - kx
+        B_y = B[1] * KATAK_HAJMI + KATAK_HAJMI // 2 - ky
         pygame.draw.circle(ekran, YASHILKO, (B_x, B_y), 15)
         pygame.draw.circle(ekran, QORA, (B_x, B_y), 15, 3)
 
-        # Avatarni yangilash va chizish
-        avatar.yangilash()
-        avatar.chizish(ekran, rasmlar.get('avatar'))
+        # Avatarni chizish
+        avatar.chizish(ekran, rasmlar.get('avatar'), kx, ky, alfa)
+        if hamkorlar:
+            for (x0, y0), (x, y) in zip(hamkorlar_oldingi, hamkorlar.pozitsiyalar()):
+                x = x0 + (x - x0) * alfa
+                y = y0 + (y - y0) * alfa
+                pygame.draw.circle(ekran, QIZILKO, (round(x * KATAK_HAJMI) + KATAK_HAJMI // 2 - kx,
+                                                   round(y * KATAK_HAJMI) + KATAK_HAJMI // 2 - ky), KATAK_HAJMI // 3)
 
         # Ma'lumot paneli
         panel_y = EKRAN_BALANDLIK - 130
@@ -300,11 +375,10 @@ def o_yin():
 
         ekran.blit(matn2, (20, panel_y + 50))
 
-        matn3 = shrift_kichik.render("R tugmasi - qayta yo'l topish", True, (100, 100, 100))
+        matn3 = shrift_kichik.render("R tugmasi - qayta yo'l topish, sichqoncha - tosh qo'yish/olish", True, (100, 100, 100))
         ekran.blit(matn3, (20, panel_y + 90))
 
         pygame.display.flip()
-        soat.tick(1)  # 1 katak/sekund (sekin harakat)
 
     pygame.quit()
 
@@ -312,4 +386,20 @@ def o_yin():
 if __name__ == "__main__":
     print("🎮 Avatar Pathfinding O'yni Boshlandi!")
     print("=" * 50)
-    o_yin()
\ No newline at end of file
+    avatarlar_soni = 0
+    if "--avatarlar" in sys.argv:
+        # python game.py [...] --avatarlar 100
+        i = sys.argv.index("--avatarlar")
+        avatarlar_soni = int(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+    if len(sys.argv) == 2:
+        # Fayldagi bo'lakli dunyo: python game.py dunyo.bin
+        with Dunyo(sys.argv[1]) as dunyo:
+            o_yin(dunyo, avatarlar_soni)
+    elif len(sys.argv) >= 3:
+        # Katta dunyo: python game.py <kenglik> <balandlik> [urug']
+        from xarita_generator import xarita_yaratish_np
+        urug = int(sys.argv[3]) if len(sys.argv) > 3 else None
+        o_yin(xarita_yaratish_np(int(sys.argv[1]), int(sys.argv[2]), urug), avatarlar_soni)
+    else:
+        o_yin(avatarlar_soni=avatarlar_soni)
\ No newline at end of file
@@ -0,0 +1,441 @@
+import sys
+import time
+import heapq
+import random
+from collections import OrderedDict
+
+from tez_yo_l import O_TISH_JADVALI, o_tish_xaritasi
+from masofa_xaritasi import MasofaXaritasi, CHEKSIZ
+
+OYNA = 16  # rejalashtirish oynasi (qadam)
+QAYTA_REJA = 8  # har agent necha qadamda qayta rejalashtiriladi (OYNA dan kichik)
+MAKS_EVRISTIKALAR = 1024  # barcha manzillar sig'ishi kerak, aks holda Dijkstra qayta-qayta hisoblanadi
+YO_L_BERISH = 1  # boshqa avatar zaxirasiga kirish (u yo'l beradi) uchun qo'shimcha narx
+TURIB_QOLDI = 24  # shuncha qadam manzilga yaqinlashmagan avatar ustunlik oladi
+MAKS_SURISH = 3  # yo'l bergan avatar ham boshqalarni shuncha qavatgacha sura oladi
+QISQA_OYNA = 2  # butun oynaga surish o'xshamasa, ustun avatar shuncha qadamga rejalashtiriladi
+
+
+class Agent:
+    """Ko'p avatarli rejimdagi bitta avatar (kataklar tekis indekslarda)"""
+
+    def __init__(self, raqam, joriy, manzil):
+        self.raqam = raqam
+        self.joriy = joriy
+        self.manzil = manzil
+        self.reja = [joriy]  # reja[k] - (reja_vaqti + k) paytdagi katak
+        self.reja_vaqti = 0
+        self.eng_yaqin = None  # shu paytgacha manzilga eng kichik masofa
+        self.yutuq_vaqti = 0  # eng_yaqin oxirgi marta yaxshilangan payt
+
+    @property
+    def yetdi(self):
+        return self.joriy == self.manzil
+
+    @property
+    def reja_oxiri(self):
+        """Reja tugaydigan payt: undan keyin avatar reja[-1] katakda turadi"""
+        return self.reja_vaqti + len(self.reja) - 1
+
+
+class HamkorRejalashtiruvchi:
+    """Cooperative A*: avatarlar fazo-vaqtda, bir-birining zaxiralarini chetlab rejalashtiriladi.
+
+    Zaxira jadvali (katak, vaqt) va (qayerdan, qayerga, vaqt) kalitlarini avatar raqamiga
+    bog'laydi, shuning uchun bir katakka ikki avatar tushmaydi va ikki avatar bir-biridan
+    "o'tib" ketmaydi. Reja oxiridagi katak keyingi reja tuzilguncha band turadi.
+
+    Har bir reja faqat OYNA qadamga tuziladi, oxiri esa manzilgacha haqiqiy masofa
+    (Dijkstra xaritasi) bilan baholanadi. Avatarlar navbatma-navbat, har QAYTA_REJA
+    qadamda qayta rejalashtiriladi; manzilda turganlari esa faqat yo'l berish kerak
+    bo'lganda.
+
+    Yo'l berish: rejasi tugab turgan avatar katagidan istalgan avatar YO_L_BERISH narx
+    bilan o'ta oladi. TURIB_QOLDI qadamdan beri manzilga yaqinlashmagan avatar esa o'zidan
+    past ustunlikdagi avatarlarning barcha zaxiralaridan shunday o'ta oladi (tor yo'lakda
+    qarama-qarshi kelganlar uchun). Yo'l berganlar uning rejasini chetlab qayta
+    rejalashtiriladi (o'zlari ham xuddi shunday MAKS_SURISH qavatgacha surib);
+    kimdir chetga chiqa olmasa, butun o'zgarish bekor qilinadi va ustunlik navbatdagi
+    turib qolgan avatarga o'tadi.
+    """
+
+    def __init__(self, xarita, oyna=OYNA, qayta_reja=QAYTA_REJA):
+        self.kenglik = len(xarita[0])
+        self.balandlik = len(xarita)
+        self.qator = self.kenglik + 2
+        self.o_tish = o_tish_xaritasi(xarita)
+        self.oyna = oyna
+        self.qayta_reja = qayta_reja
+        self.agentlar = []
+        self.zaxira = {}
+        self.oxirgi_katak = {}  # reja oxiridan keyin ham egasi turadigan katak -> avatar
+        self.vaqt = 0
+        self.evristikalar = OrderedDict()
+        self.qidiruvlar = 0  # statistika
+
+    def indeks(self, x, y):
+        return (y + 1) * self.qator + x + 1
+
+    def katak(self, indeks):
+        y, x = divmod(indeks, self.qator)
+        return x - 1, y - 1
+
+    def _evristika(self, manzil):
+        """Manzilgacha haqiqiy masofa - bir manzilli avatarlar uchun umumiy"""
+        xarita = self.evristikalar.get(manzil)
+        if xarita is None:
+            xarita = self.evristikalar[manzil] = MasofaXaritasi(self.o_tish, self.qator, manzil)
+            if len(self.evristikalar) > MAKS_EVRISTIKALAR:
+                self.evristikalar.popitem(last=False)
+        else:
+            self.evristikalar.move_to_end(manzil)
+        return xarita.masofa
+
+    def yangilash(self, x, y, katak_turi):
+        """Katak turi o'zgardi: evristikalar joyida tuzatiladi; katak devorga aylansa, qolgan
+        rejasi undan o'tadigan avatarlar rejasi devor oldida kesilib, darhol qayta rejalashtiriladi"""
+        i = self.indeks(x, y)
+        eski = self.o_tish[i]
+        self.o_tish[i] = O_TISH_JADVALI[katak_turi]
+        if self.o_tish[i] == eski:
+            return
+        for xarita in self.evristikalar.values():
+            xarita.yangilash(i, eski)
+        if self.o_tish[i]:
+            return  # ochilgan katak mavjud rejalarga xalaqit bermaydi
+        atrof = (0, 1, -1, self.qator, -self.qator)
+        ta_sirlanganlar = []
+        for agent in self.agentlar:
+            h = self._evristika(agent.manzil)
+            if all(h[agent.joriy + q] == CHEKSIZ for q in atrof):
+                # Manzil devor ortida qoldi - qo_shish dagi kabi avatar joyida qoladi, yo'l beradi
+                agent.manzil = agent.joriy
+                agent.eng_yaqin = None
+            elif i != agent.joriy and i not in agent.reja[self.vaqt - agent.reja_vaqti:]:
+                continue
+            ta_sirlanganlar.append(agent)
+        # Avval hammasining rejasi devordan oldin kesiladi: navbatdagilar eski rejadagi
+        # bo'sh joyga emas, avatar haqiqatan to'xtaydigan katakka qarab rejalashtiriladi
+        for agent in ta_sirlanganlar:
+            k = min(self.vaqt - agent.reja_vaqti, len(agent.reja) - 1)
+            oxiri = next((j for j in range(k + 1, len(agent.reja)) if agent.reja[j] == i), len(agent.reja))
+            self._zaxirani_o_chirish(agent)
+            agent.reja = agent.reja[:oxiri]
+            self._zaxiralash(agent)
+        # Kesilgan reja oxiriga yo'l olganlar ham qayta rejalashtiriladi
+        for agent in list(ta_sirlanganlar):
+            ta_sirlanganlar += [b for b in self._yo_l_beruvchilar(agent) if b not in ta_sirlanganlar]
+        for agent in ta_sirlanganlar:
+            self.rejalash(agent)
+
+    def qo_shish(self, boshlang_i, manzil):
+        boshi, oxiri = self.indeks(*boshlang_i), self.indeks(*manzil)
+        if self._evristika(oxiri)[boshi] == CHEKSIZ:
+            oxiri = boshi  # manzilga yetib bo'lmaydi - avatar joyida qoladi, lekin yo'l beradi
+        agent = Agent(len(self.agentlar), boshi, oxiri)
+        agent.reja_vaqti = self.vaqt
+        self.agentlar.append(agent)
+        self.zaxira[(agent.joriy, self.vaqt)] = agent.raqam
+        self.oxirgi_katak[agent.joriy] = agent.raqam
+        return agent
+
+    def _zaxirani_o_chirish(self, agent):
+        for k, katak in enumerate(agent.reja):
+            t = agent.reja_vaqti + k
+            if self.zaxira.get((katak, t)) == agent.raqam:
+                del self.zaxira[(katak, t)]
+            if k and self.zaxira.get((agent.reja[k - 1], katak, t)) == agent.raqam:
+                del self.zaxira[(agent.reja[k - 1], katak, t)]
+        if self.oxirgi_katak.get(agent.reja[-1]) == agent.raqam:
+            del self.oxirgi_katak[agent.reja[-1]]
+
+    def _zaxiralash(self, agent):
+        for k, katak in enumerate(agent.reja):
+            t = agent.reja_vaqti + k
+            self.zaxira[(katak, t)] = agent.raqam
+            if k and agent.reja[k - 1] != katak:
+                self.zaxira[(agent.reja[k - 1], katak, t)] = agent.raqam
+        self.oxirgi_katak[agent.reja[-1]] = agent.raqam
+
+    def _to_xtash_mumkin(self, katak, t, raqam, itariladi=frozenset(), band=()):
+        """Reja t paytda katak da tugasa, avatar u yerda keyin ham tura oladimi
+        (itariladi dagilar keyin chetga suriladi)"""
+        egasi = self.oxirgi_katak.get(katak)
+        if egasi is not None and egasi != raqam and (egasi not in itariladi or egasi in band):
+            return False
+        zaxira = self.zaxira
+        for t2 in range(t + 1, self.vaqt + self.oyna + 1):
+            egasi = zaxira.get((katak, t2))
+            if egasi is not None and egasi != raqam and (egasi not in itariladi or egasi in band):
+                return False
+        return True
+
+    def _qidirish(self, agent, yo_l_so_rash=True, itariladi=frozenset(), band=(), oyna=None):
+        """Fazo-vaqt A* (oyna chuqurligigacha): (katak indekslari ro'yxati, reja to'g'rimi).
+
+        yo_l_so_rash - rejasi tugab turgan avatarlar katagidan o'tishga ruxsat; itariladi -
+        zaxiralaridan ham o'tish mumkin bo'lgan avatar raqamlari; band dagilar (shu
+        o'zgarishda qayta rejalashtirilganlar) esa surilmaydi. Reja oxiri har doim hech
+        kimga xalaqit bermaydigan katakda bo'ladi.
+        """
+        self.qidiruvlar += 1
+        o_tish = self.o_tish
+        zaxira = self.zaxira
+        oxirgi_katak = self.oxirgi_katak
+        agentlar = self.agentlar
+        reja_oxirlari = {}  # qidiruv davomida rejalar o'zgarmaydi
+        h = self._evristika(agent.manzil)
+        t0 = self.vaqt
+        oyna = oyna or self.oyna
+        raqam = agent.raqam
+        manzil = agent.manzil
+        harakatlar = (0, 1, -1, self.qator, -self.qator)
+
+        boshi = (agent.joriy, 0)
+        eng_chuqur = boshi
+        g = {boshi: 0}
+        ota = {boshi: None}
+        navbat = [(h[agent.joriy], 0, boshi)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        to_g_ri = True
+
+        while navbat:
+            f, _, holat = heappop(navbat)
+            katak, d = holat
+            if f > g[holat] + h[katak]:
+                continue  # bu holatga keyinroq arzonroq yo'l topilgan
+            if d == oyna:
+                if self._to_xtash_mumkin(katak, t0 + d, raqam, itariladi, band):
+                    break
+                continue
+            if d > eng_chuqur[1] and self._to_xtash_mumkin(katak, t0 + d, raqam, itariladi, band):
+                eng_chuqur = holat
+            t = t0 + d + 1
+            # Almashish faqat t paytda shu katakka boshqa avatar kelsa mumkin
+            almashish = zaxira.get((katak, t), raqam) != raqam
+            for qadam in harakatlar:
+                yangi = katak + qadam
+                if not o_tish[yangi] or h[yangi] == CHEKSIZ:
+                    continue
+                # Manzilda kutish bepul, qolgan har bir qadam (kutish ham) 1
+                narx = 0 if katak == yangi == manzil else 1
+                egasi = zaxira.get((yangi, t))
+                if egasi is not None and egasi != raqam:
+                    if egasi not in itariladi or egasi in band:
+                        continue
+                    narx += YO_L_BERISH
+                # Qarama-qarshi yo'nalishda almashish (swap) taqiqlanadi
+                if almashish:
+                    egasi = zaxira.get((yangi, katak, t))
+                    if egasi is not None and egasi != raqam:
+                        if egasi not in itariladi or egasi in band:
+                            continue
+                        narx += YO_L_BERISH
+                # Boshqa avatar rejasi tugagach shu katakda turib qoladi
+                egasi = oxirgi_katak.get(yangi)
+                if egasi is not None and egasi != raqam:
+                    oxiri = reja_oxirlari.get(egasi)
+                    if oxiri is None:
+                        oxiri = reja_oxirlari[egasi] = agentlar[egasi].reja_oxiri
+                    if t >= oxiri:
+                        if egasi in band or not (yo_l_so_rash or egasi in itariladi):
+                            continue
+                        narx += YO_L_BERISH
+                keyingi = (yangi, d + 1)
+                yangi_g = g[holat] + narx
+                if keyingi not in g or yangi_g < g[keyingi]:
+                    g[keyingi] = yangi_g
+                    ota[keyingi] = holat
+                    heappush(navbat, (yangi_g + h[yangi], -(d + 1), keyingi))
+        else:
+            # Oyna oxirigacha bo'sh yo'l yo'q - eng uzoqqa boradigan qisqa reja olinadi,
+            # u tugaganda avatar yana rejalashtiriladi
+            holat = eng_chuqur
+            if not eng_chuqur[1]:
+                holat = (agent.joriy, 1)
+                ota[holat] = boshi
+                to_g_ri = self._to_xtash_mumkin(agent.joriy, t0 + 1, raqam) and \
+                    zaxira.get((agent.joriy, t0 + 1), raqam) == raqam
+
+        reja = []
+        while holat is not None:
+            reja.append(holat[0])
+            holat = ota[holat]
+        return reja[::-1], to_g_ri
+
+    def _ustunlik(self, agent):
+        """Kimning yutuq_vaqti eskiroq - o'sha ustun (tartib rejalash navbatiga bog'liq emas)"""
+        return -agent.yutuq_vaqti, -agent.raqam
+
+    def _itariladiganlar(self, agent):
+        """Turib qolgan avatar zaxiralaridan o'ta oladigan (past ustunlikdagi) avatarlar"""
+        if self.vaqt - agent.yutuq_vaqti < TURIB_QOLDI:
+            return frozenset()
+        ustunlik = self._ustunlik(agent)
+        return frozenset(b.raqam for b in self.agentlar if self._ustunlik(b) < ustunlik)
+
+    def _yo_l_beruvchilar(self, agent):
+        """agent rejasi (hali zaxiralanmagan) boshqa zaxiralar bilan to'qnashadigan avatarlar -
+        eng erta to'qnashadigani (qochishga joyi eng kami) birinchi"""
+        zaxira = self.zaxira
+        vaqtlar = {}
+        for k in range(1, len(agent.reja)):
+            t = agent.reja_vaqti + k
+            katak = agent.reja[k]
+            egalar = [zaxira.get((katak, t)), zaxira.get((katak, agent.reja[k - 1], t))]
+            egasi = self.oxirgi_katak.get(katak)
+            if egasi is not None and t >= self.agentlar[egasi].reja_oxiri:
+                egalar.append(egasi)
+            for egasi in egalar:
+                if egasi is not None and egasi != agent.raqam:
+                    vaqtlar.setdefault(egasi, t)
+        # Reja oxiridagi katakka keyinroq kiradigan yoki unda turib qoladiganlar
+        oxiri = agent.reja[-1]
+        egalar = [zaxira.get((oxiri, t)) for t in range(agent.reja_oxiri + 1, self.vaqt + self.oyna + 1)]
+        egalar.append(self.oxirgi_katak.get(oxiri))
+        for egasi in egalar:
+            if egasi is not None and egasi != agent.raqam:
+                vaqtlar.setdefault(egasi, agent.reja_oxiri)
+        return [self.agentlar[r] for r in sorted(vaqtlar, key=vaqtlar.get)]
+
+    def _joylash(self, agent, jurnal, kutayotgan, yo_l_so_rash, itariladi=frozenset(), qavat=0,
+                 oyna=None):
+        """agent ni qayta rejalashtirib, yo'lidagilarni chetga suradi; eski rejalar jurnalga
+        yoziladi. Hamma chetga chiqa olsa True.
+
+        Navbati hali kelmagan surilganlar (kutayotgan) zaxirasi joyida, lekin yumshoq qoladi:
+        oldinroq joylashayotganlar ularga bekordan-bekor kirib qolmaydi.
+        """
+        kutayotgan.discard(agent.raqam)
+        jurnal.setdefault(agent.raqam, (agent.reja, agent.reja_vaqti))
+        self._zaxirani_o_chirish(agent)
+        agent.reja_vaqti = self.vaqt
+        band = jurnal.keys() - kutayotgan
+        agent.reja, to_g_ri = self._qidirish(agent, yo_l_so_rash, itariladi | kutayotgan, band, oyna)
+        if not to_g_ri:
+            return False
+        yo_l_beruvchilar = [b for b in self._yo_l_beruvchilar(agent) if b.raqam not in jurnal]
+        for b in yo_l_beruvchilar:
+            jurnal[b.raqam] = (b.reja, b.reja_vaqti)
+            kutayotgan.add(b.raqam)
+        self._zaxiralash(agent)
+        if qavat >= MAKS_SURISH:
+            yo_l_so_rash, itariladi = False, frozenset()
+        return all(b.raqam not in kutayotgan or
+                   self._joylash(b, jurnal, kutayotgan, yo_l_so_rash, itariladi, qavat + 1)
+                   for b in yo_l_beruvchilar)
+
+    def _bekor_qilish(self, jurnal):
+        for raqam in jurnal:
+            self._zaxirani_o_chirish(self.agentlar[raqam])
+        for raqam, (reja, reja_vaqti) in jurnal.items():
+            agent = self.agentlar[raqam]
+            agent.reja, agent.reja_vaqti = reja, reja_vaqti
+            self._zaxiralash(agent)
+
+    def rejalash(self, agent, yo_l_so_rash=True):
+        """Avval ustunlik bilan (turib qolgan bo'lsa), keyin faqat turganlarni surib, oxiri
+        hech kimni surmasdan rejalashtiradi"""
+        urinishlar = []
+        if yo_l_so_rash:
+            itariladi = self._itariladiganlar(agent)
+            if itariladi:
+                urinishlar += [(itariladi, None), (itariladi, QISQA_OYNA)]
+            urinishlar.append((frozenset(), None))
+        for itariladi, oyna in urinishlar:
+            jurnal = {}
+            if self._joylash(agent, jurnal, set(), True, itariladi, oyna=oyna):
+                break
+            self._bekor_qilish(jurnal)
+            if oyna:
+                # Ustunlik ham yordam bermadi: navbat boshqa turib qolganga o'tadi
+                # (masalan, tor yo'lakda aynan shu avatar orqaga chekinishi kerak)
+                agent.yutuq_vaqti = self.vaqt
+        else:
+            self._zaxirani_o_chirish(agent)
+            agent.reja_vaqti = self.vaqt
+            agent.reja, _ = self._qidirish(agent, yo_l_so_rash=False)
+            self._zaxiralash(agent)
+
+        masofa = self._evristika(agent.manzil)[agent.joriy]
+        if agent.yetdi:
+            agent.yutuq_vaqti = self.vaqt
+        elif agent.eng_yaqin is None or masofa < agent.eng_yaqin:
+            agent.eng_yaqin = masofa
+            # Ustunlik olgan avatar uni manzilgacha saqlaydi - aks holda tor yo'lakda
+            # surilganlar navbat bilan uni qaytarib surar edi
+            if self.vaqt - agent.yutuq_vaqti < TURIB_QOLDI:
+                agent.yutuq_vaqti = self.vaqt
+
+    def qadam(self):
+        """Barcha avatarlarni bir qadam yuritadi, navbati kelganlarini qayta rejalashtiradi"""
+        navbatdagilar = []
+        for agent in self.agentlar:
+            tugadi = self.vaqt >= agent.reja_oxiri
+            if agent.yetdi and tugadi and agent.reja[-1] == agent.manzil:
+                continue  # manzilda turibdi - faqat yo'l berish kerak bo'lsa rejalashtiriladi
+            if tugadi or (self.vaqt + agent.raqam) % self.qayta_reja == 0:
+                navbatdagilar.append(agent)
+        # Ko'proq turib qolganlar birinchi (bo'sh zaxiralarni ular oladi), teng bo'lsa navbat aylanadi
+        n = len(self.agentlar)
+        navbatdagilar.sort(key=lambda a: (a.yutuq_vaqti, (a.raqam - self.vaqt) % n))
+        for agent in navbatdagilar:
+            self.rejalash(agent)
+
+        self.vaqt += 1
+        for agent in self.agentlar:
+            k = self.vaqt - agent.reja_vaqti
+            if k < len(agent.reja):
+                agent.joriy = agent.reja[k]
+
+    def pozitsiyalar(self):
+        return [self.katak(agent.joriy) for agent in self.agentlar]
+
+    def to_qnashuvlar(self):
+        """Bir katakda turgan avatar juftlari soni (tekshiruv uchun)"""
+        kataklar = [agent.joriy for agent in self.agentlar]
+        return len(kataklar) - len(set(kataklar))
+
+
+def tasodifiy_agentlar(rejalashtiruvchi, soni, rng):
+    """Bir-biriga to'qnashmaydigan boshlang'ich va manzil kataklari bilan avatarlar"""
+    bo_sh = [i for i, qiymat in enumerate(rejalashtiruvchi.o_tish) if qiymat]
+    rng.shuffle(bo_sh)
+    boshlar, manzillar = bo_sh[:soni], bo_sh[soni:2 * soni]
+    for boshi, manzil in zip(boshlar, manzillar):
+        rejalashtiruvchi.qo_shish(rejalashtiruvchi.katak(boshi), rejalashtiruvchi.katak(manzil))
+
+
+def benchmark(razmer=64, qadamlar=300, urug=0):
+    from xarita_generator import xarita_yaratish_np
+
+    xarita = xarita_yaratish_np(razmer, razmer, urug=urug)
+    print(f"{razmer}x{razmer}, oyna {OYNA}, qayta reja har {QAYTA_REJA} qadamda, {qadamlar} qadam")
+    for soni in (25, 50, 100, 200, 400):
+        rejalashtiruvchi = HamkorRejalashtiruvchi(xarita)
+        start = time.perf_counter()
+        tasodifiy_agentlar(rejalashtiruvchi, soni, random.Random(urug))
+        rejalashtiruvchi.qadam()  # birinchi qadam: evristikalar va hamma rejalar
+        boshlash = time.perf_counter() - start
+
+        to_qnashuvlar = 0
+        eng_sekin = 0
+        qidiruvlar = rejalashtiruvchi.qidiruvlar
+        start = time.perf_counter()
+        for _ in range(qadamlar - 1):
+            t = time.perf_counter()
+            rejalashtiruvchi.qadam()
+            eng_sekin = max(eng_sekin, time.perf_counter() - t)
+            to_qnashuvlar += rejalashtiruvchi.to_qnashuvlar()
+        vaqt = time.perf_counter() - start
+        qidiruvlar = rejalashtiruvchi.qidiruvlar - qidiruvlar
+
+        yetganlar = sum(agent.yetdi for agent in rejalashtiruvchi.agentlar)
+        print(f"{soni:4d} avatar: boshlash {boshlash * 1000:6.0f} ms | {vaqt / (qadamlar - 1) * 1000:5.1f} ms/qadam "
+              f"(eng sekin {eng_sekin * 1000:5.1f}) | {qidiruvlar / vaqt:5.0f} reja/s | "
+              f"yetdi {yetganlar}/{soni} | to'qnashuv {to_qnashuvlar}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 64)
@@ -0,0 +1,16 @@
+# Xarita katak turlari (game.py va yo'l topish modullari uchun umumiy)
+TUPROQ = 0
+KOL = 1
+TOSH = 2
+DARAXT = 3
+MAYSA = 4
+
+# Avatar tuproq va maysadan yuradi, ko'lning sayoz joyidan esa qimmatga kechib o'tadi.
+# Barcha yo'l topuvchilar uchun yagona qoida: narxi noldan katta katak - bosiladi
+# (masofa xaritalari narxni ham hisobga oladi)
+NARXLAR = {
+    TUPROQ: 3,
+    MAYSA: 2,
+    KOL: 12,
+}
+BOSA_OLADI = tuple(t for t, narx in NARXLAR.items() if narx)
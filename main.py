@@ -1,15 +1,19 @@
+import sys
+import time
 import random
+import argparse
+import threading
+from collections import deque
+
 import cv2
-import time
+import numpy as np
 
 face_cascade = cv2.CascadeClassifier(r"C:\Users\user\Desktop\1234\haarcascade_frontalface_default.xml")
 smile_cascade = cv2.CascadeClassifier(r"C:\Users\user\Desktop\1234\haarcascade_smile.xml")
 
-video = cv2.VideoCapture(0)
-
 num = 0
 
-def smile_meter(frame, x1, y1):
+def smile_meter(frame, x1, y1, pause=True):
     global num
     if num % 4000 == 0:
         x = str(random.randint(0, 100))
@@ -17,7 +21,8 @@ def smile_meter(frame, x1, y1):
         color = (255, 0, 255)
         cv2.putText(frame, "Your smile is", (int(x1) + 15, int(y1) - 70), font, 1, color, 4, cv2.LINE_AA)
         cv2.putText(frame, x + "%", (int(x1) + 50, int(y1) - 20), font, 1, color, 4, cv2.LINE_AA)
-        time.sleep(1.5)
+        if pause:
+            time.sleep(1.5)
         num = 0
         return num
     else:
@@ -28,24 +33,374 @@ def smile_meter(frame, x1, y1):
         cv2.putText(frame, x + "%", (int(x1) + 50, int(y1) - 20), font, 1, color, 4, cv2.LINE_AA)
         num += 1
         return num
-while True:
-    check, frame = video.read()
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
-    face = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)
 
-    for x, y, w, h in face:
-        img = cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 1)
-        smile = smile_cascade.detectMultiScale(gray, scaleFactor=1.8, minNeighbors=20)
+def detect_smiles(gray, face):
+    """Yuzning pastki yarmidagi tabassumlar, kadr koordinatalarida.
+
+    Qidiruv gray ning ko'rinishida (nusxa olinmaydi) - butun kadrdan ancha kichik.
+    """
+    x, y, w, h = face
+    top = y + h // 2
+    lower_half = gray[top:y + h, x:x + w]
+    smiles = smile_cascade.detectMultiScale(lower_half, scaleFactor=1.8, minNeighbors=20)
+    return [(x + x1, top + y1, w1, h1) for x1, y1, w1, h1 in smiles]
+
+
+def detect_faces(gray):
+    return [tuple(box) for box in face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5)]
+
+
+def detect(gray):
+    """Kadrdagi yuzlar va har biriga tegishli tabassumlar: [(yuz, [tabassum, ...]), ...]"""
+    return [(box, detect_smiles(gray, box)) for box in detect_faces(gray)]
+
+
+class ScaledDetector:
+    """detect() ning kichraytirilgan kadrda ishlaydigan varianti (scale - tomonlar ulushi).
+
+    Kichik kulrang bufer bir marta ajratiladi, har kadrda cv2.resize shu buferga yozadi.
+    Topilgan yuzlar to'liq o'lcham koordinatalariga qaytariladi. refine=True bo'lsa
+    tabassum to'liq o'lchamli kadrda, faqat yuz ichida qidiriladi, aks holda kichik kadrda.
+    """
+
+    def __init__(self, scale=0.5, refine=True):
+        self.scale = scale
+        self.refine = refine
+        self.small = None
+
+    def _resize(self, gray):
+        height, width = gray.shape[:2]
+        size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+        if self.small is None or self.small.shape != size[::-1]:
+            self.small = np.empty(size[::-1], dtype=gray.dtype)
+        cv2.resize(gray, size, dst=self.small, interpolation=cv2.INTER_AREA)
+        return self.small
+
+    def _up(self, box):
+        k = 1 / self.scale
+        return tuple(int(v * k) for v in box)
+
+    def faces(self, gray):
+        """Yuzlar to'liq o'lcham koordinatalarida"""
+        if self.scale == 1:
+            return detect_faces(gray)
+        return [self._up(box) for box in detect_faces(self._resize(gray))]
+
+    def __call__(self, gray):
+        if self.refine or self.scale == 1:
+            return [(box, detect_smiles(gray, box)) for box in self.faces(gray)]
+        return [(self._up(box), [self._up(smile) for smile in smiles])
+                for box, smiles in detect(self._resize(gray))]
+
+
+def draw(frame, faces, pause=True):
+    """pause=False - smile_meter natijani ko'rsatishda chizish oqimini to'xtatmaydi"""
+    for (x, y, w, h), smile in faces:
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 0, 255), 1)
 
         for x1, y1, w1, h1 in smile:
-            img = cv2.rectangle(frame, (x1, y1), (x1 + w1, y1 + h1), (255, 0, 0), 3)
-            smile_meter(frame, x, y)
+            cv2.rectangle(frame, (x1, y1), (x1 + w1, y1 + h1), (255, 0, 0), 3)
+        if smile:
+            smile_meter(frame, x, y, pause)
+
+
+class FaceTracker:
+    """To'liq yuz aniqlash har N kadrda, oraliqda yuzlar shablon bo'yicha kuzatiladi.
+
+    Har bir yuz aniqlangan kadrdagi o'z tasviri (shablon) bilan atrofdagi kichik oynada
+    cv2.matchTemplate orqali qidiriladi. Moslik min_score dan tushsa, shu kadrning o'zida
+    to'liq aniqlash qilinadi. N harakatga moslashadi: yuzlar tez siljisa kamayadi,
+    joyida tursa max_interval gacha o'sadi. Tabassum har kadrda yuz ichida qidiriladi.
+    """
+
+    def __init__(self, interval=10, min_interval=2, max_interval=30, min_score=0.6, margin=0.5,
+                 find_faces=detect_faces):
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.min_score = min_score
+        self.margin = margin  # qidiruv oynasi: yuz o'lchamining shu ulushicha har tomonga
+        self.find_faces = find_faces  # masalan, ScaledDetector.faces
+        self.faces = []  # [(yuz, shablon), ...]
+        self.since = 0  # oxirgi to'liq aniqlashdan beri kadrlar
+        self.lost = True
+        self.detections = 0
+        self.tracked = 0
+
+    def update(self, gray):
+        """detect() bilan bir xil natija: [(yuz, [tabassum, ...]), ...]"""
+        self.since += 1
+        if self.lost or self.since >= self.interval or not self.faces:
+            boxes = self._detect(gray)
+        else:
+            boxes = self._track(gray)
+            if self.lost:
+                # Yuz yo'qoldi - shu kadrning o'zida to'liq aniqlash, aks holda ramka bir kadr o'chadi
+                boxes = self._detect(gray)
+        return [(box, detect_smiles(gray, box)) for box in boxes]
+
+    def _detect(self, gray):
+        self.faces = [((x, y, w, h), gray[y:y + h, x:x + w].copy()) for x, y, w, h in self.find_faces(gray)]
+        self.since = 0
+        self.lost = False
+        self.detections += 1
+        if not self.faces:
+            # Yuz yo'q - yangisi paydo bo'lishini tez sezish uchun
+            self.interval = self.min_interval
+        return [box for box, _ in self.faces]
+
+    def _track(self, gray):
+        height, width = gray.shape[:2]
+        tracked = []
+        motion = 0.0
+        for (x, y, w, h), template in self.faces:
+            dx, dy = int(w * self.margin), int(h * self.margin)
+            left, top = max(0, x - dx), max(0, y - dy)
+            window = gray[top:min(height, y + h + dy), left:min(width, x + w + dx)]
+            if window.shape[0] < h or window.shape[1] < w:
+                self.lost = True
+                continue
+            scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (mx, my) = cv2.minMaxLoc(scores)
+            if score < self.min_score:
+                self.lost = True  # ishonch tushdi - update shu kadrda to'liq aniqlaydi
+                continue
+            nx, ny = left + mx, top + my
+            motion = max(motion, (abs(nx - x) + abs(ny - y)) / w)
+            tracked.append(((nx, ny, w, h), template))
+
+        if not self.lost:
+            self.faces = tracked
+        if motion > 0.1:
+            self.interval = max(self.min_interval, self.interval // 2)
+        elif motion < 0.02:
+            self.interval = min(self.max_interval, self.interval + 1)
+        self.tracked += 1
+        return [box for box, _ in tracked]
+
+
+class LatestQueue:
+    """Chegaralangan navbat: to'lganda eng eski element tashlanadi (yozuvchi hech qachon kutmaydi)"""
+
+    def __init__(self, maxsize=1):
+        self.items = deque(maxlen=maxsize)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1
+            self.items.append(item)
+            self.cond.notify()
 
-    cv2.imshow("Smile Meter", frame)
-    key = cv2.waitKey(1)
-    if key == ord('q'):
-        break
+    def get(self, timeout=None):
+        """Eng eski element; navbat yopilgan va bo'sh bo'lsa (yoki timeout) None"""
+        with self.cond:
+            self.cond.wait_for(lambda: self.items or self.closed, timeout)
+            return self.items.popleft() if self.items else None
 
-video.release()
-cv2.destroyAllWindows()
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+
+
+def open_source(source):
+    """Kamera raqami ("0") yoki video fayl yo'li"""
+    return cv2.VideoCapture(int(source) if str(source).isdigit() else source)
+
+
+class CaptureThread(threading.Thread):
+    """Kadrlarni o'qiydi: (kadr raqami, kadr) - ekranga, (kadr raqami, kulrang) - aniqlashga.
+
+    Aniqlash o'zining kulrang nusxasini oladi, shuning uchun ekranda kadrga chizish
+    unga xalaqit bermaydi. Video fayl kamera o'rnini bosishi uchun o'z FPS ida o'qiladi.
+    """
+
+    def __init__(self, video, display, detection, realtime=True):
+        super().__init__(daemon=True)
+        self.video = video
+        self.display = display
+        self.detection = detection
+        fps = video.get(cv2.CAP_PROP_FPS) if realtime else 0
+        self.period = 1 / fps if fps and video.get(cv2.CAP_PROP_FRAME_COUNT) > 0 else 0
+        self.stopped = threading.Event()
+        self.frames = 0
+
+    def run(self):
+        next_time = time.perf_counter()
+        while not self.stopped.is_set():
+            check, frame = self.video.read()
+            if not check:
+                break
+            self.display.put((self.frames, frame))
+            self.detection.put((self.frames, cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)))
+            self.frames += 1
+            if self.period:
+                next_time += self.period
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+        self.display.close()
+        self.detection.close()
+
+
+class DetectionWorker(threading.Thread):
+    """Eng yangi kadrda yuz va tabassumlarni topadi; natija - results (kadr raqami, yuzlar).
+
+    detector - detect yoki FaceTracker.update.
+    """
+
+    def __init__(self, frames, detector=detect):
+        super().__init__(daemon=True)
+        self.frames = frames
+        self.detector = detector
+        self.lock = threading.Lock()
+        self.results = (-1, [])
+        self.count = 0
+
+    def run(self):
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            index, gray = item
+            faces = self.detector(gray)
+            with self.lock:
+                self.results = (index, faces)
+            self.count += 1
+
+    def latest(self):
+        with self.lock:
+            return self.results
+
+
+def run_pipeline(source=0, show=True, realtime=True, detector=detect):
+    """Uch oqim: o'qish, aniqlash va chizish bir-birini kutmaydi.
+
+    Chizish sikli har doim eng yangi kadrni va oxirgi tayyor aniqlash natijasini
+    oladi, shuning uchun ekran FPS i kamera FPS iga teng - aniqlash sekinroq bo'lsa ham.
+    """
+    video = open_source(source)
+    display_frames = LatestQueue(1)
+    detect_frames = LatestQueue(1)
+    capture = CaptureThread(video, display_frames, detect_frames, realtime)
+    worker = DetectionWorker(detect_frames, detector)
+    capture.start()
+    worker.start()
+
+    shown = 0
+    start = time.perf_counter()
+    while True:
+        item = display_frames.get(timeout=1.0)
+        if item is None:
+            if display_frames.closed:
+                break
+            continue
+        _, frame = item
+        draw(frame, worker.latest()[1], pause=False)
+        shown += 1
+        if show:
+            cv2.imshow("Smile Meter", frame)
+            if cv2.waitKey(1) == ord('q'):
+                break
+
+    capture.stopped.set()
+    capture.join()
+    worker.join()
+    video.release()
+    if show:
+        cv2.destroyAllWindows()
+    elapsed = time.perf_counter() - start
+    print(f"o'qildi {capture.frames}, ko'rsatildi {shown} ({shown / elapsed:.1f} FPS), "
+          f"aniqlandi {worker.count} ({worker.count / elapsed:.1f} FPS), "
+          f"tashlandi: ekran {display_frames.dropped}, aniqlash {detect_frames.dropped}")
+
+
+def run_serial(source=0, show=True, detector=detect):
+    """Eski ketma-ket sikl: o'qish, aniqlash va chizish bitta oqimda"""
+    video = open_source(source)
+    while True:
+        check, frame = video.read()
+        if not check:
+            break
+        draw(frame, detector(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)))
+        if show:
+            cv2.imshow("Smile Meter", frame)
+            if cv2.waitKey(1) == ord('q'):
+                break
+
+    video.release()
+    if show:
+        cv2.destroyAllWindows()
+
+
+def iou(a, b):
+    x, y = max(a[0], b[0]), max(a[1], b[1])
+    w = min(a[0] + a[2], b[0] + b[2]) - x
+    h = min(a[1] + a[3], b[1] + b[3]) - y
+    if w <= 0 or h <= 0:
+        return 0.0
+    return w * h / (a[2] * a[3] + b[2] * b[3] - w * h)
+
+
+def benchmark(clips, scales=(1.0, 0.75, 0.5, 0.33), refine=True):
+    """Yozilgan videolarda masshtab bo'yicha FPS va recall.
+
+    Belgilangan yuzlar yo'q, shuning uchun recall to'liq o'lchamdagi aniqlashga nisbatan:
+    uning har bir yuzi kichik masshtabda IoU >= 0.5 bilan topildimi.
+    """
+    for clip in clips:
+        video = open_source(clip)
+        grays = []
+        while True:
+            check, frame = video.read()
+            if not check:
+                break
+            grays.append(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        video.release()
+
+        reference = [detect_faces(gray) for gray in grays]
+        total = sum(len(faces) for faces in reference)
+        print(f"{clip}: {len(grays)} kadr, to'liq o'lchamda {total} yuz")
+        for scale in scales:
+            detector = ScaledDetector(scale, refine)
+            start = time.perf_counter()
+            results = [detector(gray) for gray in grays]
+            fps = len(grays) / (time.perf_counter() - start)
+            found = sum(any(iou(ref, box) >= 0.5 for box, _ in result)
+                        for faces, result in zip(reference, results) for ref in faces)
+            recall = f"{found / total:.1%}" if total else "-"
+            print(f"  scale {scale:.2f}: {fps:7.1f} FPS, recall {recall}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Smile Meter")
+    parser.add_argument("source", nargs="?", default="0", help="kamera raqami yoki video fayl")
+    parser.add_argument("--serial", action="store_true", help="oqimlarsiz eski sikl")
+    parser.add_argument("--no-window", action="store_true", help="oynasiz (o'lchash uchun)")
+    parser.add_argument("--fast", action="store_true", help="video faylni FPS ini kutmasdan o'qish")
+    parser.add_argument("--track", type=int, metavar="N",
+                        help="to'liq aniqlash taxminan har N kadrda, oraliqda kuzatish")
+    parser.add_argument("--scale", type=float, default=1.0, help="yuz qidiriladigan kadr o'lchami ulushi")
+    parser.add_argument("--no-refine", action="store_true", help="tabassumni ham kichik kadrda qidirish")
+    parser.add_argument("--benchmark", nargs="+", metavar="CLIP", help="videolarda FPS va recall")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0, 0.75, 0.5, 0.33])
+    args = parser.parse_args(sys.argv[1:])
+    if args.benchmark:
+        benchmark(args.benchmark, args.scales, refine=not args.no_refine)
+        sys.exit()
+
+    scaled = ScaledDetector(args.scale, refine=not args.no_refine)
+    tracker = FaceTracker(args.track, find_faces=scaled.faces) if args.track else None
+    detector = tracker.update if tracker else scaled
+    start = time.perf_counter()
+    if args.serial:
+        run_serial(args.source, show=not args.no_window, detector=detector)
+        if args.no_window:
+            print(f"ketma-ket: {time.perf_counter() - start:.2f} s")
+    else:
+        run_pipeline(args.source, show=not args.no_window, realtime=not args.fast, detector=detector)
+    if tracker:
+        print(f"to'liq aniqlash {tracker.detections}, kuzatish {tracker.tracked}, oxirgi N {tracker.interval}")
@@ -0,0 +1,248 @@
+import sys
+import time
+import heapq
+import random
+from array import array
+from collections import OrderedDict
+
+from katak_turlari import NARXLAR
+from tez_yo_l import YolTopuvchi, o_tish_xaritasi
+
+# Katakka kirish narxi; 0 - o'tib bo'lmaydi (katak_turlari.BOSA_OLADI bilan bir xil)
+NARX_JADVALI = bytes(NARXLAR.get(t, 0) for t in range(256))
+CHEKSIZ = 2 ** 31 - 1
+MAKS_XARITALAR = 16  # keshdagi masofa xaritalari soni
+
+
+class MasofaXaritasi:
+    """Bitta manzil uchun to'liq Dijkstra masofa xaritasi.
+
+    masofa[i] - i katakdan manzilgacha eng arzon yo'l narxi. Istalgan boshlang'ich katak
+    uchun yo'l qidiruvsiz, masofa kamayadigan qo'shni bo'yicha yurib (gradient) olinadi.
+    """
+
+    def __init__(self, narx, qator, oxiri):
+        self.narx = narx
+        self.qator = qator
+        self.oxiri = oxiri
+        self.masofa = array('i', [CHEKSIZ]) * len(narx)
+        self._hisoblash()
+
+    def _hisoblash(self):
+        if not self.narx[self.oxiri]:
+            return  # manzil to'siq ustida
+        self.masofa[self.oxiri] = 0
+        self._tarqatish([(0, self.oxiri)])
+
+    def _tarqatish(self, navbat):
+        """Dijkstra navbatdagi kataklardan: masofa faqat kamayadi"""
+        narx = self.narx
+        masofa = self.masofa
+        # Manzildan teskari yo'nalishda: u -> v qadam narxi narx[v]
+        qadamlar = (1, -1, self.qator, -self.qator)
+        heapq.heapify(navbat)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        while navbat:
+            d, v = heappop(navbat)
+            if d > masofa[v]:
+                continue
+            yangi = d + narx[v]
+            for qadam in qadamlar:
+                u = v + qadam
+                if narx[u] and yangi < masofa[u]:
+                    masofa[u] = yangi
+                    heappush(navbat, (yangi, u))
+
+    def yangilash(self, i, eski_narx):
+        """i katak narxi eski_narx dan narx[i] ga o'zgardi: faqat ta'sirlangan kataklar qayta hisoblanadi.
+
+        Narx oshsa (yoki katak to'siq bo'lsa), eng arzon yo'li shu katak orqali o'tgan
+        kataklar (masofasi "tig'iz" qo'shnilar zanjiri) tozalanib, chegaradan qayta
+        to'ldiriladi. Narx kamaysa, o'zgarish shu katakdan Dijkstra bilan tarqaladi.
+        """
+        narx = self.narx
+        masofa = self.masofa
+        yangi_narx = narx[i]
+        qadamlar = (1, -1, self.qator, -self.qator)
+        if yangi_narx == eski_narx:
+            return
+
+        if eski_narx and (not yangi_narx or yangi_narx > eski_narx) and masofa[i] != CHEKSIZ:
+            # masofasi i orqali hisoblangan kataklar (eski narx va masofalar bo'yicha)
+            ta_sirlangan = {i} if not yangi_narx else set()
+            stek = [u for u in (i + q for q in qadamlar)
+                    if narx[u] and masofa[u] == eski_narx + masofa[i]]
+            ta_sirlangan.update(stek)
+            while stek:
+                p = stek.pop()
+                kerak = narx[p] + masofa[p]
+                for qadam in qadamlar:
+                    u = p + qadam
+                    if u not in ta_sirlangan and narx[u] and masofa[u] == kerak:
+                        ta_sirlangan.add(u)
+                        stek.append(u)
+            for u in ta_sirlangan:
+                masofa[u] = CHEKSIZ
+            # Chegara: ta'sirlanmagan qo'shnilardan eng yaxshi qiymat
+            navbat = []
+            for u in ta_sirlangan:
+                if not narx[u]:
+                    continue
+                eng = CHEKSIZ
+                for qadam in qadamlar:
+                    v = u + qadam
+                    if narx[v] and masofa[v] != CHEKSIZ and narx[v] + masofa[v] < eng:
+                        eng = narx[v] + masofa[v]
+                if eng != CHEKSIZ:
+                    masofa[u] = eng
+                    navbat.append((eng, u))
+            self._tarqatish(navbat)
+
+        elif yangi_narx and (not eski_narx or yangi_narx < eski_narx):
+            if not eski_narx:
+                # To'siq ochildi: masofasi qo'shnilardan
+                if i == self.oxiri:
+                    masofa[i] = 0
+                for qadam in qadamlar:
+                    v = i + qadam
+                    if narx[v] and masofa[v] != CHEKSIZ and narx[v] + masofa[v] < masofa[i]:
+                        masofa[i] = narx[v] + masofa[v]
+            if masofa[i] != CHEKSIZ:
+                self._tarqatish([(masofa[i], i)])
+
+    def yo_l(self, boshi):
+        """boshi dan manzilgacha tekis indekslar ro'yxati yoki [] (yetib bo'lmasa)"""
+        masofa = self.masofa
+        if masofa[boshi] == CHEKSIZ:
+            return []
+        narx = self.narx
+        qadamlar = (1, -1, self.qator, -self.qator)
+        yo_l = [boshi]
+        joriy = boshi
+        while joriy != self.oxiri:
+            # masofa[joriy] = narx[v] + masofa[v] bo'lgan qo'shni - eng arzon yo'l davomi
+            kerak = masofa[joriy]
+            for qadam in qadamlar:
+                v = joriy + qadam
+                if narx[v] and narx[v] + masofa[v] == kerak:
+                    break
+            joriy = v
+            yo_l.append(joriy)
+        return yo_l
+
+
+class MasofaKeshi:
+    """Manzil -> MasofaXaritasi keshi, narxlar xaritasi bilan birga.
+
+    Bir manzilga boradigan barcha avatarlar bitta xaritadan foydalanadi. Relyef
+    o'zgarganda keshdagi xaritalar joyida, faqat ta'sirlangan kataklar bo'yicha yangilanadi.
+    """
+
+    def __init__(self, xarita, maks_xaritalar=MAKS_XARITALAR):
+        self.kenglik = len(xarita[0])
+        self.balandlik = len(xarita)
+        self.qator = self.kenglik + 2
+        self.narx = o_tish_xaritasi(xarita, NARX_JADVALI)
+        self.maks_xaritalar = maks_xaritalar
+        self.xaritalar = OrderedDict()
+
+    def indeks(self, x, y):
+        return (y + 1) * self.qator + x + 1
+
+    def katak(self, indeks):
+        y, x = divmod(indeks, self.qator)
+        return x - 1, y - 1
+
+    def ol(self, manzil):
+        xarita = self.xaritalar.get(manzil)
+        if xarita is None:
+            xarita = self.xaritalar[manzil] = MasofaXaritasi(self.narx, self.qator, self.indeks(*manzil))
+            if len(self.xaritalar) > self.maks_xaritalar:
+                self.xaritalar.popitem(last=False)
+        else:
+            self.xaritalar.move_to_end(manzil)
+        return xarita
+
+    def masofa(self, boshlang_i, manzil):
+        """Yo'l narxi yoki None (yetib bo'lmasa)"""
+        d = self.ol(manzil).masofa[self.indeks(*boshlang_i)]
+        return None if d == CHEKSIZ else d
+
+    def yo_l(self, boshlang_i, manzil):
+        """[(x, y), ...] yoki [] - YolTopuvchi.top bilan bir xil ko'rinishda"""
+        return [self.katak(i) for i in self.ol(manzil).yo_l(self.indeks(*boshlang_i))]
+
+    def yangilash(self, x, y, katak_turi):
+        """Katak turi o'zgardi: keshdagi xaritalar qayta hisoblanmaydi, tuzatiladi"""
+        i = self.indeks(x, y)
+        eski_narx = self.narx[i]
+        if eski_narx != NARX_JADVALI[katak_turi]:
+            self.narx[i] = NARX_JADVALI[katak_turi]
+            for xarita in self.xaritalar.values():
+                xarita.yangilash(i, eski_narx)
+
+
+def ko_l_tekshiruvi():
+    """Ko'l bilan ikkiga bo'lingan xarita: barcha yo'l topuvchilar ko'ldan kechib o'tadi"""
+    from game import yo_l_top
+    from katak_turlari import TUPROQ, KOL, TOSH
+    from yetib_borish import BogliqlikIndeksi
+    from hamkor_yo_l import HamkorRejalashtiruvchi
+
+    # 3-ustun - yagona o'tish joyi ko'l, qolgani tosh devor
+    xarita = [[TUPROQ] * 7 for _ in range(5)]
+    for y in range(5):
+        xarita[y][3] = KOL if y == 2 else TOSH
+    a, b = (0, 0), (6, 4)
+
+    yo_l = MasofaKeshi(xarita).yo_l(a, b)
+    assert (3, 2) in yo_l, yo_l
+    topuvchi = YolTopuvchi(xarita)
+    assert len(topuvchi.top(a, b)) == len(yo_l_top(xarita, a, b)) == len(yo_l)
+    assert BogliqlikIndeksi(topuvchi).bog_liqmi(a, b)
+    hamkorlar = HamkorRejalashtiruvchi(xarita)
+    agent = hamkorlar.qo_shish(a, b)
+    for _ in range(30):
+        hamkorlar.qadam()
+    assert agent.yetdi
+    print("ko'l orqali yagona yo'l: barcha yo'l topuvchilar topdi")
+
+
+def benchmark(razmer=300, avatarlar=1000, urug=0):
+    from xarita_generator import xarita_yaratish_np
+
+    ko_l_tekshiruvi()
+
+    xarita = xarita_yaratish_np(razmer, razmer, urug=urug)
+    manzil = (razmer - 3, razmer - 3)
+    kesh = MasofaKeshi(xarita)
+
+    start = time.perf_counter()
+    kesh.ol(manzil)
+    print(f"{razmer}x{razmer}: Dijkstra xaritasi {time.perf_counter() - start:.3f} s")
+
+    rng = random.Random(urug)
+    boshlar = []
+    while len(boshlar) < avatarlar:
+        a = (rng.randrange(razmer), rng.randrange(razmer))
+        if kesh.masofa(a, manzil) is not None:
+            boshlar.append(a)
+
+    start = time.perf_counter()
+    uzunlik = sum(len(kesh.yo_l(a, manzil)) for a in boshlar)
+    vaqt = time.perf_counter() - start
+    print(f"{avatarlar} avatar (gradient): {vaqt:.3f} s, "
+          f"{vaqt / avatarlar * 1000:.2f} ms/so'rov, o'rtacha {uzunlik / avatarlar:.0f} katak")
+
+    topuvchi = YolTopuvchi(xarita)
+    n = min(avatarlar, 20)
+    start = time.perf_counter()
+    for a in boshlar[:n]:
+        topuvchi.top(a, manzil)
+    vaqt = time.perf_counter() - start
+    print(f"{n} avatar (A*, narxsiz): {vaqt:.3f} s, {vaqt / n * 1000:.2f} ms/so'rov")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
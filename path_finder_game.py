@@ -1,15 +1,21 @@
 import pygame
 import math
 import random
+import os
+import sys
 from enum import Enum
 from dataclasses import dataclass
 
+from space_warrior_snapshot import RewindBuffer, save, load
+
 pygame.init()
 
 # Screen settings
 SCREEN_WIDTH = 1400
 SCREEN_HEIGHT = 900
 FPS = 60
+REWIND_SECONDS = 5
+SAVE_FILE = "space_warrior.sav"
 
 # Colors
 BLACK = (0, 0, 0)
@@ -36,6 +42,29 @@ class GameState(Enum):
     LEVEL_COMPLETE = 5
 
 
+@dataclass
+class WaveConfig:
+    """Davra parametrlari: dushmanlar soni, chiqish tezligi, bosslar ulushi va o'q otish"""
+    base_enemies: int = 5
+    enemies_per_wave: int = 2
+    spawn_interval: int = 40  # necha tickda bir marta dushman chiqadi
+    spawn_batch: int = 1  # bir chiqishda nechta dushman
+    boss_ratio: float = 0.15
+    enemy_shoot_cooldown: int = 0  # 0 - dushmanlar o'q otmaydi
+    enemy_projectile_damage: int = 0  # dushman o'qi tekkanda o'yinchiga zarar; 0 - o'tib ketadi
+    player_shoot_cooldown: int = 10
+
+    def wave_size(self, wave):
+        return self.base_enemies + wave * self.enemies_per_wave
+
+
+# Stress rejimi - o'n minglab obyektlar bilan dvigatelni sinash uchun. Faqat shu rejimda
+# dushmanlar o'q otadi va o'qlar o'yinchiga tegishi tekshiriladi (oddiy o'yin qoidasi o'zgarmaydi)
+STRESS_WAVE = WaveConfig(base_enemies=10000, enemies_per_wave=5000, spawn_interval=1,
+                         spawn_batch=500, boss_ratio=0.15, enemy_shoot_cooldown=60,
+                         enemy_projectile_damage=10, player_shoot_cooldown=2)
+
+
 @dataclass
 class Vector:
     x: float
@@ -382,7 +411,8 @@ class PowerUp:
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, wave_config=None, rewind=True):
+        self.wave_config = wave_config or WaveConfig()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("⭐ SPACE WARRIOR ⭐ | Epic Space Battle")
         self.clock = pygame.time.Clock()
@@ -398,10 +428,13 @@ class Game:
                            random.uniform(0, SCREEN_HEIGHT),
                            random.uniform(0, 200)) for _ in range(100)]
 
+        # rewind=False (stress rejimi, benchmark) - har tik snapshot olinmaydi
+        self.rewind_buffer = RewindBuffer(REWIND_SECONDS, FPS) if rewind else None
         self.reset_game()
 
     def reset_game(self):
         self.player = Player(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.player.shoot_cooldown = self.wave_config.player_shoot_cooldown
         self.enemies = []
         self.projectiles = []
         self.explosions = []
@@ -410,7 +443,9 @@ class Game:
         self.enemy_spawn_timer = 0
         self.current_wave = 1
         self.wave_enemy_count = 0
-        self.max_enemies_in_wave = 5 + self.current_wave * 2
+        self.max_enemies_in_wave = self.wave_config.wave_size(self.current_wave)
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.clear()
         self.spawn_next_wave()
 
     def spawn_next_wave(self):
@@ -423,7 +458,7 @@ class Game:
             self.player.health = self.player.max_health
             self.player.shield = self.player.max_shield
 
-        self.max_enemies_in_wave = 5 + self.current_wave * 2
+        self.max_enemies_in_wave = self.wave_config.wave_size(self.current_wave)
         self.wave_enemy_count = 0
 
     def spawn_enemy(self):
@@ -442,8 +477,10 @@ class Game:
             x = SCREEN_WIDTH + 30
             y = random.uniform(0, SCREEN_HEIGHT)
 
-        enemy_type = "basic" if random.random() > 0.15 else "boss"
+        enemy_type = "basic" if random.random() >= self.wave_config.boss_ratio else "boss"
         enemy = Enemy(x, y, enemy_type)
+        if self.wave_config.enemy_shoot_cooldown:
+            enemy.shoot_cooldown = self.wave_config.enemy_shoot_cooldown
         self.enemies.append(enemy)
         self.wave_enemy_count += 1
 
@@ -466,6 +503,19 @@ class Game:
                         self.reset_game()
                         self.state = GameState.PLAYING
 
+                # Orqaga qaytarish - 1 soniya oldingi holat
+                if (event.key == pygame.K_BACKSPACE and self.rewind_buffer is not None
+                        and self.state in (GameState.PLAYING, GameState.GAME_OVER)):
+                    if self.rewind_buffer.rewind(self, 1.0):
+                        self.state = GameState.PLAYING
+
+                if event.key == pygame.K_F5 and self.state == GameState.PLAYING:
+                    save(self, SAVE_FILE)
+                if event.key == pygame.K_F9 and os.path.exists(SAVE_FILE):
+                    load(self, SAVE_FILE)
+                    if self.rewind_buffer is not None:
+                        self.rewind_buffer.clear()
+
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if self.state == GameState.MENU:
                     self.state = GameState.PLAYING
@@ -481,6 +531,9 @@ class Game:
         if self.state != GameState.PLAYING:
             return
 
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.record(self)
+
         for star in self.stars:
             star.update(0.5)
 
@@ -493,14 +546,21 @@ class Game:
             self.projectiles.extend(projectiles)
 
         self.enemy_spawn_timer += 1
-        if self.enemy_spawn_timer > 40 and self.wave_enemy_count < self.max_enemies_in_wave:
-            self.spawn_enemy()
+        if (self.enemy_spawn_timer > self.wave_config.spawn_interval and
+                self.wave_enemy_count < self.max_enemies_in_wave):
+            for _ in range(min(self.wave_config.spawn_batch,
+                               self.max_enemies_in_wave - self.wave_enemy_count)):
+                self.spawn_enemy()
             self.enemy_spawn_timer = 0
 
         for enemy in self.enemies[:]:
             enemy.update(self.player.pos)
 
-            # Dushmanlar o'q otmaydi - faqat to'qnashish bilan zarar beradi
+            # Odatda dushmanlar o'q otmaydi - faqat to'qnashish bilan zarar beradi
+            if self.wave_config.enemy_shoot_cooldown:
+                projectile = enemy.shoot()
+                if projectile:
+                    self.projectiles.append(projectile)
 
             distance = self.player.pos.distance_to(enemy.pos)
             if distance < self.player.radius + enemy.radius:
@@ -531,6 +591,11 @@ class Game:
                                 self.powerups.append(PowerUp(enemy.pos.x, enemy.pos.y, power_type))
                         break
 
+            elif (self.wave_config.enemy_projectile_damage and
+                  self.player.pos.distance_to(projectile.pos) < self.player.radius + projectile.radius):
+                self.projectiles.remove(projectile)
+                self.player.take_damage(self.wave_config.enemy_projectile_damage)
+
         for powerup in self.powerups[:]:
             powerup.update()
 
@@ -575,6 +640,7 @@ class Game:
             "SICHQONCHA - Nishonga olish",
             "CTRL yoki SPACE - O'q otish",
             "ESC - Pauza",
+            "BACKSPACE - 1 soniya orqaga, F5/F9 - Saqlash/Yuklash",
             "",
             "DUSHMAN NAVLARI:",
             "🔴 Asosiy dushmanlar",
@@ -707,5 +773,7 @@ class Game:
 
 
 if __name__ == "__main__":
-    game = Game()
+    stress = "--stress" in sys.argv
+    # Stress rejimida rewind faqat --rewind bilan (20k obyektda har tik ~1 MB snapshot)
+    game = Game(STRESS_WAVE if stress else None, rewind=not stress or "--rewind" in sys.argv)
     game.run()
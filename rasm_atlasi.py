@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import time
+import hashlib
+
+import pygame
+
+KESH_KATALOGI = ".kesh"  # rasmlar katalogi ichida
+USTUNLAR = 8  # atlasdagi bir qatordagi rasmlar soni
+
+
+def _kalit(rasm_dir, rasm_nomlari, hajm):
+    """Manba fayllar mazmuni, nomlari va o'lcham bo'yicha kesh kaliti"""
+    h = hashlib.sha1(f"{hajm}".encode())
+    for adi, fayl in sorted(rasm_nomlari.items()):
+        h.update(f"{adi}:{fayl}:".encode())
+        path = os.path.join(rasm_dir, fayl)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _atlas_yasash(rasm_dir, rasm_nomlari, hajm):
+    """Rasmlarni hajm x hajm o'lchamga keltirib bitta sirtga joylaydi.
+
+    (atlas, joylashuv) qaytaradi; joylashuv: nom -> [x, y, shaffofmi].
+    """
+    rasmlar = {}
+    for adi, fayl in rasm_nomlari.items():
+        path = os.path.join(rasm_dir, fayl)
+        try:
+            rasm = pygame.image.load(path)
+            rasmlar[adi] = (pygame.transform.scale(rasm, (hajm, hajm)), bool(rasm.get_flags() & pygame.SRCALPHA))
+        except Exception as e:
+            print(f"❌ {adi}: {fayl} yuklash xatosi - {e}")
+
+    ustunlar = min(USTUNLAR, max(1, len(rasmlar)))
+    qatorlar = -(-len(rasmlar) // ustunlar)
+    atlas = pygame.Surface((ustunlar * hajm, max(1, qatorlar) * hajm), pygame.SRCALPHA, 32)
+    joylashuv = {}
+    for n, (adi, (rasm, shaffof)) in enumerate(sorted(rasmlar.items())):
+        x, y = (n % ustunlar) * hajm, (n // ustunlar) * hajm
+        atlas.blit(rasm, (x, y))
+        joylashuv[adi] = [x, y, shaffof]
+    return atlas, joylashuv
+
+
+def _eskilarini_o_chirish(kesh_dir, kalit):
+    """Manbalar o'zgargandan keyin qolib ketgan boshqa atlas fayllarini o'chiradi"""
+    for nom in os.listdir(kesh_dir):
+        if nom.startswith("atlas_") and not nom.startswith(f"atlas_{kalit}."):
+            try:
+                os.remove(os.path.join(kesh_dir, nom))
+            except OSError:
+                pass
+
+
+def atlas_yuklash(rasm_dir, rasm_nomlari, hajm):
+    """{nom: sirt} - bitta atlasning ekran formatidagi subsurface lari.
+
+    Tayyor atlas rasm_dir/.kesh ichida manba fayllar xeshi va hajm bo'yicha saqlanadi:
+    keyingi ishga tushirishda rasmlar qayta o'qilmaydi va masshtablanmaydi. Shaffof
+    rasmlar convert_alpha(), qolganlari convert() qilingan atlas nusxasidan olinadi.
+    """
+    kesh_dir = os.path.join(rasm_dir, KESH_KATALOGI)
+    kalit = _kalit(rasm_dir, rasm_nomlari, hajm)
+    atlas_fayl = os.path.join(kesh_dir, f"atlas_{kalit}.png")
+    joy_fayl = os.path.join(kesh_dir, f"atlas_{kalit}.json")
+
+    try:
+        atlas = pygame.image.load(atlas_fayl)
+        with open(joy_fayl) as f:
+            joylashuv = json.load(f)
+    except (OSError, ValueError, pygame.error):
+        atlas, joylashuv = _atlas_yasash(rasm_dir, rasm_nomlari, hajm)
+        try:
+            os.makedirs(kesh_dir, exist_ok=True)
+            pygame.image.save(atlas, atlas_fayl)
+            with open(joy_fayl, "w") as f:
+                json.dump(joylashuv, f)
+            _eskilarini_o_chirish(kesh_dir, kalit)
+        except (OSError, pygame.error) as e:
+            print(f"⚠️ atlas keshini yozib bo'lmadi - {e}")
+
+    # Ekran o'rnatilgan bo'lsa, piksel formati bir marta shu yerda o'zgartiriladi
+    if pygame.display.get_surface() is not None:
+        shaffof_atlas = atlas.convert_alpha()
+        oddiy_atlas = atlas.convert()
+    else:
+        shaffof_atlas = oddiy_atlas = atlas
+
+    return {adi: (shaffof_atlas if shaffof else oddiy_atlas).subsurface((x, y, hajm, hajm))
+            for adi, (x, y, shaffof) in joylashuv.items()}
+
+
+if __name__ == "__main__":
+    # Eski (har rasm alohida, convert siz) va atlas yuklash hamda blit tezligini solishtirish
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    ekran = pygame.display.set_mode((1200, 700))
+    from game import RASM_FAYLLARI, KATAK_HAJMI
+
+    rasm_dir = sys.argv[1] if len(sys.argv) > 1 else "rasmlar"
+    nomlar = RASM_FAYLLARI
+
+    start = time.perf_counter()
+    eski = {adi: pygame.transform.scale(pygame.image.load(os.path.join(rasm_dir, fayl)), (KATAK_HAJMI, KATAK_HAJMI))
+            for adi, fayl in nomlar.items()}
+    print(f"alohida yuklash: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    atlas_yuklash(rasm_dir, nomlar, KATAK_HAJMI)  # kesh tayyor bo'lsin
+    start = time.perf_counter()
+    yangi = atlas_yuklash(rasm_dir, nomlar, KATAK_HAJMI)
+    print(f"atlas (keshdan): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for nom, rasmlar in (("alohida", eski), ("atlas", yangi)):
+        start = time.perf_counter()
+        for i in range(20000):
+            for rasm in rasmlar.values():
+                ekran.blit(rasm, ((i * 50) % 1150, (i * 7) % 650))
+        print(f"{nom}: {20000 * len(rasmlar) / (time.perf_counter() - start):,.0f} blit/s")
@@ -1,7 +1,11 @@
+import sys
 import pygame
 import time
 import random
 
+from snake_body import SnakeBody, FreeCells
+from snake_autopilot import Autopilot
+
 # O'yin oynasi o'lchamlari
 width = 600
 height = 400
@@ -13,17 +17,24 @@ green = (0, 255, 0)
 blue = (50, 153, 213)
 white = (255, 255, 255)
 
-# Pygame-ni ishga tushirish
-pygame.init()
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Ilon O'yini - Python")
-
 clock = pygame.time.Clock()
 snake_block = 10
 snake_speed = 15
 
-font_style = pygame.font.SysFont("bahnschrift", 25)
-score_font = pygame.font.SysFont("comicsansms", 20)
+# Oyna va shriftlar o'yin boshlanganda yaratiladi (soak oynasiz ishlaydi)
+screen = None
+font_style = None
+score_font = None
+
+
+def open_display():
+    """Pygame-ni ishga tushirish: oyna va shriftlar"""
+    global screen, font_style, score_font
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption("Ilon O'yini - Python")
+    font_style = pygame.font.SysFont("bahnschrift", 25)
+    score_font = pygame.font.SysFont("comicsansms", 20)
 
 
 def score(qiymat):
@@ -41,84 +52,227 @@ def message(msg, color):
     screen.blit(mesg, [width / 6, height / 3])
 
 
-def gameLoop():
-    game_over = False
-    game_close = False
+# O'yin holatlari
+PLAYING = "playing"
+GAME_OVER = "game_over"
+
+DIRECTIONS = {
+    pygame.K_LEFT: (-snake_block, 0),
+    pygame.K_RIGHT: (snake_block, 0),
+    pygame.K_UP: (0, -snake_block),
+    pygame.K_DOWN: (0, snake_block),
+}
+
+
+class GameState:
+    """Bitta o'yin holati. Qayta o'ynashda yangi obyekt yaratilmaydi - reset() joyida tozalaydi."""
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        # Tana: deque + band kataklar to'plami, yurish va urilish tekshiruvi O(1).
+        # Bo'sh kataklar tana bilan birga yangilanadi - ovqat faqat bo'sh joyga tushadi
+        self.free = FreeCells((x, y) for x in range(0, width, snake_block) for y in range(0, height, snake_block))
+        self.snake = SnakeBody((width / 2, height / 2), free=self.free)
+        self.reset()
+
+    def reset(self):
+        self.x1 = width / 2
+        self.y1 = height / 2
+        self.x1_change = 0
+        self.y1_change = 0
+        self.snake.reset((self.x1, self.y1))
+        self.foodx, self.foody = self.free.choice(self.rng)
+        self.freed = None  # oxirgi tikda bo'shagan dum katagi
+        self.state = PLAYING
+
+    def steer(self, key):
+        if key in DIRECTIONS:
+            self.x1_change, self.y1_change = DIRECTIONS[key]
+
+    def step(self):
+        """Bir tik: yurish, devor va o'ziga urilish, ovqat"""
+        if self.x1 >= width or self.x1 < 0 or self.y1 >= height or self.y1 < 0:
+            self.state = GAME_OVER
+        self.x1 += self.x1_change
+        self.y1 += self.y1_change
+        collided, self.freed = self.snake.advance((self.x1, self.y1))
+        if collided:
+            self.state = GAME_OVER
+
+        if self.x1 == self.foodx and self.y1 == self.foody:
+            self.snake.grow()
+            food = self.free.choice(self.rng)
+            if food is None:  # taxta to'ldi
+                self.state = GAME_OVER
+            else:
+                self.foodx, self.foody = food
+
+
+def draw(game):
+    screen.fill(black)
+    pygame.draw.rect(screen, red, [game.foodx, game.foody, snake_block, snake_block])
+    draw_snake(snake_block, game.snake)
+    score(game.snake.length - 1)
+    pygame.display.update()
 
-    x1 = width / 2
-    y1 = height / 2
 
-    x1_change = 0
-    y1_change = 0
+class DirtyRenderer:
+    """Tik sayin faqat o'zgargan joylarni chizadi va ekranga chiqaradi.
 
-    snake_List = []
-    Length_of_snake = 1
+    Yangi bosh, bo'shagan dum, ovqat (ko'chganda) va hisob (o'zgarganda) - bir tikdagi
+    ish ilon uzunligiga bog'liq emas. Birinchi kadr va o'yin tugaganidan keyin butun
+    ekran bir marta chiziladi.
+    """
 
-    foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
-    foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
+    def __init__(self):
+        self.full = True
+        self.food = None
+        self.score_value = None
+        self.score_rect = pygame.Rect(0, 0, 0, 0)
 
-    while not game_over:
+    def invalidate(self):
+        self.full = True
 
-        while game_close:
+    def _cell(self, x, y, color):
+        rect = pygame.Rect(x, y, snake_block, snake_block)
+        pygame.draw.rect(screen, color, rect)
+        return rect
+
+    def _score(self, game):
+        """Hisob maydonini tagidagi kataklar bilan birga qayta chizadi"""
+        value = score_font.render("Hisob: " + str(game.snake.length - 1), True, white)
+        area = self.score_rect.union(value.get_rect())
+        screen.fill(black, area)
+        for x in range(0, area.right, snake_block):
+            for y in range(0, area.bottom, snake_block):
+                if (x, y) in game.snake:
+                    self._cell(x, y, green)
+                elif (x, y) == (game.foodx, game.foody):
+                    self._cell(x, y, red)
+        screen.blit(value, [0, 0])
+        self.score_rect = value.get_rect()
+        self.score_value = game.snake.length
+        return area
+
+    def draw(self, game):
+        if self.full:
+            draw(game)
+            self.full = False
+            self.food = (game.foodx, game.foody)
+            self.score_value = game.snake.length
+            self.score_rect = pygame.Rect((0, 0), score_font.size("Hisob: " + str(game.snake.length - 1)))
+            return
+
+        rects = []
+        if game.freed is not None and game.freed not in game.snake:
+            rects.append(self._cell(*game.freed, black))
+        if (game.foodx, game.foody) != self.food:
+            self.food = (game.foodx, game.foody)
+            rects.append(self._cell(game.foodx, game.foody, red))
+        rects.append(self._cell(*game.snake.head, green))
+
+        if game.snake.length != self.score_value or self.score_rect.collidelist(rects) != -1:
+            rects.append(self._score(game))
+        pygame.display.update(rects)
+
+
+def gameLoop(autopilot=False):
+    """autopilot=True - ilonni Autopilot boshqaradi; A tugmasi yoqadi/o'chiradi.
+
+    O'yin o'rtasida avtopilot faqat tana Gamilton sikli tartibida yotgan bo'lsa yoqiladi
+    (masalan, hali bitta katakli ilon) - aks holda uning xavfsizlik kafolati ishlamaydi.
+    """
+    open_display()
+    game = GameState()
+    renderer = DirtyRenderer()
+    pilot = Autopilot(width // snake_block, height // snake_block, snake_block)
+    running = True
+
+    while running:
+        if game.state == GAME_OVER:
             screen.fill(blue)
             message("Yutqazdingiz! Q - chiqish, C - qayta o'ynash", red)
-            score(Length_of_snake - 1)
+            score(game.snake.length - 1)
             pygame.display.update()
 
             for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q:
-                        game_over = True
-                        game_close = False
+                        running = False
                     if event.key == pygame.K_c:
-                        gameLoop()
+                        game.reset()  # rekursiya yo'q - o'sha holat qayta ishlatiladi
+                        renderer.invalidate()
+                        pilot.reset()
+            clock.tick(snake_speed)
+            continue
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
-                game_over = True
+                running = False
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_LEFT:
-                    x1_change = -snake_block
-                    y1_change = 0
-                elif event.key == pygame.K_RIGHT:
-                    x1_change = snake_block
-                    y1_change = 0
-                elif event.key == pygame.K_UP:
-                    y1_change = -snake_block
-                    x1_change = 0
-                elif event.key == pygame.K_DOWN:
-                    y1_change = snake_block
-                    x1_change = 0
-
-        if x1 >= width or x1 < 0 or y1 >= height or y1 < 0:
-            game_close = True
-        x1 += x1_change
-        y1 += y1_change
-        screen.fill(black)
-        pygame.draw.rect(screen, red, [foodx, foody, snake_block, snake_block])
-        snake_Head = [x1, y1]
-        snake_List.append(snake_Head)
-        if len(snake_List) > Length_of_snake:
-            del snake_List[0]
-
-        for x in snake_List[:-1]:
-            if x == snake_Head:
-                game_close = True
-
-        draw_snake(snake_block, snake_List)
-        score(Length_of_snake - 1)
-
-        pygame.display.update()
-
-        if x1 == foodx and y1 == foody:
-            foodx = round(random.randrange(0, width - snake_block) / 10.0) * 10.0
-            foody = round(random.randrange(0, height - snake_block) / 10.0) * 10.0
-            Length_of_snake += 1
+                if event.key == pygame.K_a:
+                    if autopilot or pilot.can_take_over(game.snake):
+                        autopilot = not autopilot
+                        pilot.reset()
+                else:
+                    game.steer(event.key)
 
+        if autopilot:
+            step = pilot.decide(game.snake, (game.foodx, game.foody))
+            if step is not None:
+                game.x1_change, game.y1_change = step[0] * snake_block, step[1] * snake_block
+        game.step()
+        renderer.draw(game)
         clock.tick(snake_speed)
 
     pygame.quit()
     quit()
 
 
-gameLoop()
+SOAK_MAX_GROWTH = 64 * 1024  # qizib olishdan keyin ruxsat etilgan xotira o'sishi (bayt)
+SOAK_MAX_OBJECTS = 100  # ... va gc kuzatadigan obyektlar soni o'sishi
+
+
+def soak(restarts=5000, seed=0):
+    """Ko'p marta qayta boshlash: xotira va obyektlar soni o'smasligi kerak.
+
+    Birinchi yarmi qizib olish (eng uzun ilon uchun tuzilmalar kattalashadi), o'lchov
+    ikkinchi yarmida. Eski rekursiv qayta boshlash har safar kadr va ilon ro'yxatini
+    ushlab qolardi - bu o'sish chegaradan tez oshadi.
+    """
+    import gc
+    import tracemalloc
+
+    rng = random.Random(seed)
+    game = GameState(rng)
+    keys = list(DIRECTIONS)
+    tracemalloc.start()
+    baseline = objects = None
+    for i in range(restarts):
+        game.reset()
+        while game.state == PLAYING:
+            if rng.random() < 0.2:
+                game.steer(rng.choice(keys))
+            game.step()
+        if i == restarts // 2:
+            gc.collect()
+            baseline = tracemalloc.get_traced_memory()[0]
+            objects = len(gc.get_objects())
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    objects = len(gc.get_objects()) - objects
+    print(f"{restarts} qayta boshlash: xotira {baseline / 1024:.1f} KiB -> {current / 1024:.1f} KiB "
+          f"(eng ko'p {peak / 1024:.1f} KiB), obyektlar {objects:+d}")
+    assert current - baseline < SOAK_MAX_GROWTH, f"xotira {current - baseline} bayt o'sdi"
+    assert objects < SOAK_MAX_OBJECTS, f"{objects} ta obyekt qo'shildi"
+    return current - baseline
+
+
+if __name__ == "__main__":
+    if "--soak" in sys.argv:
+        soak(int(sys.argv[-1]) if sys.argv[-1].isdigit() else 5000)
+    else:
+        gameLoop(autopilot="--autopilot" in sys.argv)
@@ -0,0 +1,176 @@
+import sys
+import time
+import random
+import argparse
+from collections import deque
+
+from snake_body import SnakeBody, FreeCells
+
+STEPS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+def hamiltonian_cycle(cols, rows):
+    """Taxtani bir marta aylanib chiqadigan yopiq yo'l (kataklar ro'yxati).
+
+    Qatorlar 1..cols-1 ustunlarda ilonsimon o'tiladi, 0-ustun orqali boshiga qaytiladi;
+    buning uchun qatorlar soni juft bo'lishi kerak (toq bo'lsa taxta transpozitsiya qilinadi).
+    """
+    if rows % 2:
+        if cols % 2:
+            raise ValueError(f"{cols}x{rows}: ikkala tomon toq - Gamilton sikli yo'q")
+        return [(x, y) for y, x in hamiltonian_cycle(rows, cols)]
+    order = []
+    for y in range(rows):
+        xs = range(1, cols) if y % 2 == 0 else range(cols - 1, 0, -1)
+        order.extend((x, y) for x in xs)
+    order.extend((0, y) for y in range(rows - 1, -1, -1))
+    return order
+
+
+class Autopilot:
+    """Ilon avtopiloti: Gamilton sikli ustidagi BFS ovqat izlovchi.
+
+    Tana doim sikl tartibida yotadi (dumdan boshga sikl indeksi o'sib boradi), shuning
+    uchun boshdan sikl bo'ylab dumgacha bo'lgan kataklar bo'sh - ilon shu yo'l bilan
+    dumiga har doim yeta oladi. Ovqat sayin bir marta BFS faqat shu oraliqdagi, sikl
+    bo'yicha oldinga yuradigan qadamlar bilan ovqatga eng qisqa yo'l izlaydi. Yo'l
+    ovqatdan keyin dumga yetish uchun joy qoldirmasa yoki ilon taxtaning yarmidan uzun
+    bo'lsa, sikl bo'ylab keyingi katakka yuriladi - bu qaror O(1) va taxta to'lguncha xavfsiz.
+
+    Kataklar SnakeBody dagi ko'rinishda (cell_size ga ko'paytirilgan (x, y)) beriladi.
+    """
+
+    def __init__(self, cols, rows, cell_size=1):
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.size = cols * rows
+        self.order = hamiltonian_cycle(cols, rows)
+        self.index = {cell: i for i, cell in enumerate(self.order)}
+        self.neighbors = {cell: self._neighbors(cell) for cell in self.order}
+        self.reset()
+
+    def reset(self):
+        self.plan = deque()
+        self.plan_food = None
+
+    def _neighbors(self, g):
+        x, y = g
+        return tuple((x + dx, y + dy) for dx, dy in STEPS
+                     if 0 <= x + dx < self.cols and 0 <= y + dy < self.rows)
+
+    def _grid(self, cell):
+        return int(cell[0] // self.cell_size), int(cell[1] // self.cell_size)
+
+    def can_take_over(self, body):
+        """Tana sikl tartibida yotibdimi - o'yin o'rtasida faqat shunda boshqaruv olinadi.
+
+        Dumdan boshga qarab har bir bo'lakning dumdan sikl bo'yicha masofasi o'sishi kerak.
+        O(uzunlik), faqat avtopilot yoqilganda chaqiriladi.
+        """
+        cells = [self._grid(c) for c in body]
+        if any(c not in self.index for c in cells):
+            return False
+        tail = self.index[cells[0]]
+        rel = [(self.index[c] - tail) % self.size for c in cells]
+        return all(a < b for a, b in zip(rel, rel[1:]))
+
+    def decide(self, body, food):
+        """Keyingi qadam yo'nalishi (dx, dy) katak birligida; bosh taxtadan tashqarida bo'lsa None"""
+        head = self._grid(body.head)
+        if head not in self.index:
+            return None  # snace.py qoidasi: o'yin keyingi tikda tugaydi
+        food = self._grid(food)
+        if food != self.plan_food:
+            self.plan_food = food
+            self.plan = self._plan(body, head, food)
+        if self.plan:
+            step = self.plan.popleft()
+        else:
+            step = self.order[(self.index[head] + 1) % self.size]
+        return step[0] - head[0], step[1] - head[1]
+
+    def _plan(self, body, head, food):
+        """Sikl bo'yicha oldinga yuruvchi eng qisqa xavfsiz yo'l yoki bo'sh deque"""
+        size = self.size
+        if len(body) >= size // 2:
+            return deque()
+        index = self.index
+        h = index[head]
+        to_tail = (index[self._grid(body.tail)] - h) % size or size
+        to_food = (index[food] - h) % size
+        # Dumga yetish tekshiruvi: ovqatdan keyin (tana bitta o'sadi, kutilayotgan
+        # o'sish paytida dum joyida turadi) sikl bo'ylab yurish uchun joy qolishi kerak
+        room = to_tail - (body.length - len(body)) - 2
+        if to_food >= room:
+            return deque()
+
+        parent = {head: None}
+        queue = deque([(head, 0)])
+        while queue:
+            g, r = queue.popleft()
+            if g == food:
+                break
+            for n in self.neighbors[g]:
+                d = (index[n] - h) % size
+                if r < d <= to_food and n not in parent:
+                    parent[n] = g
+                    queue.append((n, d))
+
+        path = deque()
+        g = food
+        while g != head:
+            path.appendleft(g)
+            g = parent[g]
+        return path
+
+
+def play(pilot, cols, rows, rng, max_moves=None):
+    """Bitta oynasiz o'yin: (uzunlik, qadamlar, taxta to'ldimi)"""
+    free = FreeCells((x, y) for x in range(cols) for y in range(rows))
+    body = SnakeBody((cols // 2, rows // 2), free=free)
+    pilot.reset()
+    food = free.choice(rng)
+    moves = 0
+    max_moves = max_moves or cols * rows * cols * rows
+    while moves < max_moves:
+        dx, dy = pilot.decide(body, food)
+        head = (body.head[0] + dx, body.head[1] + dy)
+        moves += 1
+        if not (0 <= head[0] < cols and 0 <= head[1] < rows):
+            break
+        collided, _ = body.advance(head)
+        if collided:
+            break
+        if head == food:
+            body.grow()
+            food = free.choice(rng)
+            if food is None:
+                return len(body), moves, True
+    return len(body), moves, False
+
+
+def benchmark(games, cols, rows, seed=0):
+    rng = random.Random(seed)
+    pilot = Autopilot(cols, rows)
+    total_moves = 0
+    completed = 0
+    start = time.perf_counter()
+    for game in range(games):
+        t = time.perf_counter()
+        length, moves, full = play(pilot, cols, rows, rng)
+        total_moves += moves
+        completed += full
+        print(f"o'yin {game + 1}: uzunlik {length}/{cols * rows}, {moves} qadam, "
+              f"{'taxta to`ldi' if full else 'yutqazdi'}, {time.perf_counter() - t:.1f} s")
+    elapsed = time.perf_counter() - start
+    print(f"{cols}x{rows}: {total_moves / elapsed:,.0f} qaror/s, to'ldirildi {completed}/{games}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ilon avtopiloti: oynasiz benchmark")
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=40)
+    args = parser.parse_args(sys.argv[1:])
+    benchmark(args.games, args.cols, args.rows)
@@ -0,0 +1,160 @@
+import random
+from collections import deque
+
+
+class FreeCells:
+    """Bo'sh kataklar: indekslanadigan to'plam (ro'yxat + katak -> indeks lug'ati).
+
+    O'chirishda oxirgi element o'chirilgan joyga ko'chiriladi (swap-remove), shuning uchun
+    qo'shish, o'chirish va tasodifiy tanlash O(1) - taxta deyarli to'lganda ham.
+    """
+
+    def __init__(self, cells):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+        self.board = frozenset(self.cells)  # taxtadan tashqaridagi kataklar qo'shilmaydi
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell in self.board and cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def discard(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def choice(self, rng=random):
+        """Bir tekis tasodifiy bo'sh katak yoki None (taxta to'la)"""
+        if not self.cells:
+            return None
+        return self.cells[rng.randrange(len(self.cells))]
+
+
+class SnakeBody:
+    """Ilon tanasi: kataklar navbati (deque) va band kataklar to'plami (set).
+
+    Dum chapda, bosh o'ngda. Oldinga yurish, o'sish va o'ziga urilishni tekshirish
+    tana uzunligiga bog'liq emas - O(1). Kataklar istalgan hashlanadigan qiymat
+    (masalan, (x, y) tuple). free (FreeCells) berilsa, tana bilan birga yangilanadi.
+    """
+
+    def __init__(self, head, length=1, free=None):
+        self.cells = deque()
+        self.occupied = set()
+        self.free = free
+        self.reset(head, length)
+
+    def reset(self, head, length=1):
+        """Tanani joyida bitta katakka qaytaradi (yangi o'yin uchun)"""
+        if self.free is not None:
+            for cell in self.cells:
+                self.free.add(cell)
+        self.cells.clear()
+        self.occupied.clear()
+        self.cells.append(head)
+        self.occupied.add(head)
+        self.length = length  # kerakli uzunlik; tana yurganda shungacha o'sadi
+        if self.free is not None:
+            self.free.discard(head)
+
+    @property
+    def head(self):
+        return self.cells[-1]
+
+    @property
+    def tail(self):
+        return self.cells[0]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    def grow(self, amount=1):
+        self.length += amount
+
+    def will_collide(self, cell):
+        """Bosh cell ga yursa, tanaga uriladimi (shu qadamda bo'shaydigan dum hisobga olinadi)"""
+        if cell not in self.occupied:
+            return False
+        return cell != self.cells[0] or len(self.cells) < self.length
+
+    def advance(self, cell):
+        """Boshni cell ga suradi: (o'ziga urildimi, bo'shagan dum katagi yoki None)"""
+        freed = None
+        if len(self.cells) >= self.length:
+            freed = self.cells.popleft()
+            self.occupied.discard(freed)
+            if self.free is not None:
+                self.free.add(freed)
+        collided = cell in self.occupied
+        self.cells.append(cell)
+        self.occupied.add(cell)
+        if self.free is not None:
+            self.free.discard(cell)
+        return collided, freed
+
+
+if __name__ == "__main__":
+    # Eski ro'yxatli tana va SnakeBody: uzun ilonda bir qadam narxi
+    import time
+
+    for length in (100, 1000, 10000):
+        steps = 2000
+        snake_list = [[x, 0] for x in range(length)]
+        start = time.perf_counter()
+        for x in range(length, length + steps):
+            head = [x, 0]
+            snake_list.append(head)
+            del snake_list[0]
+            for cell in snake_list[:-1]:
+                if cell == head:
+                    break
+        old = (time.perf_counter() - start) / steps
+
+        body = SnakeBody((0, 0), length)
+        for x in range(1, length):
+            body.advance((x, 0))
+        start = time.perf_counter()
+        for x in range(length, length + steps):
+            body.advance((x, 0))
+        new = (time.perf_counter() - start) / steps
+        print(f"{length:6d} bo'lak: ro'yxat {old * 1e6:8.1f} us/qadam | SnakeBody {new * 1e6:5.2f} us/qadam")
+
+    # Ovqat joylash: "bo'sh joy chiqquncha qayta urinish" va FreeCells, taxta 60x40
+    board = [(x, y) for x in range(60) for y in range(40)]
+    rng = random.Random(0)
+    for fill in (0.5, 0.9, 0.99):
+        free = FreeCells(board)
+        occupied = set(rng.sample(board, int(len(board) * fill)))
+        for cell in occupied:
+            free.discard(cell)
+
+        start = time.perf_counter()
+        for _ in range(2000):
+            while True:
+                cell = (rng.randrange(60), rng.randrange(40))
+                if cell not in occupied:
+                    break
+        old = (time.perf_counter() - start) / 2000
+
+        start = time.perf_counter()
+        for _ in range(2000):
+            free.choice(rng)
+        new = (time.perf_counter() - start) / 2000
+        print(f"{fill:.0%} to'la: qayta urinish {old * 1e6:7.1f} us | FreeCells {new * 1e6:5.2f} us")
@@ -0,0 +1,168 @@
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# snace.py dagi taxta: 600x400 piksel, katak 10 piksel
+WIDTH = 60
+HEIGHT = 40
+
+# Harakatlar: 0 - yo'nalish o'zgarmaydi, 1..4 - chap, o'ng, yuqori, past (snace.py tugmalari)
+NUM_ACTIONS = 5
+DIRECTIONS = np.array([[0, 0], [-1, 0], [1, 0], [0, -1], [0, 1]], dtype=np.int64)
+
+REWARD_FOOD = 1.0
+REWARD_DEATH = -1.0
+EMPTY = -(2 ** 62)  # hech qachon tana bo'lmagan katak belgisi
+
+
+class VecSnake:
+    """snace.py qoidalarining pygame siz, N ta taxtani birdaniga yurituvchi versiyasi.
+
+    Har bir katakda bosh unga kirgan tik raqami (stamp) saqlanadi: oxirgi `length` ta
+    bosh kirgan kataklar - tana. Shuning uchun yurish, o'sish va o'ziga urilish har bir
+    taxta uchun O(1), dumni alohida o'chirish shart emas. Ovqat bo'sh kataklar orasidan
+    bir tekis tanlanadi (faqat ovqat yeyilgan taxtalar uchun).
+    """
+
+    def __init__(self, num_envs, width=WIDTH, height=HEIGHT, seed=None):
+        self.num_envs = num_envs
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+
+        n = num_envs
+        self.stamp = np.full((n, width * height), EMPTY, dtype=np.int64)
+        self.tick = np.zeros(n, dtype=np.int64)
+        self.length = np.ones(n, dtype=np.int64)
+        self.growth = np.zeros(n, dtype=np.int64)  # keyingi yurishda qo'shiladigan bo'laklar
+        self.head_x = np.zeros(n, dtype=np.int64)
+        self.head_y = np.zeros(n, dtype=np.int64)
+        self.dir_x = np.zeros(n, dtype=np.int64)
+        self.dir_y = np.zeros(n, dtype=np.int64)
+        self.food = np.zeros(n, dtype=np.int64)
+        self._rows = np.arange(n)
+
+        self.reset()
+
+    @property
+    def score(self):
+        return self.length + self.growth - 1
+
+    def reset(self, mask=None):
+        """gameLoop boshidagi holat: ilon markazda, turgan joyida, uzunligi 1"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return
+
+        self.stamp[rows] = EMPTY
+        self.tick[rows] = 0
+        self.length[rows] = 1
+        self.growth[rows] = 0
+        self.head_x[rows] = self.width // 2
+        self.head_y[rows] = self.height // 2
+        self.dir_x[rows] = 0
+        self.dir_y[rows] = 0
+        self.stamp[rows, self.head_y[rows] * self.width + self.head_x[rows]] = 0
+        self._place_food(rows)
+
+    def _body(self, rows):
+        """(len(rows), width*height) bool - tana kataklari"""
+        return self.stamp[rows] > (self.tick[rows] - self.length[rows])[:, None]
+
+    def _place_food(self, rows):
+        """Bo'sh kataklardan bir tekis tanlash; bo'sh katak qolmasa False"""
+        keys = self.rng.random((len(rows), self.width * self.height))
+        keys[self._body(rows)] = -1
+        self.food[rows] = keys.argmax(1)
+        return keys[np.arange(len(rows)), self.food[rows]] >= 0
+
+    def step(self, actions):
+        """Barcha taxtalarni bir tik oldinga suradi.
+
+        actions - (N,) butun sonlar [0, NUM_ACTIONS). (reward, done) qaytaradi; tugagan
+        taxtalar avtomatik qayta boshlanadi.
+        """
+        actions = np.asarray(actions)
+        turn = actions > 0
+        self.dir_x[turn] = DIRECTIONS[actions[turn], 0]
+        self.dir_y[turn] = DIRECTIONS[actions[turn], 1]
+
+        moving = (self.dir_x != 0) | (self.dir_y != 0)
+        x = self.head_x + self.dir_x
+        y = self.head_y + self.dir_y
+        wall = moving & ((x < 0) | (x >= self.width) | (y < 0) | (y >= self.height))
+        cell = np.clip(y, 0, self.height - 1) * self.width + np.clip(x, 0, self.width - 1)
+
+        # Yurishdan keyin tana: stamp > tick + 1 - length; o'smayotgan ilonning dumi shu tikda bo'shaydi
+        rows = self._rows
+        self.length += np.where(moving, self.growth, 0)
+        self.growth[moving] = 0
+        self_hit = moving & ~wall & (self.stamp[rows, cell] > self.tick + 1 - self.length)
+
+        alive_move = moving & ~wall
+        self.tick[alive_move] += 1
+        self.head_x[alive_move] = x[alive_move]
+        self.head_y[alive_move] = y[alive_move]
+        self.stamp[rows[alive_move], cell[alive_move]] = self.tick[alive_move]
+
+        dead = wall | self_hit
+        ate = alive_move & ~self_hit & (cell == self.food)
+        reward = np.where(dead, REWARD_DEATH, np.where(ate, REWARD_FOOD, 0.0)).astype(np.float32)
+
+        done = dead
+        if ate.any():
+            eaters = np.flatnonzero(ate)
+            # gameLoop dagidek: ovqat hozirgi tanadan tashqariga; ilon keyingi yurishda o'sadi
+            full = ~self._place_food(eaters)
+            self.growth[eaters] += 1
+            done = done | np.isin(rows, eaters[full])
+
+        if done.any():
+            self.reset(done)
+        return reward, done
+
+    def observe(self, out=None):
+        """(N, 3, height, width) uint8: tana, bosh, ovqat; out berilsa shunga yoziladi"""
+        n = self.num_envs
+        if out is None:
+            out = np.empty((n, 3, self.height, self.width), dtype=np.uint8)
+        flat = out.reshape(n, 3, -1)
+        flat[:, 0] = self._body(self._rows)
+        flat[:, 1] = 0
+        flat[self._rows, 1, self.head_y * self.width + self.head_x] = 1
+        flat[:, 2] = 0
+        flat[self._rows, 2, self.food] = 1
+        return out
+
+
+def benchmark(num_envs, steps, seed=0):
+    rng = np.random.default_rng(seed)
+    env = VecSnake(num_envs, seed=seed)
+    actions = rng.integers(0, NUM_ACTIONS, (steps, num_envs))
+
+    start = time.perf_counter()
+    episodes = 0
+    for t in range(steps):
+        _, done = env.step(actions[t])
+        episodes += int(done.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{num_envs} taxta x {steps} tik: {num_envs * steps / elapsed:,.0f} step/s "
+          f"({num_envs * steps / elapsed * 60 / 1e6:.0f} mln/daqiqa), {episodes} o'yin tugadi")
+
+    obs = env.observe()
+    start = time.perf_counter()
+    for _ in range(20):
+        env.observe(obs)
+    print(f"observe: {(time.perf_counter() - start) / 20 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ilon o'yini: oynasiz, ko'p taxtali benchmark")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--steps", type=int, default=500)
+    args = parser.parse_args(sys.argv[1:])
+    benchmark(args.envs, args.steps)
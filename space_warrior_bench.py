@@ -0,0 +1,138 @@
+import os
+import sys
+import time
+import math
+import random
+import argparse
+
+# Benchmark oynasiz ishlaydi
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import path_finder_game as spw
+
+ENTITY_COUNTS = [50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000]
+
+
+def populate(game, enemies, projectiles, boss_ratio=0.15):
+    """O'yinni berilgan miqdordagi dushman va o'qlar bilan to'ldiradi"""
+    game.reset_game()
+    game.state = spw.GameState.PLAYING
+    game.enemies = []
+    game.projectiles = []
+
+    for _ in range(enemies):
+        enemy_type = "basic" if random.random() >= boss_ratio else "boss"
+        game.enemies.append(spw.Enemy(random.uniform(0, spw.SCREEN_WIDTH),
+                                      random.uniform(0, spw.SCREEN_HEIGHT),
+                                      enemy_type))
+
+    for _ in range(projectiles):
+        angle = random.uniform(0, 2 * math.pi)
+        game.projectiles.append(spw.Projectile(random.uniform(0, spw.SCREEN_WIDTH),
+                                               random.uniform(0, spw.SCREEN_HEIGHT),
+                                               math.cos(angle) * 7, math.sin(angle) * 7,
+                                               random.choice(["player", "enemy"])))
+
+    # Yangi davra boshlanmasligi uchun
+    game.wave_enemy_count = game.max_enemies_in_wave = enemies
+
+
+def measure(step, game, max_ticks, max_seconds):
+    """Bitta yo'lning (update yoki draw) tick/sekund tezligini o'lchaydi"""
+    ticks = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while ticks < max_ticks and elapsed < max_seconds:
+        # O'yinchi o'lmasin va o'yin to'xtamasin
+        game.player.health = game.player.max_health
+        game.state = spw.GameState.PLAYING
+        step()
+        ticks += 1
+        elapsed = time.perf_counter() - start
+    return ticks / elapsed
+
+
+def run_benchmark(counts, projectile_ratio, max_ticks, max_seconds, floor):
+    # Rewind yozuvi o'lchanmaydi - faqat update va draw. Dushman o'qlari stress rejimidagidek
+    # o'yinchiga tegishi tekshiriladi
+    game = spw.Game(spw.WaveConfig(base_enemies=0, enemies_per_wave=0, spawn_batch=0,
+                                   enemy_projectile_damage=spw.STRESS_WAVE.enemy_projectile_damage),
+                    rewind=False)
+    results = []
+
+    print(f"{'entities':>10} {'enemies':>8} {'proj':>8} {'update t/s':>12} {'draw t/s':>10}")
+    for count in counts:
+        projectiles = int(count * projectile_ratio / (1 + projectile_ratio))
+        enemies = count - projectiles
+
+        populate(game, enemies, projectiles)
+        update_tps = measure(game.update, game, max_ticks, max_seconds)
+
+        populate(game, enemies, projectiles)
+        draw_tps = measure(game.draw, game, max_ticks, max_seconds)
+
+        results.append((count, update_tps, draw_tps))
+        print(f"{count:>10} {enemies:>8} {projectiles:>8} {update_tps:>12.1f} {draw_tps:>10.1f}")
+
+        if min(update_tps, draw_tps) < floor:
+            print(f"Tezlik {floor} tick/s dan pastga tushdi - to'xtatildi")
+            break
+
+    return results
+
+
+def report_cliff(results):
+    for name, column in (("update", 1), ("draw", 2)):
+        below = [row[0] for row in results if row[column] < spw.FPS]
+        if below:
+            print(f"{name}: {below[0]} ta obyektda {spw.FPS} FPS dan pastga tushadi")
+        else:
+            print(f"{name}: barcha o'lchamlarda {spw.FPS} FPS dan yuqori")
+
+
+def plot(results, path):
+    try:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("matplotlib o'rnatilmagan - grafik chizilmadi")
+        return
+
+    counts = [row[0] for row in results]
+    plt.figure(figsize=(8, 5))
+    plt.loglog(counts, [row[1] for row in results], "o-", label="update")
+    plt.loglog(counts, [row[2] for row in results], "s-", label="draw")
+    plt.axhline(spw.FPS, color="gray", linestyle="--", label=f"{spw.FPS} FPS")
+    plt.xlabel("Obyektlar soni (dushman + o'q)")
+    plt.ylabel("Tick / sekund")
+    plt.title("SPACE WARRIOR - stress benchmark")
+    plt.legend()
+    plt.grid(True, which="both", alpha=0.3)
+    plt.savefig(path, dpi=120)
+    print(f"Grafik saqlandi: {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SPACE WARRIOR update/draw stress benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=ENTITY_COUNTS)
+    parser.add_argument("--projectile-ratio", type=float, default=1.0,
+                        help="o'qlar soni / dushmanlar soni")
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=3.0,
+                        help="har bir o'lcham uchun vaqt chegarasi")
+    parser.add_argument("--floor", type=float, default=1.0,
+                        help="shu tick/s dan pastda keyingi o'lchamlar o'tkazib yuboriladi")
+    parser.add_argument("--plot", default="space_warrior_bench.png")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    random.seed(args.seed)
+    results = run_benchmark(args.counts, args.projectile_ratio, args.ticks, args.seconds, args.floor)
+    report_cliff(results)
+    if args.plot:
+        plot(results, args.plot)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
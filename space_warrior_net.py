@@ -0,0 +1,574 @@
+import os
+import sys
+import math
+import time
+import random
+import socket
+import struct
+import argparse
+from collections import deque, OrderedDict
+
+# Loopback sinovi oynasiz ishlaydi
+if "loopback" in sys.argv[1:2]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import path_finder_game as spw
+
+DEFAULT_PORT = 50505
+SEND_EVERY = 2  # har 2 tickda bitta snapshot (30 Hz)
+HISTORY = 64
+INTERP_DELAY = 6  # tick (100 ms)
+NO_BASELINE = 0xFFFFFFFF
+
+# Kvantlash: koordinatalar 1/8 piksel, ekrandan tashqarini ham qamrash uchun siljitilgan
+POS_SCALE = 8
+POS_OFFSET = 256
+VEL_SCALE = 256
+ANGLE_SCALE = 65535 / (2 * math.pi)
+
+GLOBALS, PLAYERS, ENEMIES, PROJECTILES, POWERUPS, EXPLOSIONS = range(6)
+KIND_FIELDS = {
+    GLOBALS: "IBHHH",      # tick, state, current_wave, wave_enemy_count, max_enemies_in_wave
+    PLAYERS: "HHHBBBI",    # x, y, rotation, health, shield, weapon_level, score
+    ENEMIES: "HHBH",       # x, y, boss, health
+    PROJECTILES: "HHhhBI",  # chiqqan joyi x, y, vx, vy, dushmanniki, chiqqan tick
+    POWERUPS: "HHB",       # x, y, turi
+    EXPLOSIONS: "HHBB",    # x, y, max_size, rang
+}
+FIELD_STRUCTS = {kind: [struct.Struct("<" + f) for f in fields] for kind, fields in KIND_FIELDS.items()}
+RECORD_STRUCTS = {kind: struct.Struct("<" + fields) for kind, fields in KIND_FIELDS.items()}
+
+COUNT = struct.Struct("<H")
+ENTITY_ID = struct.Struct("<I")
+MASK = struct.Struct("<B")
+STATE_HEADER = struct.Struct("<cII")  # b"S", seq, baseline seq
+INPUT_PACKET = struct.Struct("<cIbbBH")  # b"I", ack, dx, dy, fire, aim
+
+POWER_TYPES = ["health", "shield", "weapon"]
+EXPLOSION_COLORS = [spw.ORANGE, spw.YELLOW]
+
+
+def q_pos(v):
+    return max(0, min(65535, int(round((v + POS_OFFSET) * POS_SCALE))))
+
+
+def dq_pos(q):
+    return q / POS_SCALE - POS_OFFSET
+
+
+def q_angle(a):
+    return int(round((a % (2 * math.pi)) * ANGLE_SCALE))
+
+
+def q_byte(v):
+    return max(0, min(255, int(round(v))))
+
+
+# ---------------------------------------------------------------- snapshot
+
+class _Ids:
+    """Host obyektlariga barqaror tarmoq identifikatorlari beradi"""
+
+    def __init__(self):
+        self.next_id = 1
+
+    def get(self, obj, tick):
+        if not hasattr(obj, "net_id"):
+            obj.net_id = self.next_id
+            # Birinchi ko'rilgan joyi - o'qlar shu nuqtadan to'g'ri chiziq bo'ylab uchadi
+            obj.net_origin = tick
+            self.next_id += 1
+        return obj.net_id
+
+
+def quantize(game, ids):
+    """CoopGame holatini {tur: {id: kvantlangan yozuv}} ko'rinishiga o'tkazadi"""
+    tick = game.tick
+    snap = {
+        GLOBALS: {0: (tick, game.state.value, game.current_wave,
+                      game.wave_enemy_count, game.max_enemies_in_wave)},
+        PLAYERS: {},
+        ENEMIES: {},
+        PROJECTILES: {},
+        POWERUPS: {},
+        EXPLOSIONS: {},
+    }
+    for number, p in ((1, game.player), (2, game.player2)):
+        snap[PLAYERS][number] = (q_pos(p.pos.x), q_pos(p.pos.y), q_angle(p.rotation),
+                                 q_byte(p.health), q_byte(p.shield), p.weapon_level, max(0, p.score))
+    for e in game.enemies:
+        snap[ENEMIES][ids.get(e, tick)] = (q_pos(e.pos.x), q_pos(e.pos.y), e.enemy_type != "basic",
+                                           max(0, min(65535, e.health)))
+    for pr in game.projectiles:
+        net_id = ids.get(pr, tick)
+        if not hasattr(pr, "net_start"):
+            pr.net_start = (q_pos(pr.pos.x), q_pos(pr.pos.y),
+                            int(round(pr.vel.x * VEL_SCALE)), int(round(pr.vel.y * VEL_SCALE)))
+        snap[PROJECTILES][net_id] = pr.net_start + (pr.owner_type != "player", pr.net_origin)
+    for pw in game.powerups:
+        snap[POWERUPS][ids.get(pw, tick)] = (q_pos(pw.pos.x), q_pos(pw.pos.y),
+                                             POWER_TYPES.index(pw.power_type))
+    for ex in game.explosions:
+        color = EXPLOSION_COLORS.index(ex.color) if ex.color in EXPLOSION_COLORS else 0
+        snap[EXPLOSIONS][ids.get(ex, tick)] = (q_pos(ex.x), q_pos(ex.y), q_byte(ex.max_size), color)
+    return snap
+
+
+def encode_delta(baseline, current):
+    """current ni baseline ga nisbatan kodlaydi: o'chirilganlar, qo'shilganlar, o'zgargan maydonlar"""
+    out = bytearray()
+    for kind, record_struct in RECORD_STRUCTS.items():
+        fields = FIELD_STRUCTS[kind]
+        base = baseline[kind] if baseline else {}
+        cur = current[kind]
+
+        removed = [i for i in base if i not in cur]
+        out += COUNT.pack(len(removed))
+        for i in removed:
+            out += ENTITY_ID.pack(i)
+
+        added = [i for i in cur if i not in base]
+        out += COUNT.pack(len(added))
+        for i in added:
+            out += ENTITY_ID.pack(i) + record_struct.pack(*cur[i])
+
+        changed = []
+        for i, record in cur.items():
+            old = base.get(i)
+            if old is not None and old != record:
+                mask = 0
+                for bit, (a, b) in enumerate(zip(old, record)):
+                    if a != b:
+                        mask |= 1 << bit
+                changed.append((i, mask, record))
+        out += COUNT.pack(len(changed))
+        for i, mask, record in changed:
+            out += ENTITY_ID.pack(i) + MASK.pack(mask)
+            for bit, value in enumerate(record):
+                if mask >> bit & 1:
+                    out += fields[bit].pack(value)
+    return bytes(out)
+
+
+def decode_delta(baseline, data, offset=0):
+    snap = {}
+    for kind, record_struct in RECORD_STRUCTS.items():
+        fields = FIELD_STRUCTS[kind]
+        cur = dict(baseline[kind]) if baseline else {}
+
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            (i,) = ENTITY_ID.unpack_from(data, offset)
+            offset += ENTITY_ID.size
+            cur.pop(i, None)
+
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            (i,) = ENTITY_ID.unpack_from(data, offset)
+            cur[i] = record_struct.unpack_from(data, offset + ENTITY_ID.size)
+            offset += ENTITY_ID.size + record_struct.size
+
+        (count,) = COUNT.unpack_from(data, offset)
+        offset += COUNT.size
+        for _ in range(count):
+            (i,) = ENTITY_ID.unpack_from(data, offset)
+            (mask,) = MASK.unpack_from(data, offset + ENTITY_ID.size)
+            offset += ENTITY_ID.size + MASK.size
+            record = list(cur[i])
+            for bit, field in enumerate(fields):
+                if mask >> bit & 1:
+                    (record[bit],) = field.unpack_from(data, offset)
+                    offset += field.size
+            cur[i] = tuple(record)
+
+        snap[kind] = cur
+    return snap
+
+
+# ---------------------------------------------------------------- transport
+
+class UdpTransport:
+    """Mahalliy tarmoq uchun bloklanmaydigan UDP soket"""
+
+    def __init__(self, bind_addr, remote_addr=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(bind_addr)
+        self.sock.setblocking(False)
+        self.remote_addr = remote_addr
+
+    def send(self, data):
+        if self.remote_addr:
+            self.sock.sendto(data, self.remote_addr)
+
+    def recv(self):
+        try:
+            data, addr = self.sock.recvfrom(65535)
+        except BlockingIOError:
+            return None
+        # Host birinchi paketdan mijoz manzilini bilib oladi
+        self.remote_addr = self.remote_addr or addr
+        return data
+
+    def close(self):
+        self.sock.close()
+
+
+class LoopbackTransport:
+    """Bitta jarayon ichidagi soket o'rinbosari; paket yo'qotilishini ham taqlid qiladi"""
+
+    def __init__(self, loss=0.0, seed=None):
+        self.inbox = deque()
+        self.peer = None
+        self.loss = loss
+        self.rng = random.Random(seed)
+        self.bytes_sent = 0
+        self.packets_sent = 0
+
+    @classmethod
+    def pair(cls, loss=0.0, seed=None):
+        a, b = cls(loss, seed), cls(loss, None if seed is None else seed + 1)
+        a.peer, b.peer = b, a
+        return a, b
+
+    def send(self, data):
+        self.bytes_sent += len(data)
+        self.packets_sent += 1
+        if self.rng.random() >= self.loss:
+            self.peer.inbox.append(bytes(data))
+
+    def recv(self):
+        return self.inbox.popleft() if self.inbox else None
+
+    def close(self):
+        self.inbox.clear()
+
+
+# ---------------------------------------------------------------- host / client
+
+class _Keys:
+    """Player.handle_input uchun pygame.key.get_pressed() o'rnini bosadi"""
+
+    def __init__(self, dx, dy):
+        self.pressed = {pygame_key: True for pygame_key, on in (
+            (spw.pygame.K_LEFT, dx < 0), (spw.pygame.K_RIGHT, dx > 0),
+            (spw.pygame.K_UP, dy < 0), (spw.pygame.K_DOWN, dy > 0)) if on}
+
+    def __getitem__(self, key):
+        return self.pressed.get(key, False)
+
+
+class CoopGame(spw.Game):
+    """Ikkinchi kema qo'shilgan Game - ikkinchi o'yinchi tarmoq orqali boshqaradi"""
+
+    def reset_game(self):
+        super().reset_game()
+        self.tick = getattr(self, "tick", 0)
+        self.player2 = spw.Player(spw.SCREEN_WIDTH // 2 + 60, spw.SCREEN_HEIGHT // 2)
+        self.player2.shoot_cooldown = self.wave_config.player_shoot_cooldown
+        self.player2_input = (0, 0, False, 0.0)
+
+    def update(self):
+        self.tick += 1
+        super().update()
+        if self.state != spw.GameState.PLAYING:
+            return
+
+        dx, dy, fire, aim = self.player2_input
+        p2 = self.player2
+        p2.handle_input(_Keys(dx, dy))
+        p2.update((p2.pos.x + math.cos(aim), p2.pos.y + math.sin(aim)))
+        if fire:
+            self.projectiles.extend(p2.shoot())
+
+        for enemy in self.enemies:
+            if p2.pos.distance_to(enemy.pos) < p2.radius + enemy.radius:
+                p2.take_damage(15)
+
+        if p2.health <= 0:
+            # Ikkinchi kema markazda qayta tug'iladi
+            self.player2 = spw.Player(spw.SCREEN_WIDTH // 2, spw.SCREEN_HEIGHT // 2)
+            self.player2.shoot_cooldown = self.wave_config.player_shoot_cooldown
+
+    def draw_game(self):
+        super().draw_game()
+        self.player2.draw(self.screen)
+
+
+def _prune(history, oldest):
+    """oldest dan eski barcha seq larni o'chiradi (yo'qolgan va tartibsiz kelganlari ham)"""
+    while history and next(iter(history)) <= oldest:
+        history.popitem(last=False)
+
+
+class HostSession:
+    """Avtoritar o'yinni yuritib, mijozga delta-snapshotlar yuboradi"""
+
+    def __init__(self, game, transport, send_every=SEND_EVERY):
+        self.game = game
+        self.transport = transport
+        self.send_every = send_every
+        self.ids = _Ids()
+        self.seq = 0
+        self.acked = None
+        self.history = OrderedDict()  # seq -> snapshot, seq o'sish tartibida
+        self.bytes_sent = 0
+        self.full_bytes = 0
+
+    def poll(self):
+        while True:
+            data = self.transport.recv()
+            if data is None:
+                break
+            if data[:1] != b"I":
+                continue
+            _, ack, dx, dy, fire, aim = INPUT_PACKET.unpack(data)
+            if ack != NO_BASELINE and (self.acked is None or ack > self.acked):
+                self.acked = ack
+            self.game.player2_input = (dx, dy, bool(fire), aim / ANGLE_SCALE)
+
+    def tick(self):
+        self.poll()
+        self.game.update()
+        if self.game.tick % self.send_every == 0:
+            self.send_snapshot()
+
+    def send_snapshot(self):
+        self.seq += 1
+        current = quantize(self.game, self.ids)
+        baseline = self.history.get(self.acked)
+        base_seq = self.acked if baseline is not None else NO_BASELINE
+
+        packet = STATE_HEADER.pack(b"S", self.seq, base_seq) + encode_delta(baseline, current)
+        self.transport.send(packet)
+        self.bytes_sent += len(packet)
+        self.full_bytes += STATE_HEADER.size + len(encode_delta(None, current))
+
+        self.history[self.seq] = current
+        _prune(self.history, self.seq - HISTORY)
+
+
+class ClientSession:
+    """Snapshotlarni qabul qiladi, tasdiqlaydi va ular orasida interpolyatsiya qiladi"""
+
+    def __init__(self, transport, interp_delay=INTERP_DELAY):
+        self.transport = transport
+        self.interp_delay = interp_delay
+        self.received = OrderedDict()  # seq -> snapshot, seq o'sish tartibida
+        self.latest_seq = NO_BASELINE
+        self.timeline = deque(maxlen=32)  # (tick, snapshot)
+        self.latest_time = None
+        self.explosion_births = {}
+
+    def poll(self):
+        while True:
+            data = self.transport.recv()
+            if data is None:
+                break
+            if data[:1] != b"S":
+                continue
+            _, seq, base_seq = STATE_HEADER.unpack_from(data)
+            if self.latest_seq != NO_BASELINE and seq <= self.latest_seq:
+                continue  # eskirgan yoki takroriy paket
+            if base_seq == NO_BASELINE:
+                baseline = None
+            elif base_seq in self.received:
+                baseline = self.received[base_seq]
+            else:
+                continue  # baza bizda yo'q - host tez orada boshqasini yuboradi
+
+            snap = decode_delta(baseline, data, STATE_HEADER.size)
+            self.received[seq] = snap
+            _prune(self.received, seq - HISTORY)
+            self.latest_seq = seq
+            self.timeline.append((snap[GLOBALS][0][0], snap))
+            self.latest_time = time.perf_counter()
+
+    def send_input(self, dx, dy, fire, aim):
+        self.transport.send(INPUT_PACKET.pack(b"I", self.latest_seq, dx, dy, fire, q_angle(aim)))
+
+    def render_tick(self, now=None):
+        if not self.timeline:
+            return None
+        now = time.perf_counter() if now is None else now
+        latest_tick = self.timeline[-1][0]
+        return latest_tick + (now - self.latest_time) * spw.FPS - self.interp_delay
+
+    def interpolated(self, render_tick):
+        """render_tick paytidagi holat: (tick, snapshot, keyingi snapshot, t)"""
+        if not self.timeline:
+            return None
+        before = self.timeline[0]
+        after = self.timeline[-1]
+        for entry in self.timeline:
+            if entry[0] <= render_tick:
+                before = entry
+            else:
+                after = entry
+                break
+        if after[0] <= before[0]:
+            return before[1], before[1], 0.0
+        t = max(0.0, min(1.0, (render_tick - before[0]) / (after[0] - before[0])))
+        return before[1], after[1], t
+
+
+def _lerp_pos(a, b, t):
+    return dq_pos(a + (b - a) * t)
+
+
+def apply_to_view(game, before, after, t, render_tick, births):
+    """Interpolyatsiya qilingan holatni chizish uchun CoopGame obyektlariga yozadi"""
+    tick, state, game.current_wave, game.wave_enemy_count, game.max_enemies_in_wave = after[GLOBALS][0]
+    game.state = spw.GameState(state)
+
+    for number, attr in ((1, "player"), (2, "player2")):
+        a, b = before[PLAYERS].get(number), after[PLAYERS].get(number)
+        if b is None:
+            continue
+        a = a or b
+        p = getattr(game, attr)
+        p.pos = spw.Vector(_lerp_pos(a[0], b[0], t), _lerp_pos(a[1], b[1], t))
+        p.rotation = b[2] / ANGLE_SCALE
+        p.health, p.shield, p.weapon_level, p.score = b[3], b[4], b[5], b[6]
+        p.level = game.current_wave
+
+    game.enemies = []
+    for i, b in after[ENEMIES].items():
+        a = before[ENEMIES].get(i, b)
+        e = spw.Enemy.__new__(spw.Enemy)
+        e.pos = spw.Vector(_lerp_pos(a[0], b[0], t), _lerp_pos(a[1], b[1], t))
+        e.enemy_type = "boss" if b[2] else "basic"
+        e.radius = 30 if b[2] else 20
+        e.max_health = 150 if b[2] else 50
+        e.health = b[3]
+        game.enemies.append(e)
+
+    game.projectiles = []
+    for x, y, vx, vy, enemy, origin in after[PROJECTILES].values():
+        age = render_tick - origin
+        pr = spw.Projectile.__new__(spw.Projectile)
+        pr.pos = spw.Vector(dq_pos(x) + vx / VEL_SCALE * age, dq_pos(y) + vy / VEL_SCALE * age)
+        pr.owner_type = "enemy" if enemy else "player"
+        pr.radius = 3 if enemy else 5
+        game.projectiles.append(pr)
+
+    game.powerups = []
+    for x, y, power_type in after[POWERUPS].values():
+        pw = spw.PowerUp.__new__(spw.PowerUp)
+        pw.pos = spw.Vector(dq_pos(x), dq_pos(y))
+        pw.power_type = POWER_TYPES[power_type]
+        pw.size = 10
+        pw.rotation = render_tick * 0.05
+        game.powerups.append(pw)
+
+    game.explosions = []
+    for i, (x, y, max_size, color) in after[EXPLOSIONS].items():
+        ex = spw.Explosion(dq_pos(x), dq_pos(y), max_size, EXPLOSION_COLORS[color])
+        # Portlash mijozda o'z-o'zidan so'nadi
+        age = render_tick - births.setdefault(i, render_tick)
+        ex.lifetime = max(1, ex.max_lifetime - int(age))
+        ex.update()
+        game.explosions.append(ex)
+    for i in list(births):
+        if i not in after[EXPLOSIONS]:
+            del births[i]
+
+
+# ---------------------------------------------------------------- ishga tushirish
+
+def run_host(port):
+    game = CoopGame()
+    game.state = spw.GameState.PLAYING
+    host = HostSession(game, UdpTransport(("0.0.0.0", port)))
+    print(f"Host {port}-portda kutmoqda")
+    running = True
+    while running:
+        running = game.handle_events()
+        host.tick()
+        game.draw()
+        game.clock.tick(spw.FPS)
+    host.transport.close()
+    spw.pygame.quit()
+
+
+def run_client(address, port):
+    game = CoopGame()
+    pygame = spw.pygame
+    pygame.display.set_caption("⭐ SPACE WARRIOR ⭐ | Co-op mijoz")
+    client = ClientSession(UdpTransport(("0.0.0.0", 0), (address, port)))
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        fire = keys[pygame.K_LCTRL] or keys[pygame.K_SPACE]
+        mx, my = pygame.mouse.get_pos()
+        p2 = game.player2
+        client.send_input(dx, dy, fire, math.atan2(my - p2.pos.y, mx - p2.pos.x))
+
+        client.poll()
+        render_tick = client.render_tick()
+        if render_tick is not None:
+            apply_to_view(game, *client.interpolated(render_tick), render_tick, client.explosion_births)
+            game.draw()
+        game.clock.tick(spw.FPS)
+    client.transport.close()
+    pygame.quit()
+
+
+def run_loopback(ticks, loss):
+    """Host va mijozni bitta jarayonda yuritib, trafikni o'lchaydi"""
+    game = CoopGame(spw.WaveConfig(spawn_interval=5, enemy_shoot_cooldown=20, player_shoot_cooldown=3))
+    game.state = spw.GameState.PLAYING
+    host_end, client_end = LoopbackTransport.pair(loss=loss, seed=0)
+    host = HostSession(game, host_end)
+    client = ClientSession(client_end)
+    view = CoopGame()
+
+    start = time.perf_counter()
+    for t in range(ticks):
+        game.player.health = game.player.max_health
+        client.send_input(random.choice([-1, 0, 1]), random.choice([-1, 0, 1]), True,
+                          random.uniform(0, 2 * math.pi))
+        host.tick()
+        client.poll()
+        render_tick = client.render_tick()
+        if render_tick is not None:
+            apply_to_view(view, *client.interpolated(render_tick), render_tick, client.explosion_births)
+    elapsed = time.perf_counter() - start
+
+    check = quantize(game, host.ids)
+    synced = client.received.get(host.seq) == host.history[host.seq]
+    snapshots = max(1, host.seq)
+    print(f"{ticks} tick, {snapshots} snapshot, yo'qotish {loss:.0%}: {elapsed:.2f} s")
+    print(f"obyektlar: {len(game.enemies)} dushman, {len(game.projectiles)} o'q")
+    print(f"o'rtacha snapshot: delta {host.bytes_sent / snapshots:.0f} B, "
+          f"to'liq {host.full_bytes / snapshots:.0f} B")
+    print(f"mijoz oxirgi holat bilan mos: {synced} (oxirgi tick {check[GLOBALS][0][0]})")
+    print(f"saqlangan snapshotlar: host {len(host.history)}, mijoz {len(client.received)} (chegara {HISTORY})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SPACE WARRIOR ikki o'yinchili LAN rejimi")
+    sub = parser.add_subparsers(dest="mode", required=True)
+    host_parser = sub.add_parser("host")
+    host_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    client_parser = sub.add_parser("client")
+    client_parser.add_argument("address")
+    client_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    loop_parser = sub.add_parser("loopback")
+    loop_parser.add_argument("--ticks", type=int, default=1200)
+    loop_parser.add_argument("--loss", type=float, default=0.1)
+    args = parser.parse_args(sys.argv[1:])
+
+    if args.mode == "host":
+        run_host(args.port)
+    elif args.mode == "client":
+        run_client(args.address, args.port)
+    else:
+        run_loopback(args.ticks, args.loss)
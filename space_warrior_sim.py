@@ -0,0 +1,479 @@
+import os
+import sys
+import time
+import argparse
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# path_finder_game.py dagi qiymatlar (pygame ni yuklamaslik uchun shu yerda takrorlangan)
+SCREEN_WIDTH = 1400
+SCREEN_HEIGHT = 900
+
+PLAYER_RADIUS = 15
+PLAYER_MAX_SPEED = 5
+PLAYER_ACCELERATION = 0.3
+PLAYER_FRICTION = 0.95
+PLAYER_MAX_HEALTH = 100
+PLAYER_MAX_SHIELD = 100
+PLAYER_SHOOT_COOLDOWN = 10
+PLAYER_PROJECTILE_SPEED = 7
+PLAYER_PROJECTILE_RADIUS = 5
+PROJECTILE_LIFETIME = 300
+PROJECTILE_DAMAGE = 25
+CONTACT_DAMAGE = 15
+INVINCIBLE_TICKS = 30
+
+# [basic, boss]
+ENEMY_RADIUS = np.array([20, 30], dtype=np.float32)
+ENEMY_HEALTH = np.array([50, 150], dtype=np.float32)
+ENEMY_SPEED = np.array([1.5, 1.2], dtype=np.float32)
+ENEMY_SCORE = np.array([100, 300], dtype=np.int64)
+BOSS_RATIO = 0.15
+SPAWN_INTERVAL = 40
+
+POWERUP_SIZE = 10
+POWERUP_CHANCE = 0.3
+POWERUP_HEALTH, POWERUP_SHIELD, POWERUP_WEAPON = 0, 1, 2
+
+# Qurol darajasiga qarab o'qlar burchagi (NaN - o'q yo'q)
+WEAPON_OFFSETS = np.array([
+    [0.0, np.nan, np.nan],
+    [-0.2, 0.2, np.nan],
+    [-0.3, 0.0, 0.3],
+], dtype=np.float32)
+
+# Harakat: action % 9 -> (dx, dy), action >= 9 -> o'q otish
+MOVES = np.array([(dx, dy) for dy in (-1, 0, 1) for dx in (-1, 0, 1)], dtype=np.float32)
+NUM_ACTIONS = 18
+
+PLAYER_FEATURES = 8
+ENEMY_FEATURES = 4
+POWERUP_FEATURES = 4
+
+
+class VecSpaceWarrior:
+    """SPACE WARRIOR qoidalarining oynasiz, N ta o'yinni birdaniga yurituvchi versiyasi.
+
+    Game.reset_game va Game.update mantiqi NumPy massivlariga ko'chirilgan. Portlashlar,
+    yulduzlar va boshqa bezaklar yo'q; bir tickda bitta o'q bir nechta dushmanga tegsa,
+    birinchi dushman hisoblanadi, lekin bir vaqtda o'layotgan dushmanga tekkan o'qlar
+    ham sarflanadi.
+    """
+
+    def __init__(self, num_envs, max_enemies=16, max_projectiles=64, max_powerups=8, seed=None):
+        self.num_envs = num_envs
+        self.max_enemies = max_enemies
+        self.max_projectiles = max_projectiles
+        self.max_powerups = max_powerups
+        self.rng = np.random.default_rng(seed)
+        self.obs_size = (PLAYER_FEATURES + max_enemies * ENEMY_FEATURES +
+                         max_powerups * POWERUP_FEATURES)
+
+        n, e, p, u = num_envs, max_enemies, max_projectiles, max_powerups
+        self.player_pos = np.zeros((n, 2), dtype=np.float32)
+        self.player_vel = np.zeros((n, 2), dtype=np.float32)
+        self.player_rotation = np.zeros(n, dtype=np.float32)
+        self.health = np.zeros(n, dtype=np.float32)
+        self.shield = np.zeros(n, dtype=np.float32)
+        self.weapon_level = np.zeros(n, dtype=np.int64)
+        self.shoot_timer = np.zeros(n, dtype=np.int64)
+        self.invincible_timer = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+
+        self.enemy_pos = np.zeros((n, e, 2), dtype=np.float32)
+        self.enemy_alive = np.zeros((n, e), dtype=bool)
+        self.enemy_boss = np.zeros((n, e), dtype=np.int64)
+        self.enemy_health = np.zeros((n, e), dtype=np.float32)
+
+        self.proj_pos = np.zeros((n, p, 2), dtype=np.float32)
+        self.proj_vel = np.zeros((n, p, 2), dtype=np.float32)
+        self.proj_alive = np.zeros((n, p), dtype=bool)
+        self.proj_lifetime = np.zeros((n, p), dtype=np.int64)
+
+        self.powerup_pos = np.zeros((n, u, 2), dtype=np.float32)
+        self.powerup_type = np.zeros((n, u), dtype=np.int64)
+        self.powerup_alive = np.zeros((n, u), dtype=bool)
+
+        self.enemy_spawn_timer = np.zeros(n, dtype=np.int64)
+        self.current_wave = np.zeros(n, dtype=np.int64)
+        self.wave_enemy_count = np.zeros(n, dtype=np.int64)
+        self.max_enemies_in_wave = np.zeros(n, dtype=np.int64)
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Game.reset_game: tanlangan o'yinlarni boshidan boshlaydi"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+
+        self.player_pos[mask] = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.player_vel[mask] = 0
+        self.player_rotation[mask] = 0
+        self.health[mask] = PLAYER_MAX_HEALTH
+        self.shield[mask] = PLAYER_MAX_SHIELD
+        self.shoot_timer[mask] = 0
+        self.invincible_timer[mask] = 0
+        self.score[mask] = 0
+
+        self.enemy_alive[mask] = False
+        self.proj_alive[mask] = False
+        self.powerup_alive[mask] = False
+        self.enemy_spawn_timer[mask] = 0
+        self.wave_enemy_count[mask] = 0
+
+        # reset_game -> spawn_next_wave: 2-davra, juft davrada qurol kuchayadi
+        self.current_wave[mask] = 2
+        self.weapon_level[mask] = 2
+        self.max_enemies_in_wave[mask] = 5 + self.current_wave[mask] * 2
+
+    def step(self, actions, aim=None):
+        """Barcha o'yinlarni bir tick oldinga suradi.
+
+        actions - (N,) butun sonlar [0, NUM_ACTIONS); aim - (N,) nishon burchagi yoki
+        None/NaN (eng yaqin dushmanga qaratiladi). (reward, done, won) qaytaradi;
+        tugagan o'yinlar avtomatik qayta boshlanadi.
+        """
+        actions = np.asarray(actions)
+        old_score = self.score.copy()
+
+        self._move_player(actions % 9)
+        self._aim(aim)
+        self._player_shoot(actions >= 9)
+        self._spawn_enemies()
+        self._update_enemies()
+        self._update_projectiles()
+        self._update_powerups()
+
+        won = ~self.enemy_alive.any(1) & (self.wave_enemy_count >= self.max_enemies_in_wave)
+        lost = self.health <= 0
+        done = won | lost
+        reward = (self.score - old_score).astype(np.float32)
+
+        if done.any():
+            self.reset(done)
+        return reward, done, won
+
+    def _move_player(self, moves):
+        direction = MOVES[moves]
+        pressed = direction != 0
+        accelerated = np.clip(self.player_vel + direction * PLAYER_ACCELERATION,
+                              -PLAYER_MAX_SPEED, PLAYER_MAX_SPEED)
+        self.player_vel = np.where(pressed, accelerated, self.player_vel) * PLAYER_FRICTION
+
+        self.player_pos += self.player_vel
+        np.clip(self.player_pos[:, 0], PLAYER_RADIUS, SCREEN_WIDTH - PLAYER_RADIUS,
+                out=self.player_pos[:, 0])
+        np.clip(self.player_pos[:, 1], PLAYER_RADIUS, SCREEN_HEIGHT - PLAYER_RADIUS,
+                out=self.player_pos[:, 1])
+
+        self.shoot_timer += 1
+        np.maximum(self.invincible_timer - 1, 0, out=self.invincible_timer)
+
+    def _aim(self, aim):
+        delta = self.enemy_pos - self.player_pos[:, None, :]
+        dist2 = np.where(self.enemy_alive, (delta ** 2).sum(-1), np.inf)
+        nearest = dist2.argmin(1)
+        has_target = np.isfinite(dist2[np.arange(self.num_envs), nearest])
+        target = delta[np.arange(self.num_envs), nearest]
+        auto = np.where(has_target, np.arctan2(target[:, 1], target[:, 0]), self.player_rotation)
+
+        if aim is None:
+            self.player_rotation = auto.astype(np.float32)
+        else:
+            aim = np.asarray(aim, dtype=np.float32)
+            self.player_rotation = np.where(np.isnan(aim), auto, aim).astype(np.float32)
+
+    def _player_shoot(self, fire):
+        shooting = fire & (self.shoot_timer >= PLAYER_SHOOT_COOLDOWN)
+        self.shoot_timer[shooting] = 0
+
+        offsets = WEAPON_OFFSETS[np.clip(self.weapon_level, 1, 3) - 1]
+        for k in range(offsets.shape[1]):
+            envs = np.flatnonzero(shooting & ~np.isnan(offsets[:, k]))
+            if len(envs) == 0:
+                continue
+            angle = self.player_rotation[envs] + offsets[envs, k]
+            velocity = np.stack([np.cos(angle), np.sin(angle)], 1) * PLAYER_PROJECTILE_SPEED
+            self._place(self.proj_alive, envs, self.proj_pos, self.player_pos[envs],
+                        self.proj_vel, velocity, self.proj_lifetime, PROJECTILE_LIFETIME)
+
+    @staticmethod
+    def _place(alive, envs, *fields):
+        """Har bir envs uchun birinchi bo'sh slotni topib, (massiv, qiymat) juftlarini yozadi"""
+        slots = alive[envs].argmin(1)
+        free = ~alive[envs, slots]
+        envs, slots = envs[free], slots[free]
+        alive[envs, slots] = True
+        for array, value in zip(fields[::2], fields[1::2]):
+            array[envs, slots] = value[free] if np.ndim(value) else value
+        return envs, slots
+
+    def _spawn_enemies(self):
+        self.enemy_spawn_timer += 1
+        spawning = ((self.enemy_spawn_timer > SPAWN_INTERVAL) &
+                    (self.wave_enemy_count < self.max_enemies_in_wave))
+        envs = np.flatnonzero(spawning)
+        if len(envs) == 0:
+            return
+        self.enemy_spawn_timer[envs] = 0
+        self.wave_enemy_count[envs] += 1
+
+        count = len(envs)
+        edge = self.rng.integers(0, 4, count)
+        x = self.rng.uniform(0, SCREEN_WIDTH, count)
+        y = self.rng.uniform(0, SCREEN_HEIGHT, count)
+        x = np.select([edge == 2, edge == 3], [-30, SCREEN_WIDTH + 30], x)
+        y = np.select([edge == 0, edge == 1], [-30, SCREEN_HEIGHT + 30], y)
+        boss = (self.rng.random(count) < BOSS_RATIO).astype(np.int64)
+
+        self._place(self.enemy_alive, envs, self.enemy_pos, np.stack([x, y], 1),
+                    self.enemy_boss, boss, self.enemy_health, ENEMY_HEALTH[boss])
+
+    def _update_enemies(self):
+        delta = self.player_pos[:, None, :] - self.enemy_pos
+        length = np.sqrt((delta ** 2).sum(-1, keepdims=True))
+        direction = np.divide(delta, length, out=np.zeros_like(delta), where=length > 0)
+        speed = ENEMY_SPEED[self.enemy_boss][..., None]
+        moved = self.enemy_pos + direction * speed
+
+        radius = ENEMY_RADIUS[self.enemy_boss]
+        moved[..., 0] = np.clip(moved[..., 0], radius, SCREEN_WIDTH - radius)
+        moved[..., 1] = np.clip(moved[..., 1], radius, SCREEN_HEIGHT - radius)
+        self.enemy_pos = np.where(self.enemy_alive[..., None], moved, self.enemy_pos)
+
+        distance = np.sqrt(((self.player_pos[:, None, :] - self.enemy_pos) ** 2).sum(-1))
+        touching = self.enemy_alive & (distance < PLAYER_RADIUS + radius)
+        self._take_damage(touching.sum(1) * CONTACT_DAMAGE)
+
+    def _take_damage(self, damage):
+        """Player.take_damage: avval qalqon, keyin sog'liq"""
+        absorbed = np.minimum(damage, self.shield)
+        self.shield -= absorbed
+        remaining = damage - absorbed
+        hurt = remaining > 0
+        self.health -= remaining
+        self.invincible_timer[hurt] = INVINCIBLE_TICKS
+
+    def _update_projectiles(self):
+        self.proj_pos += self.proj_vel
+        self.proj_lifetime -= 1
+        pos = self.proj_pos
+        self.proj_alive &= ((self.proj_lifetime > 0) &
+                            (pos[..., 0] > -50) & (pos[..., 0] < SCREEN_WIDTH + 50) &
+                            (pos[..., 1] > -50) & (pos[..., 1] < SCREEN_HEIGHT + 50))
+
+        delta = self.proj_pos[:, :, None, :] - self.enemy_pos[:, None, :, :]
+        reach = PLAYER_PROJECTILE_RADIUS + ENEMY_RADIUS[self.enemy_boss][:, None, :]
+        hits = (((delta ** 2).sum(-1) < reach ** 2) &
+                self.proj_alive[:, :, None] & self.enemy_alive[:, None, :])
+        hit_any = hits.any(2)
+        if not hit_any.any():
+            return
+
+        env_idx, proj_idx = np.nonzero(hit_any)
+        target = hits[env_idx, proj_idx].argmax(1)
+        self.proj_alive[env_idx, proj_idx] = False
+        np.subtract.at(self.enemy_health, (env_idx, target), PROJECTILE_DAMAGE)
+
+        killed = self.enemy_alive & (self.enemy_health <= 0)
+        self.enemy_alive &= ~killed
+        self.score += (killed * ENEMY_SCORE[self.enemy_boss]).sum(1)
+
+        kill_env, kill_slot = np.nonzero(killed)
+        drop = self.rng.random(len(kill_env)) < POWERUP_CHANCE
+        kill_env, kill_slot = kill_env[drop], kill_slot[drop]
+        # Bir o'yinda bir tickda bir nechta bonus tushsa, har biri alohida joylanadi
+        while len(kill_env):
+            envs, first = np.unique(kill_env, return_index=True)
+            power_type = self.rng.integers(0, 3, len(envs))
+            self._place(self.powerup_alive, envs, self.powerup_pos,
+                        self.enemy_pos[envs, kill_slot[first]], self.powerup_type, power_type)
+            keep = np.ones(len(kill_env), dtype=bool)
+            keep[first] = False
+            kill_env, kill_slot = kill_env[keep], kill_slot[keep]
+
+    def _update_powerups(self):
+        distance = np.sqrt(((self.player_pos[:, None, :] - self.powerup_pos) ** 2).sum(-1))
+        taken = self.powerup_alive & (distance < PLAYER_RADIUS + POWERUP_SIZE)
+        if not taken.any():
+            return
+        self.powerup_alive &= ~taken
+
+        for power_type in (POWERUP_HEALTH, POWERUP_SHIELD, POWERUP_WEAPON):
+            count = (taken & (self.powerup_type == power_type)).sum(1)
+            if power_type == POWERUP_HEALTH:
+                self.health = np.minimum(self.health + 50 * count, PLAYER_MAX_HEALTH)
+            elif power_type == POWERUP_SHIELD:
+                self.shield = np.minimum(self.shield + 50 * count, PLAYER_MAX_SHIELD)
+            else:
+                self.weapon_level = np.minimum(self.weapon_level + count, 3)
+
+    def observe(self, out=None):
+        """(N, obs_size) float32 kuzatuvlar; out berilsa shunga yoziladi"""
+        if out is None:
+            out = np.empty((self.num_envs, self.obs_size), dtype=np.float32)
+        scale = np.array([SCREEN_WIDTH, SCREEN_HEIGHT], dtype=np.float32)
+
+        out[:, 0:2] = self.player_pos / scale
+        out[:, 2:4] = self.player_vel / PLAYER_MAX_SPEED
+        out[:, 4] = self.health / PLAYER_MAX_HEALTH
+        out[:, 5] = self.shield / PLAYER_MAX_SHIELD
+        out[:, 6] = self.weapon_level / 3
+        out[:, 7] = self.shoot_timer >= PLAYER_SHOOT_COOLDOWN
+
+        start = PLAYER_FEATURES
+        enemies = out[:, start:start + self.max_enemies * ENEMY_FEATURES].reshape(
+            self.num_envs, self.max_enemies, ENEMY_FEATURES)
+        enemies[..., 0:2] = (self.enemy_pos - self.player_pos[:, None, :]) / scale
+        enemies[..., 2] = self.enemy_alive
+        enemies[..., 3] = self.enemy_boss
+        enemies[~self.enemy_alive, 0:2] = 0
+
+        start += self.max_enemies * ENEMY_FEATURES
+        powerups = out[:, start:].reshape(self.num_envs, self.max_powerups, POWERUP_FEATURES)
+        powerups[..., 0:2] = (self.powerup_pos - self.player_pos[:, None, :]) / scale
+        powerups[..., 2] = self.powerup_alive
+        powerups[..., 3] = self.powerup_type / 2
+        powerups[~self.powerup_alive, 0:2] = 0
+        return out
+
+
+def _worker(conn, shm_names, start, count, env_kwargs, seed):
+    """Jarayon ichida VecSpaceWarrior ni yuritadi; natijalar umumiy xotiraga yoziladi"""
+    env = VecSpaceWarrior(count, seed=seed, **env_kwargs)
+    blocks = [shared_memory.SharedMemory(name=name) for name in shm_names]
+    total = conn.recv()
+    obs, actions, aim, rewards, dones, wins = _views(blocks, total, env.obs_size)
+    sl = slice(start, start + count)
+
+    try:
+        while True:
+            command = conn.recv()
+            if command == "step":
+                reward, done, won = env.step(actions[sl], aim[sl])
+                rewards[sl] = reward
+                dones[sl] = done
+                wins[sl] = won
+                env.observe(obs[sl])
+            elif command == "reset":
+                env.reset()
+                env.observe(obs[sl])
+            elif command == "close":
+                break
+            conn.send(True)
+    finally:
+        del obs, actions, aim, rewards, dones, wins
+        for block in blocks:
+            block.close()
+        conn.close()
+
+
+def _views(blocks, total, obs_size):
+    obs = np.ndarray((total, obs_size), dtype=np.float32, buffer=blocks[0].buf)
+    actions = np.ndarray(total, dtype=np.int64, buffer=blocks[1].buf)
+    aim = np.ndarray(total, dtype=np.float32, buffer=blocks[2].buf)
+    rewards = np.ndarray(total, dtype=np.float32, buffer=blocks[3].buf)
+    dones = np.ndarray(total, dtype=bool, buffer=blocks[4].buf)
+    wins = np.ndarray(total, dtype=bool, buffer=blocks[5].buf)
+    return obs, actions, aim, rewards, dones, wins
+
+
+class ParallelSpaceWarrior:
+    """VecSpaceWarrior larni CPU yadrolari bo'yicha jarayonlarga bo'lib yuritadi.
+
+    Kuzatuvlar, harakatlar va mukofotlar umumiy xotira (shared_memory) bufferlarida
+    turadi, jarayonlar o'rtasida faqat qisqa buyruqlar yuboriladi. step() qaytargan
+    massivlar shu bufferlarning o'zi - keyingi stepda qayta yoziladi.
+    """
+
+    def __init__(self, num_envs, num_workers=None, seed=0, **env_kwargs):
+        num_workers = min(num_workers or os.cpu_count() or 1, num_envs)
+        self.num_envs = num_envs
+        self.obs_size = VecSpaceWarrior(1, **env_kwargs).obs_size
+
+        sizes = [num_envs * self.obs_size * 4, num_envs * 8, num_envs * 4,
+                 num_envs * 4, num_envs, num_envs]
+        self._blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        (self.obs, self.actions, self.aim,
+         self.rewards, self.dones, self.wins) = _views(self._blocks, num_envs, self.obs_size)
+        self.aim[:] = np.nan
+
+        names = [block.name for block in self._blocks]
+        bounds = np.linspace(0, num_envs, num_workers + 1).astype(int)
+        self._conns = []
+        self._processes = []
+        for i in range(num_workers):
+            parent, child = mp.Pipe()
+            process = mp.Process(target=_worker, daemon=True,
+                                 args=(child, names, bounds[i], bounds[i + 1] - bounds[i],
+                                       env_kwargs, seed + i))
+            process.start()
+            parent.send(num_envs)
+            self._conns.append(parent)
+            self._processes.append(process)
+
+    def _broadcast(self, command):
+        for conn in self._conns:
+            conn.send(command)
+        for conn in self._conns:
+            conn.recv()
+
+    def reset(self):
+        self._broadcast("reset")
+        return self.obs
+
+    def step(self, actions, aim=None):
+        self.actions[:] = actions
+        self.aim[:] = np.nan if aim is None else aim
+        self._broadcast("step")
+        return self.obs, self.rewards, self.dones, self.wins
+
+    def close(self):
+        for conn in self._conns:
+            conn.send("close")
+        for process in self._processes:
+            process.join()
+        del self.obs, self.actions, self.aim, self.rewards, self.dones, self.wins
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def benchmark(num_envs, steps, workers):
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, NUM_ACTIONS, (steps, num_envs))
+
+    env = VecSpaceWarrior(num_envs, seed=0)
+    obs = env.observe()
+    start = time.perf_counter()
+    for t in range(steps):
+        env.step(actions[t])
+        env.observe(obs)
+    elapsed = time.perf_counter() - start
+    print(f"1 jarayon, {num_envs} o'yin: {num_envs * steps / elapsed:,.0f} step/s")
+
+    if workers > 1:
+        with ParallelSpaceWarrior(num_envs, num_workers=workers) as pool:
+            pool.reset()
+            start = time.perf_counter()
+            for t in range(steps):
+                pool.step(actions[t])
+            elapsed = time.perf_counter() - start
+        print(f"{workers} jarayon, {num_envs} o'yin: {num_envs * steps / elapsed:,.0f} step/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SPACE WARRIOR oynasiz simulyator benchmarki")
+    parser.add_argument("--envs", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(sys.argv[1:])
+    benchmark(args.envs, args.steps, args.workers)
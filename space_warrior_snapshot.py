@@ -0,0 +1,189 @@
+import sys
+import random
+import struct
+from collections import deque
+
+import numpy as np
+
+MAGIC = b"SPW1"
+
+# Sarlavha: magic, holat, ro'yxatlar uzunligi, davra taymerlari
+HEADER = struct.Struct("<4sB5I4i")
+# O'yinchi: pos, vel, rotation, health, max_health, shield, max_shield,
+# radius, max_speed, score, level, shoot_timer, shoot_cooldown, weapon_level, invincible_timer
+PLAYER = struct.Struct("<5d12i")
+# random.getstate(): versiya, 625 ta so'z, gauss_next
+RNG = struct.Struct("<i625I?d")
+
+ENEMY_DTYPE = np.dtype([("pos", "<f8", 2), ("vel", "<f8", 2), ("rotation", "<f8"),
+                        ("health", "<i4"), ("max_health", "<i4"), ("shoot_timer", "<i4"),
+                        ("shoot_cooldown", "<i2"), ("score_value", "<i2"),
+                        ("radius", "u1"), ("boss", "u1")])
+PROJECTILE_DTYPE = np.dtype([("pos", "<f8", 2), ("vel", "<f8", 2), ("lifetime", "<i2"),
+                             ("radius", "u1"), ("enemy", "u1")])
+POWERUP_DTYPE = np.dtype([("pos", "<f8", 2), ("rotation", "<f8"), ("size", "u1"), ("type", "u1")])
+EXPLOSION_DTYPE = np.dtype([("pos", "<f4", 2), ("size", "<f4"), ("max_size", "<f4"),
+                            ("lifetime", "<i2"), ("max_lifetime", "<i2"), ("color", "u1", 3)])
+STAR_DTYPE = np.dtype([("pos", "<f8", 3)])
+
+POWER_TYPES = ["health", "shield", "weapon"]
+
+
+def _game_module(game):
+    # path_finder_game.py __main__ sifatida ishga tushganda ham o'sha sinflardan foydalanish
+    return sys.modules[type(game).__module__]
+
+
+def snapshot(game):
+    """O'yinning to'liq holatini ixcham bayt qatoriga yozadi"""
+    p = game.player
+    enemies = np.array([((e.pos.x, e.pos.y), (e.vel.x, e.vel.y), e.rotation, e.health, e.max_health,
+                         e.shoot_timer, e.shoot_cooldown, e.score_value, e.radius,
+                         e.enemy_type != "basic") for e in game.enemies], dtype=ENEMY_DTYPE)
+    projectiles = np.array([((pr.pos.x, pr.pos.y), (pr.vel.x, pr.vel.y), pr.lifetime, pr.radius,
+                             pr.owner_type != "player") for pr in game.projectiles],
+                           dtype=PROJECTILE_DTYPE)
+    powerups = np.array([((pw.pos.x, pw.pos.y), pw.rotation, pw.size, POWER_TYPES.index(pw.power_type))
+                         for pw in game.powerups], dtype=POWERUP_DTYPE)
+    explosions = np.array([((ex.x, ex.y), ex.size, ex.max_size, ex.lifetime, ex.max_lifetime, ex.color)
+                           for ex in game.explosions], dtype=EXPLOSION_DTYPE)
+    stars = np.array([((s.x, s.y, s.z),) for s in game.stars], dtype=STAR_DTYPE)
+
+    version, words, gauss_next = random.getstate()
+
+    return b"".join([
+        HEADER.pack(MAGIC, game.state.value, len(enemies), len(projectiles), len(powerups),
+                    len(explosions), len(stars), game.enemy_spawn_timer, game.current_wave,
+                    game.wave_enemy_count, game.max_enemies_in_wave),
+        PLAYER.pack(p.pos.x, p.pos.y, p.vel.x, p.vel.y, p.rotation, p.health, p.max_health,
+                    p.shield, p.max_shield, p.radius, p.max_speed, p.score, p.level,
+                    p.shoot_timer, p.shoot_cooldown, p.weapon_level, p.invincible_timer),
+        enemies.tobytes(), projectiles.tobytes(), powerups.tobytes(),
+        explosions.tobytes(), stars.tobytes(),
+        RNG.pack(version, *words, gauss_next is not None, gauss_next or 0.0),
+    ])
+
+
+def _read(data, offset, dtype, count):
+    array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+    return array, offset + dtype.itemsize * count
+
+
+def restore(game, data):
+    """snapshot() natijasini o'yinga qaytaradi"""
+    module = _game_module(game)
+    Vector = module.Vector
+
+    (magic, state, n_enemies, n_projectiles, n_powerups, n_explosions, n_stars,
+     game.enemy_spawn_timer, game.current_wave, game.wave_enemy_count,
+     game.max_enemies_in_wave) = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Noto'g'ri snapshot formati")
+    game.state = module.GameState(state)
+    game.waves_completed = game.current_wave - 1
+    offset = HEADER.size
+
+    p = game.player = module.Player.__new__(module.Player)
+    values = PLAYER.unpack_from(data, offset)
+    offset += PLAYER.size
+    p.pos = Vector(values[0], values[1])
+    p.vel = Vector(values[2], values[3])
+    (p.rotation, p.health, p.max_health, p.shield, p.max_shield, p.radius, p.max_speed,
+     p.score, p.level, p.shoot_timer, p.shoot_cooldown, p.weapon_level, p.invincible_timer) = values[4:17]
+
+    records, offset = _read(data, offset, ENEMY_DTYPE, n_enemies)
+    game.enemies = []
+    for r in records.tolist():
+        e = module.Enemy.__new__(module.Enemy)
+        e.pos = Vector(*r[0])
+        e.vel = Vector(*r[1])
+        (e.rotation, e.health, e.max_health, e.shoot_timer, e.shoot_cooldown,
+         e.score_value, e.radius) = r[2:9]
+        e.enemy_type = "boss" if r[9] else "basic"
+        game.enemies.append(e)
+
+    records, offset = _read(data, offset, PROJECTILE_DTYPE, n_projectiles)
+    game.projectiles = []
+    for r in records.tolist():
+        pr = module.Projectile.__new__(module.Projectile)
+        pr.pos = Vector(*r[0])
+        pr.vel = Vector(*r[1])
+        pr.lifetime, pr.radius = r[2], r[3]
+        pr.owner_type = "enemy" if r[4] else "player"
+        game.projectiles.append(pr)
+
+    records, offset = _read(data, offset, POWERUP_DTYPE, n_powerups)
+    game.powerups = []
+    for r in records.tolist():
+        pw = module.PowerUp.__new__(module.PowerUp)
+        pw.pos = Vector(*r[0])
+        pw.rotation, pw.size = r[1], r[2]
+        pw.power_type = POWER_TYPES[r[3]]
+        game.powerups.append(pw)
+
+    records, offset = _read(data, offset, EXPLOSION_DTYPE, n_explosions)
+    game.explosions = []
+    for r in records.tolist():
+        ex = module.Explosion.__new__(module.Explosion)
+        (ex.x, ex.y), ex.size, ex.max_size, ex.lifetime, ex.max_lifetime = r[:5]
+        ex.color = tuple(r[5])
+        game.explosions.append(ex)
+
+    records, offset = _read(data, offset, STAR_DTYPE, n_stars)
+    for star, r in zip(game.stars, records.tolist()):
+        star.x, star.y, star.z = r[0]
+
+    values = RNG.unpack_from(data, offset)
+    random.setstate((values[0], values[1:626], values[627] if values[626] else None))
+
+
+def save(game, path):
+    with open(path, "wb") as f:
+        f.write(snapshot(game))
+
+
+def load(game, path):
+    with open(path, "rb") as f:
+        restore(game, f.read())
+
+
+class RewindBuffer:
+    """Oxirgi necha soniyadagi holatlarni xotirada saqlovchi halqa bufer.
+
+    every - har nechta tikda bitta kadr yoziladi (ko'p obyektli o'yinda xotira va vaqtni tejaydi).
+    """
+
+    def __init__(self, seconds=5, fps=60, every=1):
+        self.fps = fps
+        self.every = every
+        self.calls = 0
+        self.frames = deque(maxlen=max(1, int(seconds * fps / every)))
+
+    def __len__(self):
+        return len(self.frames)
+
+    def record(self, game):
+        if self.calls % self.every == 0:
+            self.frames.append(snapshot(game))
+        self.calls += 1
+
+    def rewind(self, game, seconds=1.0):
+        """O'yinni seconds oldingi holatga qaytaradi; undan keyingi kadrlar o'chiriladi"""
+        if not self.frames:
+            return False
+        ticks = min(max(1, int(seconds * self.fps / self.every)), len(self.frames))
+        for _ in range(ticks - 1):
+            self.frames.pop()
+        restore(game, self.frames.pop())
+        return True
+
+    def replay(self):
+        """Eskisidan yangisiga qarab barcha kadrlar (instant replay uchun)"""
+        return list(self.frames)
+
+    def clear(self):
+        self.frames.clear()
+        self.calls = 0
+
+    def memory_usage(self):
+        return sum(len(frame) for frame in self.frames)
@@ -0,0 +1,183 @@
+import sys
+import time
+import heapq
+import random
+from array import array
+
+from katak_turlari import TUPROQ, TOSH, NARXLAR
+
+# Katak turi -> 1 (narxi bor - yurish mumkin) / 0 (to'siq) jadvali, bytes.translate uchun
+O_TISH_JADVALI = bytes(1 if NARXLAR.get(t) else 0 for t in range(256))
+
+
+def o_tish_xaritasi(xarita, jadval=O_TISH_JADVALI):
+    """Xaritadan atrofi to'siq bilan o'ralgan (kenglik+2)x(balandlik+2) bytearray yasaydi.
+
+    xarita - ro'yxatlar ro'yxati yoki uint8 NumPy massiv. jadval - katak turi -> bayt
+    (256 baytli bytes); 0 qiymat to'siq hisoblanadi.
+    """
+    if hasattr(xarita, "tobytes"):
+        # xarita_generator dan kelgan uint8 NumPy massiv
+        import numpy as np
+        return bytearray(np.pad(np.frombuffer(jadval, dtype=np.uint8)[xarita], 1).tobytes())
+
+    kenglik = len(xarita[0])
+    balandlik = len(xarita)
+    qator_uzunligi = kenglik + 2
+    o_tish = bytearray(qator_uzunligi * (balandlik + 2))
+
+    for y, qator in enumerate(xarita):
+        boshi = (y + 1) * qator_uzunligi + 1
+        o_tish[boshi:boshi + kenglik] = bytes(qator).translate(jadval)
+    return o_tish
+
+
+class YolTopuvchi:
+    """yo_l_top ning tekis massivli varianti.
+
+    Kataklar (x, y) emas, bitta butun indeks bilan ifodalanadi. Xarita chetiga to'siq
+    qatori qo'shilgani uchun qo'shnilarni chegaraga tekshirish shart emas. g va ota
+    massivlari bir marta ajratiladi; har bir qidiruv "avlod" raqamini oshiradi, shuning
+    uchun massivlarni tozalash kerak emas.
+    """
+
+    def __init__(self, xarita):
+        self._tayyorlash(len(xarita[0]), len(xarita), o_tish_xaritasi(xarita))
+
+    @classmethod
+    def o_tishdan(cls, o_tish, kenglik, balandlik):
+        """Tayyor o'tish buferidan (masalan, umumiy xotiradagi) topuvchi yasaydi"""
+        topuvchi = cls.__new__(cls)
+        topuvchi._tayyorlash(kenglik, balandlik, o_tish)
+        return topuvchi
+
+    def _tayyorlash(self, kenglik, balandlik, o_tish):
+        self.kenglik = kenglik
+        self.balandlik = balandlik
+        self.qator = kenglik + 2
+        self.o_tish = o_tish
+
+        n = len(self.o_tish)
+        self.g = array('i', bytes(4 * n))
+        self.ota = array('i', bytes(4 * n))
+        self.belgi = array('I', bytes(4 * n))  # g/ota qaysi qidiruvga tegishli
+        self.yopiq = array('I', bytes(4 * n))
+        self.avlod = 0
+
+    def indeks(self, x, y):
+        return (y + 1) * self.qator + x + 1
+
+    def katak(self, indeks):
+        y, x = divmod(indeks, self.qator)
+        return x - 1, y - 1
+
+    def yangilash(self, x, y, katak_turi):
+        """Xarita o'zgarganda bitta katakning o'tish qiymatini yangilaydi"""
+        self.o_tish[self.indeks(x, y)] = O_TISH_JADVALI[katak_turi]
+
+    def _yangi_avlod(self):
+        self.avlod += 1
+        if self.avlod >= 0xFFFFFFFF:
+            for massiv in (self.belgi, self.yopiq):
+                massiv[:] = array('I', bytes(4 * len(massiv)))
+            self.avlod = 1
+        return self.avlod
+
+    def top(self, boshlang_i, manzil):
+        """A* - natija yo_l_top bilan bir xil ko'rinishda: [(x, y), ...] yoki []"""
+        if boshlang_i == manzil:
+            return [boshlang_i]
+
+        qator = self.qator
+        o_tish = self.o_tish
+        g = self.g
+        ota = self.ota
+        belgi = self.belgi
+        yopiq = self.yopiq
+        avlod = self._yangi_avlod()
+
+        boshi = self.indeks(*boshlang_i)
+        oxiri = self.indeks(*manzil)
+        mx, my = manzil[0] + 1, manzil[1] + 1
+        qadamlar = (1, -1, qator, -qator)
+
+        g[boshi] = 0
+        belgi[boshi] = avlod
+        open_set = [(abs(boshlang_i[0] - manzil[0]) + abs(boshlang_i[1] - manzil[1]), boshi)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        while open_set:
+            _, joriy = heappop(open_set)
+
+            if joriy == oxiri:
+                return self._yo_l(boshi, oxiri)
+
+            if yopiq[joriy] == avlod:
+                continue
+            yopiq[joriy] = avlod
+
+            yangi_g = g[joriy] + 1
+            for qadam in qadamlar:
+                qo_shni = joriy + qadam
+                if not o_tish[qo_shni] or yopiq[qo_shni] == avlod:
+                    continue
+                if belgi[qo_shni] != avlod or yangi_g < g[qo_shni]:
+                    belgi[qo_shni] = avlod
+                    g[qo_shni] = yangi_g
+                    ota[qo_shni] = joriy
+                    y, x = divmod(qo_shni, qator)
+                    heappush(open_set, (yangi_g + abs(x - mx) + abs(y - my), qo_shni))
+
+        return []  # Yo'l topilmadi
+
+    def _yo_l(self, boshi, oxiri):
+        yo_l = []
+        joriy = oxiri
+        while joriy != boshi:
+            yo_l.append(self.katak(joriy))
+            joriy = self.ota[joriy]
+        yo_l.append(self.katak(boshi))
+        return yo_l[::-1]
+
+
+def tasodifiy_xarita(kenglik, balandlik, to_siq_ulushi=0.25, urug=0):
+    """Benchmark uchun tasodifiy to'siqli xarita"""
+    rng = random.Random(urug)
+    return [[TOSH if rng.random() < to_siq_ulushi else TUPROQ for _ in range(kenglik)]
+            for _ in range(balandlik)]
+
+
+def benchmark(kenglik=1000, balandlik=1000, so_rovlar=5, urug=0):
+    from game import yo_l_top
+
+    xarita = tasodifiy_xarita(kenglik, balandlik, urug=urug)
+    rng = random.Random(urug)
+    juftlar = []
+    while len(juftlar) < so_rovlar:
+        a = (rng.randrange(kenglik), rng.randrange(balandlik))
+        b = (rng.randrange(kenglik), rng.randrange(balandlik))
+        if xarita[a[1]][a[0]] == TUPROQ and xarita[b[1]][b[0]] == TUPROQ:
+            juftlar.append((a, b))
+
+    start = time.perf_counter()
+    topuvchi = YolTopuvchi(xarita)
+    print(f"{kenglik}x{balandlik}: tayyorlash {time.perf_counter() - start:.3f} s")
+
+    for a, b in juftlar:
+        start = time.perf_counter()
+        eski = yo_l_top(xarita, a, b)
+        eski_vaqt = time.perf_counter() - start
+
+        start = time.perf_counter()
+        yangi = topuvchi.top(a, b)
+        yangi_vaqt = time.perf_counter() - start
+
+        assert len(eski) == len(yangi)
+        print(f"{a} -> {b}: uzunlik {len(yangi):5d} | yo_l_top {eski_vaqt:7.3f} s | "
+              f"YolTopuvchi {yangi_vaqt:7.3f} s | x{eski_vaqt / max(yangi_vaqt, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    razmer = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    benchmark(razmer, razmer)
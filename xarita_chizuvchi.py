@@ -0,0 +1,115 @@
+from collections import OrderedDict
+
+import pygame
+
+from katak_turlari import TUPROQ, KOL, TOSH, DARAXT, MAYSA
+
+# Katak turi -> rasmlar lug'atidagi kalit
+RASM_NOMLARI = {
+    TUPROQ: 'tuproq',
+    KOL: 'kol',
+    TOSH: 'tosh',
+    DARAXT: 'daraxt',
+    MAYSA: 'maysa',
+}
+FON_RANGI = (255, 255, 255)
+BO_LAK_HAJMI = 16  # bir bo'lakdagi kataklar soni (har tomonga)
+MAKS_BO_LAKLAR = 64  # xotirada saqlanadigan tayyor bo'laklar
+
+
+def xarita_o_lchami(xarita):
+    """(kenglik, balandlik) - ro'yxat, NumPy massiv yoki Dunyo uchun"""
+    if hasattr(xarita, "kenglik"):
+        return xarita.kenglik, xarita.balandlik
+    return len(xarita[0]), len(xarita)
+
+
+def xarita_bloki(xarita, x0, y0, kenglik, balandlik):
+    """Xaritaning to'rtburchak qismini qatorlar ro'yxati sifatida qaytaradi"""
+    if hasattr(xarita, "blok"):
+        return xarita.blok(x0, y0, kenglik, balandlik)
+    return [qator[x0:x0 + kenglik] for qator in xarita[y0:y0 + balandlik]]
+
+
+class Kamera:
+    """Dunyoning ekranda ko'rinadigan qismi (piksellarda)"""
+
+    def __init__(self, kenglik, balandlik, dunyo_kenglik, dunyo_balandlik):
+        self.x = 0
+        self.y = 0
+        self.kenglik = kenglik
+        self.balandlik = balandlik
+        self.dunyo_kenglik = dunyo_kenglik
+        self.dunyo_balandlik = dunyo_balandlik
+
+    def kuzatish(self, px, py):
+        """Kamerani nuqtaga markazlashtiradi, dunyo chegarasidan chiqmaydi"""
+        self.x = int(max(0, min(px - self.kenglik // 2, self.dunyo_kenglik - self.kenglik)))
+        self.y = int(max(0, min(py - self.balandlik // 2, self.dunyo_balandlik - self.balandlik)))
+
+    def ekranga(self, px, py):
+        """Dunyo pikselini ekran pikseliga o'tkazadi"""
+        return px - self.x, py - self.y
+
+
+class XaritaChizuvchi:
+    """Xaritani bo'laklarga bo'lib bir marta chizadi va faqat ko'rinadiganlarini blit qiladi.
+
+    Bo'lak birinchi marta ko'ringanda tayyorlanadi; eng uzoq ishlatilmaganlari
+    MAKS_BO_LAKLAR dan oshganda o'chiriladi. Xarita o'zgarsa yangilash() chaqiriladi.
+    """
+
+    def __init__(self, xarita, rasmlar, katak_hajmi, bo_lak=BO_LAK_HAJMI, maks_bo_laklar=MAKS_BO_LAKLAR):
+        self.xarita = xarita
+        self.rasmlar = rasmlar
+        self.katak_hajmi = katak_hajmi
+        self.bo_lak = bo_lak
+        self.maks_bo_laklar = maks_bo_laklar
+        self.kenglik, self.balandlik = xarita_o_lchami(xarita)
+        self.bo_laklar = OrderedDict()
+
+    @property
+    def piksel_o_lchami(self):
+        return self.kenglik * self.katak_hajmi, self.balandlik * self.katak_hajmi
+
+    def _tayyorlash(self, bx, by):
+        x0 = bx * self.bo_lak
+        y0 = by * self.bo_lak
+        kenglik = min(self.bo_lak, self.kenglik - x0)
+        balandlik = min(self.bo_lak, self.balandlik - y0)
+
+        sirt = pygame.Surface((kenglik * self.katak_hajmi, balandlik * self.katak_hajmi)).convert()
+        sirt.fill(FON_RANGI)
+        rasmlar = {tur: self.rasmlar[nom] for tur, nom in RASM_NOMLARI.items() if nom in self.rasmlar}
+        for y, qator in enumerate(xarita_bloki(self.xarita, x0, y0, kenglik, balandlik)):
+            for x, katak_turi in enumerate(qator):
+                rasm = rasmlar.get(int(katak_turi))
+                if rasm:
+                    sirt.blit(rasm, (x * self.katak_hajmi, y * self.katak_hajmi))
+        return sirt
+
+    def _bo_lak(self, bx, by):
+        kalit = (bx, by)
+        sirt = self.bo_laklar.get(kalit)
+        if sirt is None:
+            sirt = self.bo_laklar[kalit] = self._tayyorlash(bx, by)
+            if len(self.bo_laklar) > self.maks_bo_laklar:
+                self.bo_laklar.popitem(last=False)
+        else:
+            self.bo_laklar.move_to_end(kalit)
+        return sirt
+
+    def yangilash(self, x, y):
+        """(x, y) katak o'zgardi - uning bo'lagi qayta chiziladi"""
+        self.bo_laklar.pop((x // self.bo_lak, y // self.bo_lak), None)
+
+    def chizish(self, ekran, kamera):
+        bo_lak_px = self.bo_lak * self.katak_hajmi
+        bx0 = kamera.x // bo_lak_px
+        by0 = kamera.y // bo_lak_px
+        bx1 = min((kamera.x + kamera.kenglik - 1) // bo_lak_px, (self.kenglik - 1) // self.bo_lak)
+        by1 = min((kamera.y + kamera.balandlik - 1) // bo_lak_px, (self.balandlik - 1) // self.bo_lak)
+
+        for by in range(by0, by1 + 1):
+            for bx in range(bx0, bx1 + 1):
+                ekran.blit(self._bo_lak(bx, by), (bx * bo_lak_px - kamera.x, by * bo_lak_px - kamera.y))
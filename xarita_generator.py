@@ -0,0 +1,92 @@
+import sys
+import time
+
+import numpy as np
+
+from katak_turlari import TUPROQ, KOL, TOSH, DARAXT, MAYSA
+
+# Shovqin chegaralari: balandlik maydoni ko'l va toshni, o'simlik maydoni daraxt va maysani belgilaydi
+KOL_CHEGARASI = 0.30
+TOSH_CHEGARASI = 0.75
+DARAXT_CHEGARASI = 0.66
+MAYSA_CHEGARASI = 0.48
+SHOVQIN_QADAMI = 8  # shovqin "dog'lari"ning taxminiy o'lchami (katakda)
+
+# [relyef darajasi][o'simlik darajasi] -> katak turi; relyef: 0 oddiy, 1 ko'l, 2 tosh
+TURLAR_JADVALI = np.array([TUPROQ, MAYSA, DARAXT,
+                           KOL, KOL, KOL,
+                           TOSH, TOSH, TOSH], dtype=np.uint8)
+
+
+def _silliq(qadam):
+    """Bitta qadam ichidagi smoothstep og'irliklari"""
+    f = np.arange(qadam, dtype=np.float32) / qadam
+    return f * f * (3 - 2 * f)
+
+
+def shovqin(rng, balandlik, kenglik, qadam=SHOVQIN_QADAMI):
+    """[0, 1) oralig'idagi silliq qiymat-shovqin (value noise), float32"""
+    gy = -(-balandlik // qadam)
+    gx = -(-kenglik // qadam)
+    qo_pol = rng.random((gy + 1, gx + 1), dtype=np.float32)
+    f = _silliq(qadam)
+
+    # Har bir qo'pol katak qadam x qadam blokka aylanadi: avval x, keyin y bo'yicha
+    # interpolyatsiya, har biri bitta broadcast amal bilan
+    chap = qo_pol[:, :-1, None]
+    qatorlar = (chap + (qo_pol[:, 1:, None] - chap) * f).reshape(gy + 1, gx * qadam)[:, :kenglik]
+    yuqori = qatorlar[:-1, None, :]
+    natija = (qatorlar[1:, None, :] - yuqori) * f[:, None]
+    natija += yuqori
+    return natija.reshape(gy * qadam, kenglik)[:balandlik]
+
+
+def yo_lak_o_yish(xarita, a, b, rng):
+    """A dan B gacha tasodifiy zinapoya yo'lak ochadi - ular albatta bog'langan bo'ladi"""
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    qadamlar = np.zeros(abs(dx) + abs(dy), dtype=bool)
+    qadamlar[:abs(dx)] = True  # True - x bo'yicha qadam
+    rng.shuffle(qadamlar)
+
+    xs = a[0] + np.concatenate(([0], np.cumsum(qadamlar * np.sign(dx))))
+    ys = a[1] + np.concatenate(([0], np.cumsum(~qadamlar * np.sign(dy))))
+    xarita[ys, xs] = TUPROQ
+
+
+def xarita_yaratish_np(kenglik, balandlik, urug=None, A=None, B=None):
+    """Ixtiyoriy o'lchamdagi xaritani uint8 massiv ko'rinishida yaratadi.
+
+    A va B berilmasa, game.py dagi kabi (2, 2) va o'ng pastki burchakdan 3 katak ichkari
+    olinadi. Bir xil urug' bir xil xaritani beradi.
+    """
+    rng = np.random.default_rng(urug)
+    A = A or (2, 2)
+    B = B or (kenglik - 3, balandlik - 3)
+
+    relyef = shovqin(rng, balandlik, kenglik)
+    o_simlik = shovqin(rng, balandlik, kenglik, max(2, SHOVQIN_QADAMI // 2))
+
+    # Har bir katak uchun 0..8 indeks: o'simlik darajasi + 3 * relyef darajasi
+    indeks = (o_simlik > MAYSA_CHEGARASI).view(np.uint8)
+    indeks += o_simlik > DARAXT_CHEGARASI
+    indeks += (relyef < KOL_CHEGARASI).view(np.uint8) * np.uint8(3)
+    indeks += (relyef > TOSH_CHEGARASI).view(np.uint8) * np.uint8(6)
+    xarita = TURLAR_JADVALI[indeks]
+
+    yo_lak_o_yish(xarita, A, B, rng)
+    return xarita
+
+
+if __name__ == "__main__":
+    razmer = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    xarita_yaratish_np(64, 64, urug=0)  # isitish
+
+    start = time.perf_counter()
+    xarita = xarita_yaratish_np(razmer, razmer, urug=0)
+    vaqt = time.perf_counter() - start
+
+    turlar = np.bincount(xarita.ravel(), minlength=5) / xarita.size
+    print(f"{razmer}x{razmer}: {vaqt * 1000:.0f} ms, {xarita.nbytes / 2 ** 20:.1f} MiB")
+    for nom, tur in (("TUPROQ", TUPROQ), ("KOL", KOL), ("TOSH", TOSH), ("DARAXT", DARAXT), ("MAYSA", MAYSA)):
+        print(f"  {nom:7s} {turlar[tur]:.1%}")
@@ -0,0 +1,235 @@
+import sys
+import time
+import random
+from array import array
+from collections import deque
+
+from katak_turlari import TUPROQ
+from tez_yo_l import YolTopuvchi, O_TISH_JADVALI, tasodifiy_xarita
+
+
+class BogliqlikIndeksi:
+    """O'tish mumkin bo'lgan kataklarning bog'liq komponentlari (yetib borish indeksi).
+
+    YolTopuvchi bilan bir xil tekis indekslar va o'tish bytearray idan foydalanadi.
+    Har bir katakka komponent raqami (0 - to'siq) beriladi, shuning uchun "A dan B ga
+    yo'l bormi?" savoliga O(1) da javob beriladi. Xarita o'zgarganda faqat o'zgargan
+    katak atrofidagi komponentlar qayta belgilanadi.
+    """
+
+    def __init__(self, topuvchi):
+        self.topuvchi = topuvchi
+        self.o_tish = topuvchi.o_tish
+        self.qator = topuvchi.qator
+        self.qadamlar = (1, -1, self.qator, -self.qator)
+        self.belgi = array('i', bytes(4 * len(self.o_tish)))
+        self.hajm = {}
+        self.keyingi_belgi = 1
+        self._hammasini_belgilash()
+
+    def _yangi_belgi(self):
+        belgi = self.keyingi_belgi
+        self.keyingi_belgi += 1
+        return belgi
+
+    def _to_ldirish(self, boshi, belgi_raqami):
+        """boshi dan BFS bilan butun komponentni belgilaydi, hajmini qaytaradi"""
+        o_tish = self.o_tish
+        belgi = self.belgi
+        qadamlar = self.qadamlar
+        belgi[boshi] = belgi_raqami
+        navbat = [boshi]
+        for joriy in navbat:
+            for qadam in qadamlar:
+                q = joriy + qadam
+                if o_tish[q] and belgi[q] != belgi_raqami:
+                    belgi[q] = belgi_raqami
+                    navbat.append(q)
+        return len(navbat)
+
+    def _hammasini_belgilash(self):
+        o_tish = self.o_tish
+        belgi = self.belgi
+        boshi = o_tish.find(1)
+        while boshi != -1:
+            if not belgi[boshi]:
+                raqam = self._yangi_belgi()
+                self.hajm[raqam] = self._to_ldirish(boshi, raqam)
+            boshi = o_tish.find(1, boshi + 1)
+
+    def komponent(self, x, y):
+        return self.belgi[self.topuvchi.indeks(x, y)]
+
+    def bog_liqmi(self, a, b):
+        """A dan B ga yo'l bormi - O(1)"""
+        belgi = self.komponent(*a)
+        return belgi != 0 and belgi == self.komponent(*b)
+
+    def yangilash(self, x, y, katak_turi):
+        """Katak turi o'zgardi: topuvchi va komponentlar yangilanadi"""
+        i = self.topuvchi.indeks(x, y)
+        eski = self.o_tish[i]
+        self.topuvchi.yangilash(x, y, katak_turi)
+        yangi = self.o_tish[i]
+        if eski == yangi:
+            return
+        if yangi:
+            self._ochildi(i)
+        else:
+            self._yopildi(i)
+
+    def _ochildi(self, i):
+        """To'siq olib tashlandi: qo'shni komponentlar birlashadi"""
+        belgi = self.belgi
+        qo_shnilar = {belgi[i + q] for q in self.qadamlar if self.o_tish[i + q]}
+        if not qo_shnilar:
+            raqam = self._yangi_belgi()
+            belgi[i] = raqam
+            self.hajm[raqam] = 1
+            return
+
+        # Eng katta komponent saqlanadi, kichiklari unga qayta belgilanadi
+        asosiy = max(qo_shnilar, key=self.hajm.get)
+        belgi[i] = asosiy
+        self.hajm[asosiy] += 1
+        for q in self.qadamlar:
+            eski = belgi[i + q]
+            if self.o_tish[i + q] and eski != asosiy:
+                self.hajm[asosiy] += self._to_ldirish(i + q, asosiy)
+                del self.hajm[eski]
+
+    def _yopildi(self, i):
+        """To'siq qo'yildi: komponent bo'linishi mumkin.
+
+        Qo'shnilardan bir vaqtda BFS boshlanadi; qidiruvlar uchrashsa birlashadi. Birinchi
+        tugagan qidiruv - ajralib qolgan kichik bo'lak, u yangi raqam oladi. Oxirgi qolgan
+        qidiruv (katta bo'lak) eski raqamini saqlaydi, shuning uchun ish kichik bo'laklar
+        hajmiga proporsional.
+        """
+        belgi = self.belgi
+        o_tish = self.o_tish
+        eski = belgi[i]
+        belgi[i] = 0
+        self.hajm[eski] -= 1
+
+        qo_shnilar = [i + q for q in self.qadamlar if o_tish[i + q]]
+        if len(qo_shnilar) < 2:
+            if self.hajm[eski] == 0:
+                del self.hajm[eski]
+            return
+
+        aramalar = {n: (deque([katak]), {katak}) for n, katak in enumerate(qo_shnilar)}
+        egasi = {katak: n for n, katak in enumerate(qo_shnilar)}
+
+        while len(aramalar) > 1:
+            for n in list(aramalar):
+                if n not in aramalar:
+                    continue
+                navbat, ko_rilgan = aramalar[n]
+                if not navbat:
+                    # Bu bo'lak boshqalardan ajralib qoldi
+                    raqam = self._yangi_belgi()
+                    for katak in ko_rilgan:
+                        belgi[katak] = raqam
+                    self.hajm[raqam] = len(ko_rilgan)
+                    self.hajm[eski] -= len(ko_rilgan)
+                    del aramalar[n]
+                    if len(aramalar) == 1:
+                        break
+                    continue
+
+                joriy = navbat.popleft()
+                for qadam in self.qadamlar:
+                    q = joriy + qadam
+                    if not o_tish[q]:
+                        continue
+                    m = egasi.get(q)
+                    if m is None:
+                        egasi[q] = n
+                        ko_rilgan.add(q)
+                        navbat.append(q)
+                    elif m != n:
+                        # Uchrashdi - kichik qidiruv kattasiga qo'shiladi
+                        kichik, katta = (m, n) if len(aramalar[m][1]) < len(ko_rilgan) else (n, m)
+                        k_navbat, k_ko_rilgan = aramalar.pop(kichik)
+                        a_navbat, a_ko_rilgan = aramalar[katta]
+                        for katak in k_ko_rilgan:
+                            egasi[katak] = katta
+                        a_ko_rilgan |= k_ko_rilgan
+                        a_navbat.extend(k_navbat)
+                        if kichik == n:
+                            # joriy ning qolgan qo'shnilari katta qidiruvda ko'riladi
+                            a_navbat.append(joriy)
+                            break
+
+    def eng_yaqin_o_rinbosar(self, a, b):
+        """B ga eng yaqin (BFS qadamlari bo'yicha), A dan yetib boriladigan katak yoki None"""
+        belgi = self.komponent(*a)
+        if not belgi:
+            return None
+        topuvchi = self.topuvchi
+        kenglik, balandlik = topuvchi.kenglik, topuvchi.balandlik
+
+        # B dan to'siqlarga qaramay halqa-halqa kengayamiz
+        boshi = topuvchi.indeks(*b)
+        ko_rilgan = {boshi}
+        navbat = deque([boshi])
+        while navbat:
+            joriy = navbat.popleft()
+            if self.belgi[joriy] == belgi:
+                return topuvchi.katak(joriy)
+            x, y = topuvchi.katak(joriy)
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if 0 <= nx < kenglik and 0 <= ny < balandlik:
+                    q = topuvchi.indeks(nx, ny)
+                    if q not in ko_rilgan:
+                        ko_rilgan.add(q)
+                        navbat.append(q)
+        return None
+
+    def top(self, a, b):
+        """(yo'l, haqiqiy manzil): B ga yo'l bo'lmasa, bu darhol aniqlanadi va
+        B ga eng yaqin yetib boriladigan katakka yo'l qidiriladi"""
+        if not self.bog_liqmi(a, b):
+            b = self.eng_yaqin_o_rinbosar(a, b)
+            if b is None:
+                return [], None
+        return self.topuvchi.top(a, b), b
+
+
+def benchmark(razmer=1000, urug=0):
+    xarita = tasodifiy_xarita(razmer, razmer, to_siq_ulushi=0.35, urug=urug)
+    topuvchi = YolTopuvchi(xarita)
+
+    start = time.perf_counter()
+    indeks = BogliqlikIndeksi(topuvchi)
+    print(f"{razmer}x{razmer}: indeks {time.perf_counter() - start:.3f} s, {len(indeks.hajm)} komponent")
+
+    rng = random.Random(urug)
+    a = next((x, y) for y in range(razmer) for x in range(razmer) if xarita[y][x] == TUPROQ
+             and indeks.hajm[indeks.komponent(x, y)] > razmer)
+    juftlar = []
+    while len(juftlar) < 20:
+        b = (rng.randrange(razmer), rng.randrange(razmer))
+        if O_TISH_JADVALI[xarita[b[1]][b[0]]] and not indeks.bog_liqmi(a, b):
+            juftlar.append(b)
+
+    start = time.perf_counter()
+    for b in juftlar:
+        topuvchi.top(a, b)
+    print(f"yetib bo'lmaydigan so'rovlar, A*: {(time.perf_counter() - start) / len(juftlar) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for b in juftlar:
+        indeks.bog_liqmi(a, b)
+    print(f"yetib bo'lmaydigan so'rovlar, indeks: {(time.perf_counter() - start) / len(juftlar) * 1e6:.1f} us")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        x, y = rng.randrange(razmer), rng.randrange(razmer)
+        indeks.yangilash(x, y, TUPROQ if rng.random() < 0.35 else 2)
+    print(f"tahrir (1000 ta): {(time.perf_counter() - start):.3f} s")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,220 @@
+import sys
+import time
+import heapq
+import random
+from array import array
+from dataclasses import dataclass
+
+from katak_turlari import TUPROQ
+from tez_yo_l import YolTopuvchi, tasodifiy_xarita
+
+REJIMLAR = ("oddiy", "vaznli", "ikki_tomonlama")
+VAZN = 1.5  # vaznli A*: yo'l eng qisqasidan ko'pi bilan VAZN marta uzun
+
+
+@dataclass
+class Telemetriya:
+    """Bitta so'rov statistikasi"""
+    ochilgan: int = 0  # yopiq ro'yxatga o'tgan (kengaytirilgan) kataklar
+    eng_katta_open: int = 0  # open to'plamning eng katta hajmi (eskirgan yozuvlar bilan)
+    vaqt: float = 0.0  # sekund
+
+
+class RejimliTopuvchi(YolTopuvchi):
+    """YolTopuvchi ga tanlanadigan qidiruv rejimlari va telemetriya qo'shadi.
+
+    oddiy - YolTopuvchi.top bilan bir xil A*; vaznli - f = g + vazn * h (tezroq, yo'l
+    eng qisqasidan ko'pi bilan vazn marta uzun); ikki_tomonlama - A va B dan bir vaqtda,
+    open to'plami kichik tomonni kengaytirib boriladi.
+    """
+
+    def _tayyorlash(self, kenglik, balandlik, o_tish):
+        super()._tayyorlash(kenglik, balandlik, o_tish)
+        # Teskari qidiruv uchun ikkinchi massivlar to'plami
+        n = len(self.o_tish)
+        self.g2 = array('i', bytes(4 * n))
+        self.ota2 = array('i', bytes(4 * n))
+        self.belgi2 = array('I', bytes(4 * n))
+        self.yopiq2 = array('I', bytes(4 * n))
+
+    def _yangi_avlod(self):
+        if self.avlod + 1 >= 0xFFFFFFFF:
+            for massiv in (self.belgi2, self.yopiq2):
+                massiv[:] = array('I', bytes(4 * len(massiv)))
+        return super()._yangi_avlod()
+
+    def so_rov(self, boshlang_i, manzil, rejim="oddiy", vazn=VAZN):
+        """(yo'l, Telemetriya) - yo'l YolTopuvchi.top bilan bir xil ko'rinishda"""
+        telemetriya = Telemetriya()
+        start = time.perf_counter()
+        if boshlang_i == manzil:
+            yo_l = [boshlang_i]
+        elif rejim == "ikki_tomonlama":
+            yo_l = self._ikki_tomonlama(boshlang_i, manzil, telemetriya)
+        elif rejim in ("oddiy", "vaznli"):
+            yo_l = self._a_yulduz(boshlang_i, manzil, vazn if rejim == "vaznli" else 1, telemetriya)
+        else:
+            raise ValueError(f"noma'lum rejim: {rejim!r} ({', '.join(REJIMLAR)})")
+        telemetriya.vaqt = time.perf_counter() - start
+        return yo_l, telemetriya
+
+    def _a_yulduz(self, boshlang_i, manzil, vazn, telemetriya):
+        qator = self.qator
+        o_tish = self.o_tish
+        g = self.g
+        ota = self.ota
+        belgi = self.belgi
+        yopiq = self.yopiq
+        avlod = self._yangi_avlod()
+
+        boshi = self.indeks(*boshlang_i)
+        oxiri = self.indeks(*manzil)
+        mx, my = manzil[0] + 1, manzil[1] + 1
+        qadamlar = (1, -1, qator, -qator)
+
+        g[boshi] = 0
+        belgi[boshi] = avlod
+        open_set = [(0, boshi)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        ochilgan = 0
+        eng_katta = 1
+
+        while open_set:
+            _, joriy = heappop(open_set)
+            if joriy == oxiri:
+                break
+            if yopiq[joriy] == avlod:
+                continue
+            yopiq[joriy] = avlod
+            ochilgan += 1
+
+            yangi_g = g[joriy] + 1
+            for qadam in qadamlar:
+                qo_shni = joriy + qadam
+                if not o_tish[qo_shni] or yopiq[qo_shni] == avlod:
+                    continue
+                if belgi[qo_shni] != avlod or yangi_g < g[qo_shni]:
+                    belgi[qo_shni] = avlod
+                    g[qo_shni] = yangi_g
+                    ota[qo_shni] = joriy
+                    y, x = divmod(qo_shni, qator)
+                    heappush(open_set, (yangi_g + vazn * (abs(x - mx) + abs(y - my)), qo_shni))
+            if len(open_set) > eng_katta:
+                eng_katta = len(open_set)
+        else:
+            oxiri = None
+
+        telemetriya.ochilgan = ochilgan
+        telemetriya.eng_katta_open = eng_katta
+        return self._yo_l(boshi, oxiri) if oxiri is not None else []
+
+    def _ikki_tomonlama(self, boshlang_i, manzil, telemetriya):
+        """Ikki tomonlama A*: uchrashish nuqtasi orqali eng yaxshi yo'l narxi mu dan
+        birorta tomonning eng kichik f qiymati kichik bo'lmay qolganda to'xtaydi"""
+        qator = self.qator
+        o_tish = self.o_tish
+        avlod = self._yangi_avlod()
+        boshi = self.indeks(*boshlang_i)
+        oxiri = self.indeks(*manzil)
+        qadamlar = (1, -1, qator, -qator)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        # Har tomon: (g, ota, belgi, yopiq, open, maqsad x, maqsad y); 0 - oldinga, 1 - orqaga
+        tomonlar = (
+            (self.g, self.ota, self.belgi, self.yopiq, [(0, boshi)], manzil[0] + 1, manzil[1] + 1),
+            (self.g2, self.ota2, self.belgi2, self.yopiq2, [(0, oxiri)], boshlang_i[0] + 1, boshlang_i[1] + 1),
+        )
+        for (g, _, belgi, _, open_set, _, _), katak in zip(tomonlar, (boshi, oxiri)):
+            g[katak] = 0
+            belgi[katak] = avlod
+
+        mu = float("inf")
+        uchrashuv = None
+        ochilgan = 0
+        eng_katta = 2
+
+        while tomonlar[0][4] and tomonlar[1][4]:
+            if tomonlar[0][4][0][0] >= mu or tomonlar[1][4][0][0] >= mu:
+                break
+            t = 0 if len(tomonlar[0][4]) <= len(tomonlar[1][4]) else 1
+            g, ota, belgi, yopiq, open_set, mx, my = tomonlar[t]
+            boshqa_g, _, boshqa_belgi = tomonlar[1 - t][:3]
+
+            _, joriy = heappop(open_set)
+            if yopiq[joriy] == avlod:
+                continue
+            yopiq[joriy] = avlod
+            ochilgan += 1
+
+            yangi_g = g[joriy] + 1
+            for qadam in qadamlar:
+                qo_shni = joriy + qadam
+                if not o_tish[qo_shni] or yopiq[qo_shni] == avlod:
+                    continue
+                if belgi[qo_shni] != avlod or yangi_g < g[qo_shni]:
+                    belgi[qo_shni] = avlod
+                    g[qo_shni] = yangi_g
+                    ota[qo_shni] = joriy
+                    y, x = divmod(qo_shni, qator)
+                    heappush(open_set, (yangi_g + abs(x - mx) + abs(y - my), qo_shni))
+                    # Boshqa tomon bu katakka yetgan bo'lsa - yo'l topildi, yaxshiroq bo'lishi mumkin
+                    if boshqa_belgi[qo_shni] == avlod and yangi_g + boshqa_g[qo_shni] < mu:
+                        mu = yangi_g + boshqa_g[qo_shni]
+                        uchrashuv = qo_shni
+            if len(tomonlar[0][4]) + len(tomonlar[1][4]) > eng_katta:
+                eng_katta = len(tomonlar[0][4]) + len(tomonlar[1][4])
+
+        telemetriya.ochilgan = ochilgan
+        telemetriya.eng_katta_open = eng_katta
+        if uchrashuv is None:
+            return []
+
+        yo_l = self._yo_l(boshi, uchrashuv)
+        joriy = uchrashuv
+        while joriy != oxiri:
+            joriy = self.ota2[joriy]
+            yo_l.append(self.katak(joriy))
+        return yo_l
+
+
+def xarita_turlari(razmer, urug=0):
+    """Benchmark uchun har xil turdagi xaritalar"""
+    from xarita_generator import xarita_yaratish_np
+
+    return {
+        "ochiq": [[TUPROQ] * razmer for _ in range(razmer)],
+        "tasodifiy 25%": tasodifiy_xarita(razmer, razmer, 0.25, urug),
+        "tasodifiy 40%": tasodifiy_xarita(razmer, razmer, 0.40, urug),
+        "generator": xarita_yaratish_np(razmer, razmer, urug=urug),
+    }
+
+
+def benchmark(razmer=300, so_rovlar=30, urug=0):
+    for nom, xarita in xarita_turlari(razmer, urug).items():
+        topuvchi = RejimliTopuvchi(xarita)
+        rng = random.Random(urug)
+        bo_sh = [i for i, qiymat in enumerate(topuvchi.o_tish) if qiymat]
+        juftlar = []
+        while len(juftlar) < so_rovlar:
+            a, b = (topuvchi.katak(rng.choice(bo_sh)) for _ in range(2))
+            if topuvchi.top(a, b):
+                juftlar.append((a, b))
+
+        print(f"{nom} ({razmer}x{razmer}, {so_rovlar} so'rov):")
+        eng_qisqa = [len(topuvchi.top(a, b)) for a, b in juftlar]
+        for rejim in REJIMLAR:
+            ochilgan = open_hajmi = vaqt = uzunlik = 0
+            for a, b in juftlar:
+                yo_l, t = topuvchi.so_rov(a, b, rejim)
+                ochilgan += t.ochilgan
+                open_hajmi = max(open_hajmi, t.eng_katta_open)
+                vaqt += t.vaqt
+                uzunlik += len(yo_l)
+            print(f"  {rejim:15s} ochilgan {ochilgan / so_rovlar:9.0f} | open maks {open_hajmi:6d} | "
+                  f"{vaqt / so_rovlar * 1000:7.2f} ms | uzunlik x{uzunlik / sum(eng_qisqa):.3f}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import argparse
+import multiprocessing as mp
+from array import array
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from tez_yo_l import YolTopuvchi, o_tish_xaritasi
+from yetib_borish import BogliqlikIndeksi
+
+BO_LAK = 64  # bitta vazifadagi so'rovlar soni
+
+# Ishchi jarayon holati (Pool initializer da to'ldiriladi)
+_ishchi = {}
+
+
+def _ishchi_boshlash(nomlar, kenglik, balandlik):
+    """Xarita va komponentlar umumiy xotiradan o'qiladi - nusxa ko'chirilmaydi"""
+    bloklar = [shared_memory.SharedMemory(name=nom) for nom in nomlar]
+    n = (kenglik + 2) * (balandlik + 2)
+    _ishchi["bloklar"] = bloklar
+    _ishchi["topuvchi"] = YolTopuvchi.o_tishdan(bloklar[0].buf[:n], kenglik, balandlik)
+    _ishchi["komponent"] = np.ndarray(n, dtype=np.int32, buffer=bloklar[1].buf)
+
+
+def _ishchi_vazifa(vazifa):
+    """[boshi, oxiri) so'rovlarni bajaradi; uzunliklar umumiy xotiraga yoziladi.
+
+    yo_llar so'ralgan bo'lsa, har bir yo'l tekis indekslar (array('i')) sifatida qaytariladi.
+    """
+    so_rov_nomi, natija_nomi, jami, boshi, oxiri, yo_llar_kerak = vazifa
+    topuvchi = _ishchi["topuvchi"]
+    komponent = _ishchi["komponent"]
+    so_rov_blok = shared_memory.SharedMemory(name=so_rov_nomi)
+    natija_blok = shared_memory.SharedMemory(name=natija_nomi)
+    so_rovlar = np.ndarray((jami, 4), dtype=np.int32, buffer=so_rov_blok.buf)
+    uzunliklar = np.ndarray(jami, dtype=np.int32, buffer=natija_blok.buf)
+
+    yo_llar = []
+    try:
+        for i, (ax, ay, bx, by) in enumerate(so_rovlar[boshi:oxiri].tolist(), boshi):
+            a, b = (ax, ay), (bx, by)
+            belgi = komponent[topuvchi.indeks(ax, ay)]
+            # Har xil komponentda - yo'l yo'q, qidiruvsiz
+            if belgi == 0 or belgi != komponent[topuvchi.indeks(bx, by)]:
+                yo_l = []
+            else:
+                yo_l = topuvchi.top(a, b)
+            uzunliklar[i] = len(yo_l)
+            if yo_llar_kerak:
+                yo_llar.append(array('i', [topuvchi.indeks(x, y) for x, y in yo_l]))
+    finally:
+        del so_rovlar, uzunliklar
+        so_rov_blok.close()
+        natija_blok.close()
+    return boshi, yo_llar
+
+
+class YolXizmati:
+    """Ko'p (boshlang'ich, manzil) juftlari uchun yo'llarni jarayonlar hovuzida topadi.
+
+    O'tish xaritasi va komponent raqamlari bir marta umumiy xotiraga (shared_memory)
+    joylanadi; ishchilar ularni pickle qilmasdan o'qiydi. So'rovlar va uzunliklar ham
+    umumiy xotira orqali uzatiladi, faqat yo'llarning o'zi (so'ralsa) qaytarib yuboriladi.
+
+    Qidiruvni game.yo_l_top emas, tekis massivli YolTopuvchi bajaradi: ikkalasi ham eng
+    qisqa yo'lni topadi, shuning uchun uzunliklar bir xil, lekin teng uzun yo'llar orasidan
+    boshqasi tanlanishi mumkin (benchmark uzunliklarni yo_l_top bilan solishtiradi).
+    """
+
+    def __init__(self, xarita, ishchilar=None):
+        self.kenglik = len(xarita[0])
+        self.balandlik = len(xarita)
+        o_tish = o_tish_xaritasi(xarita)
+        komponent = BogliqlikIndeksi(YolTopuvchi.o_tishdan(o_tish, self.kenglik, self.balandlik)).belgi
+
+        self._bloklar = [shared_memory.SharedMemory(create=True, size=len(o_tish)),
+                         shared_memory.SharedMemory(create=True, size=4 * len(o_tish))]
+        self._bloklar[0].buf[:len(o_tish)] = o_tish
+        self._bloklar[1].buf[:4 * len(o_tish)] = komponent.tobytes()
+
+        self.ishchilar = ishchilar or os.cpu_count() or 1
+        self._hovuz = mp.Pool(self.ishchilar, initializer=_ishchi_boshlash,
+                              initargs=([blok.name for blok in self._bloklar], self.kenglik, self.balandlik))
+        self._qator = self.kenglik + 2
+
+    def _bajarish(self, juftlar, yo_llar_kerak):
+        so_rovlar = np.asarray(juftlar, dtype=np.int32).reshape(-1, 4)
+        jami = len(so_rovlar)
+        so_rov_blok = shared_memory.SharedMemory(create=True, size=max(1, so_rovlar.nbytes))
+        natija_blok = shared_memory.SharedMemory(create=True, size=max(1, 4 * jami))
+        try:
+            np.ndarray(so_rovlar.shape, dtype=np.int32, buffer=so_rov_blok.buf)[:] = so_rovlar
+            vazifalar = [(so_rov_blok.name, natija_blok.name, jami, boshi, min(boshi + BO_LAK, jami), yo_llar_kerak)
+                         for boshi in range(0, jami, BO_LAK)]
+            yo_llar = [None] * jami
+            for boshi, qism in self._hovuz.imap_unordered(_ishchi_vazifa, vazifalar):
+                yo_llar[boshi:boshi + len(qism)] = qism
+            uzunliklar = np.ndarray(jami, dtype=np.int32, buffer=natija_blok.buf).copy()
+        finally:
+            so_rov_blok.close()
+            so_rov_blok.unlink()
+            natija_blok.close()
+            natija_blok.unlink()
+        return uzunliklar, yo_llar
+
+    def uzunliklar(self, juftlar):
+        """juftlar: [((ax, ay), (bx, by)), ...] yoki (n, 4) massiv -> yo'l uzunliklari (0 - yo'l yo'q)"""
+        return self._bajarish(juftlar, False)[0]
+
+    def yo_llar(self, juftlar):
+        """Har bir juft uchun [(x, y), ...] yoki [] - YolTopuvchi.top natijasi
+        (yo_l_top bilan uzunligi teng, yo'lning o'zi farq qilishi mumkin)"""
+        qator = self._qator
+        return [[(i % qator - 1, i // qator - 1) for i in yo_l]
+                for yo_l in self._bajarish(juftlar, True)[1]]
+
+    def yopish(self):
+        self._hovuz.close()
+        self._hovuz.join()
+        for blok in self._bloklar:
+            blok.close()
+            blok.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.yopish()
+
+
+def tasodifiy_juftlar(xarita, soni, urug=0):
+    """Yuriladigan kataklardan tasodifiy (n, 4) so'rovlar massivi"""
+    rng = np.random.default_rng(urug)
+    o_tish = np.frombuffer(bytes(o_tish_xaritasi(xarita)), dtype=np.uint8)
+    qator = len(xarita[0]) + 2
+    bo_sh = np.flatnonzero(o_tish)
+    tanlov = rng.choice(bo_sh, (soni, 2))
+    y, x = np.divmod(tanlov, qator)
+    return np.stack([x[:, 0] - 1, y[:, 0] - 1, x[:, 1] - 1, y[:, 1] - 1], axis=1).astype(np.int32)
+
+
+def benchmark(razmer, soni, ishchilar):
+    from xarita_generator import xarita_yaratish_np
+
+    xarita = xarita_yaratish_np(razmer, razmer, urug=0)
+    juftlar = tasodifiy_juftlar(xarita, soni)
+    print(f"{razmer}x{razmer}, {soni} so'rov")
+
+    topuvchi = YolTopuvchi(xarita)
+    n = min(soni, 200)
+    start = time.perf_counter()
+    for ax, ay, bx, by in juftlar[:n].tolist():
+        topuvchi.top((ax, ay), (bx, by))
+    vaqt = time.perf_counter() - start
+    print(f"  bittalab (1 jarayon, {n} so'rov): {n / vaqt:8.0f} so'rov/s")
+
+    start = time.perf_counter()
+    with YolXizmati(xarita, ishchilar) as xizmat:
+        tayyor = time.perf_counter() - start
+        start = time.perf_counter()
+        uzunliklar = xizmat.uzunliklar(juftlar)
+        vaqt = time.perf_counter() - start
+    print(f"  YolXizmati ({ishchilar} ishchi): {soni / vaqt:8.0f} so'rov/s "
+          f"(tayyorlash {tayyor:.2f} s, yo'l bor: {np.count_nonzero(uzunliklar)}/{soni})")
+
+    # yo_l_top bilan tekshiruv: eng qisqa yo'l uzunliklari teng bo'lishi kerak
+    from game import yo_l_top
+    ro_yxat = xarita.tolist()
+    n = min(soni, 50)
+    for (ax, ay, bx, by), uzunlik in zip(juftlar[:n].tolist(), uzunliklar[:n].tolist()):
+        assert len(yo_l_top(ro_yxat, (ax, ay), (bx, by))) == uzunlik, ((ax, ay), (bx, by))
+    print(f"  yo_l_top bilan {n} so'rov: uzunliklar teng")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ko'p yo'l so'rovlarini parallel bajarish benchmarki")
+    parser.add_argument("--razmer", type=int, default=512)
+    parser.add_argument("--soni", type=int, default=5000)
+    parser.add_argument("--ishchilar", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(sys.argv[1:])
+    benchmark(args.razmer, args.soni, args.ishchilar)